@@ -0,0 +1,41 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the per-call cost of the os.open() mode check depending on the configured policy."""
+
+import argparse
+import ast
+import timeit
+
+import flake8_secure_coding_standard as flake8_scs
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=10000, help='Number of os.open() calls in the checked source')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of timing repetitions')
+    args = parser.parse_args()
+
+    tree = ast.parse('\n'.join(f'os.open("file.txt", os.O_WRONLY, 0o{mode:o})' for mode in range(args.calls)))
+    for option in ('0o7', '0o755', '0o7777', '0o644,0o755', 'mask:0o755'):
+        flake8_scs.Visitor.os_open_mode_policy = flake8_scs._ModePolicy.from_option(
+            flake8_scs._read_octal_mode_option('os_open_mode', option, flake8_scs._DEFAULT_MAX_MODE)
+        )
+        best = min(timeit.repeat(lambda: list(flake8_scs.Plugin(tree).run()), number=1, repeat=args.repeat))
+        print(f'--os-open-mode={option:<12} {best / args.calls * 1e9:8.0f} ns/call')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the pass rate and cost of the source code prefilter over a corpus (the standard library by default)."""
+
+import argparse
+import ast
+import pathlib
+import time
+
+import flake8_secure_coding_standard as flake8_scs
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('corpus', nargs='?', default=pathlib.Path(ast.__file__).parent, type=pathlib.Path)
+    args = parser.parse_args()
+
+    files = []
+    for path in sorted(args.corpus.rglob('*.py')):
+        try:
+            source = path.read_bytes()
+            files.append((ast.parse(source, filename=str(path)), source.decode('utf-8').splitlines(keepends=True)))
+        except (SyntaxError, ValueError):
+            continue
+
+    start = time.perf_counter()
+    keywords_re = flake8_scs._ALL_RULES.keywords_re
+    passed = sum(flake8_scs._may_have_errors(lines, keywords_re) for _, lines in files)
+    prefilter_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    n_errors_without = sum(len(list(flake8_scs.Plugin(tree).run())) for tree, _ in files)
+    time_without = time.perf_counter() - start
+
+    start = time.perf_counter()
+    n_errors_with = sum(len(list(flake8_scs.Plugin(tree, lines).run())) for tree, lines in files)
+    time_with = time.perf_counter() - start
+
+    assert n_errors_with == n_errors_without  # noqa: S101
+
+    print(f'{len(files)} files, {passed} ({passed / len(files):.1%}) passed the prefilter in {prefilter_time:.3f}s')
+    print(f'Plugin.run without prefilter: {time_without:.3f}s')
+    print(f'Plugin.run with prefilter:    {time_with:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
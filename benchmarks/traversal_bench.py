@@ -0,0 +1,56 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the AST node throughput of the plugin over a corpus of Python files (the standard library by default)."""
+
+import argparse
+import ast
+import pathlib
+import time
+
+import flake8_secure_coding_standard as flake8_scs
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('corpus', nargs='?', default=pathlib.Path(ast.__file__).parent, type=pathlib.Path)
+    parser.add_argument('--repeat', type=int, default=3, help='Number of timing repetitions')
+    parser.add_argument('--codes', help='Comma-separated list of enabled error codes (default: all)')
+    args = parser.parse_args()
+
+    if args.codes is not None:
+        flake8_scs.Visitor.rule_set = flake8_scs._compile_rule_set(frozenset(filter(None, args.codes.split(','))))
+
+    trees = []
+    for path in sorted(args.corpus.rglob('*.py')):
+        try:
+            trees.append(ast.parse(path.read_bytes(), filename=str(path)))
+        except (SyntaxError, ValueError):
+            continue
+    n_nodes = sum(1 for tree in trees for _ in ast.walk(tree))
+
+    best = float('inf')
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        for tree in trees:
+            # NB: calling the visitor directly so that the traversal happens even if no rule is enabled
+            flake8_scs.Visitor().visit(tree)
+        best = min(best, time.perf_counter() - start)
+
+    print(f'{len(trees)} files, {n_nodes} nodes in {best:.3f}s: {n_nodes / best / 1e6:.2f} M nodes/s')
+
+
+if __name__ == '__main__':
+    main()
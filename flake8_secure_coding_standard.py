@@ -17,28 +17,104 @@
 from __future__ import annotations
 
 import ast
-import importlib.metadata
+import atexit
+import bisect
+import contextlib
+import errno
+import fnmatch
+import functools
+import hashlib
+import heapq
+import io
+import itertools
+import json
+import mmap
 import operator
+import os
 import platform
+import queue
+import re
+import select
 import stat
-from typing import TYPE_CHECKING, Any, AnyStr, ClassVar, Generator
+import struct
+import subprocess  # noqa: S404
+import sys
+import tempfile
+import threading
+import time
+import tokenize
+import zlib
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    ClassVar,
+    Generator,
+    Iterable,
+    NamedTuple,
+    TextIO,
+)
 
 if TYPE_CHECKING:  # pragma: no cover
+    import argparse
+    import concurrent.futures
+    import ctypes
+
     import flake8.options.manager
 
 ast_Constant = ast.Constant  # noqa: N816
 
-_use_optparse = tuple(int(s) for s in importlib.metadata.version('flake8').split('.')) < (3, 8, 0)
 
+@functools.lru_cache(maxsize=None)
+def _get_version(distribution: str) -> str:
+    """
+    Return the version of an installed distribution.
+
+    NB: `importlib.metadata` (and flake8) are only imported when needed, so that importing this module stays cheap when
+    only using its library API (see `scan_source()`).
+
+    Args:
+        distribution: Name of the distribution (e.g. 'flake8')
+    """
+    import importlib.metadata  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    return importlib.metadata.version(distribution)
+
+
+def _use_optparse() -> bool:
+    """Check whether the installed version of flake8 parses its options using optparse (before 3.8.0)."""
+    return tuple(int(s) for s in _get_version('flake8').split('.')) < (3, 8, 0)
+
+
+class _DistributionVersion:
+    """Descriptor of a class attribute holding the version of a distribution, looked up when first accessed."""
+
+    def __init__(self, distribution: str) -> None:
+        """
+        Initialize a _DistributionVersion object.
+
+        Args:
+            distribution: Name of the distribution
+        """
+        self._distribution = distribution
+
+    def __get__(self, instance: object, owner: type | None = None) -> str:
+        """Return the version of the distribution."""
+        return _get_version(self._distribution)
 
-if _use_optparse:  # pragma: no cover
-    import optparse  # noqa: F401 pylint: disable=deprecated-module, unused-import
-else:
-    import argparse
 
 # ==============================================================================
 
 _DEFAULT_MAX_MODE = 0o755
+_DEFAULT_CACHE_MAX_ENTRIES = 100000
+# NB: in MiB (32768 slots of 1 KiB)
+_DEFAULT_SHARED_TABLE_SIZE = 32
+# NB: default value of the `exclude` option of flake8
+_DEFAULT_EXCLUDE = ('.svn', 'CVS', '.bzr', '.hg', '.git', '__pycache__', '.tox', '.nox', '.eggs', '*.egg')
 
 SCS100 = 'SCS100 use of os.path.abspath() and os.path.relpath() should be avoided in favor of os.path.realpath()'
 SCS101 = 'SCS101 `eval()` and `exec()` represent a security risk and should be avoided'
@@ -73,6 +149,72 @@ SCS119 = 'SCS119 Avoid using `os.chmod` with unsafe file permissions (W ^ X for
 # Helper functions
 
 
+class _ModePolicy(NamedTuple):
+    """
+    Compiled policy for the allowed values of a `mode` argument.
+
+    All checks are performed in constant time, regardless of the number of allowed modes.
+
+    Attributes:
+        kind: Kind of policy: 'max' (all modes up to a maximum value), 'set' (explicit list of modes) or 'mask'
+            (all modes with no permission bits outside of a mask)
+        value: Maximum mode value ('max'), bitmask where bit N is set if mode N is allowed ('set') or mask of the
+            allowed permission bits ('mask')
+        msg_arg: Description of the allowed modes used in error messages
+    """
+
+    kind: str
+    value: int
+    msg_arg: str
+
+    @classmethod
+    def from_option(cls: type[_ModePolicy], modes: int | list[int] | _ModePolicy | None) -> _ModePolicy | None:
+        """
+        Compile the value of a mode-like option into a policy.
+
+        Args:
+            modes: Value as returned by `_read_octal_mode_option`
+
+        Returns:
+            A policy object or None if the check is disabled
+
+        Raises:
+            ValueError: if some mode value is negative
+        """
+        if isinstance(modes, _ModePolicy):
+            return modes
+        if isinstance(modes, int) and not isinstance(modes, bool) and modes > 0:
+            return cls('max', modes, f'0 < mode < {oct(modes)}')
+        if isinstance(modes, list) and modes:
+            if any(mode < 0 for mode in modes):
+                msg = f'Invalid negative value in allowed modes: {modes}!'
+                raise ValueError(msg)
+            return cls('set', sum(1 << mode for mode in set(modes)), f'mode in {[oct(mode) for mode in modes]}')
+        return None
+
+    @classmethod
+    def from_mask(cls: type[_ModePolicy], mask: int) -> _ModePolicy:
+        """Create a policy allowing all modes with no permission bits outside of a mask."""
+        if mask < 0:
+            msg = f'Invalid negative mask value: {mask}!'
+            raise ValueError(msg)
+        return cls('mask', mask, f'mode & ~{oct(mask)} == 0')
+
+    def allows(self, mode: object) -> bool:
+        """Return True if a mode value is allowed by the policy."""
+        if isinstance(mode, float) and mode.is_integer():
+            mode = int(mode)
+        elif not isinstance(mode, int):
+            return False
+        if mode < 0:
+            return False
+        if self.kind == 'max':
+            return mode <= self.value
+        if self.kind == 'set':
+            return bool((self.value >> mode) & 1)
+        return not mode & ~self.value
+
+
 def _read_octal_mode_option(name, value, default):  # noqa: C901
     """
     Read an integer or list of integer configuration option.
@@ -86,12 +228,14 @@ def _read_octal_mode_option(name, value, default):  # noqa: C901
                 The maximum mode value is then set to that integer value
             - a comma-separated list of integers (octal or decimal)
                 The allowed mode values are then those found in the list
+            - 'mask:' followed by an octal or decimal integer
+                The allowed mode values are then those without any permission bits outside of the mask
             - anything else will count as a falseful value
         default (int,list): Default value for option if set to one of
             ('y', 'yes', 'true') in the configuration file or on the CLI
 
     Returns:
-        A single integer or a (possibly empty) list of integers
+        A single integer, a (possibly empty) list of integers or a mode policy (mask)
 
     Raises:
         ValueError: if the value of the option is not valid
@@ -104,6 +248,13 @@ def _read_octal_mode_option(name, value, default):  # noqa: C901
             return int(arg)
 
     value = value.lower()
+    if value.startswith('mask:'):
+        try:
+            return _ModePolicy.from_mask(_str_to_int(value[5:].strip()))
+        except ValueError as error:
+            msg = f'Invalid value for `{name}`: {value}!'
+            raise ValueError(msg) from error
+
     modes = [mode.strip() for mode in value.split(',')]
 
     if len(modes) > 1:
@@ -137,48 +288,65 @@ def _read_octal_mode_option(name, value, default):  # noqa: C901
 # ==============================================================================
 
 
-def _is_posix():
-    """Return True if the current system is POSIX-compatible."""
-    # NB: we could simply use `os.name` instead of `platform.system()`. However, that solution would be difficult to
-    #     test using `mock` as a few modules (like `pytest`) actually use it internally...
-    return platform.system() in {'Linux', 'Darwin'}
+_TARGET_PLATFORMS = ('auto', 'posix', 'windows', 'both')
 
 
-_is_unix = _is_posix
+class _PlatformProfile(NamedTuple):
+    """
+    Platform-dependent settings, resolved once per run.
 
-# ------------------------------------------------------------------------------
+    Attributes:
+        posix: Whether some POSIX platform is targeted (enables SCS116, SCS117 and SCS118)
+        non_posix: Whether some non-POSIX platform is targeted (enables SCS111)
+        non_windows: Whether some non-Windows platform is targeted (enables SCS119)
+    """
 
+    posix: bool
+    non_posix: bool
+    non_windows: bool
 
-def _is_function_call(node: ast.Call, module: AnyStr, function: list[AnyStr] | tuple[AnyStr] | AnyStr) -> bool:
-    if not isinstance(function, (list, tuple)):
-        function = (function,)
-    return (
-        isinstance(node.func, ast.Attribute)
-        and isinstance(node.func.value, ast.Name)
-        and node.func.value.id == module
-        and node.func.attr in function
-    )
 
+def _get_host_platform() -> str:
+    """Return the family of the current system: 'posix', 'windows' or 'other'."""
+    # NB: we could simply use `os.name` instead of `platform.system()`. However, that solution would be difficult to
+    #     test using `mock` as a few modules (like `pytest`) actually use it internally...
+    system = platform.system()
+    if system in {'Linux', 'Darwin'}:
+        return 'posix'
+    if system == 'Windows':
+        return 'windows'
+    return 'other'
 
-# ==============================================================================
 
+def _get_platform_profile(target: str) -> _PlatformProfile:
+    """
+    Resolve a target platform option value into a platform profile.
+
+    Args:
+        target: One of 'auto' (current system), 'posix', 'windows' or 'both' (POSIX and Windows)
 
-def _is_os_path_call(node: ast.Call) -> bool:
-    return (
-        isinstance(node.func, ast.Attribute)  # pylint: disable=R0916
-        and (
-            (isinstance(node.func.value, ast.Name) and node.func.value.id == 'op')
-            or (
-                isinstance(node.func.value, ast.Attribute)
-                and node.func.value.attr == 'path'
-                and isinstance(node.func.value.value, ast.Name)
-                and node.func.value.value.id == 'os'
-            )
-        )
-        and node.func.attr in {'abspath', 'relpath'}
+    Raises:
+        ValueError: if the value of the target platform is not valid
+    """
+    if target == 'auto':
+        platforms = {_get_host_platform()}
+    elif target == 'both':
+        platforms = {'posix', 'windows'}
+    elif target in _TARGET_PLATFORMS:
+        platforms = {target}
+    else:
+        msg = f'Invalid target platform: {target}!'
+        raise ValueError(msg)
+    return _PlatformProfile(
+        posix='posix' in platforms,
+        non_posix=bool(platforms - {'posix'}),
+        non_windows=bool(platforms - {'windows'}),
     )
 
 
+# ==============================================================================
+
+
 def _is_builtin_open_for_writing(node: ast.Call) -> bool:
     if isinstance(node.func, ast.Name) and node.func.id == 'open':
         mode = ''
@@ -196,7 +364,7 @@ def _is_builtin_open_for_writing(node: ast.Call) -> bool:
                         return True  # variable -> to be on the safe side, flag as inappropriate
                     mode = keyword.value.value
                     break
-        if any(m in mode for m in 'awx'):
+        if isinstance(mode, str) and any(m in mode for m in 'awx'):
             # Cover:
             #  * open(..., "w").
             #  * open(..., "wb").
@@ -206,129 +374,85 @@ def _is_builtin_open_for_writing(node: ast.Call) -> bool:
     return False
 
 
-def _get_mode_arg(node, args_idx):
-    mode = None
-    node_intern = None
+def _get_mode_node(node, args_idx):
     if len(node.args) > args_idx:
-        node_intern = node.args[args_idx]
-    elif node.keywords:
-        for keyword in node.keywords:
-            if keyword.arg == 'mode':
-                node_intern = keyword.value
-                break
-    if node_intern:
-        if isinstance(node_intern, ast_Constant):
-            mode = node_intern.value
-        elif isinstance(node_intern, ast.Num):  # pragma: no cover
-            mode = node_intern.n
-    return mode
+        return node.args[args_idx]
+    for keyword in node.keywords:
+        if keyword.arg == 'mode':
+            return keyword.value
+    return None
+
+
+def _get_mode_arg(node, args_idx):
+    node_intern = _get_mode_node(node, args_idx)
+    if node_intern is None:
+        return None
+    if isinstance(node_intern, ast_Constant):
+        return node_intern.value
+    try:
+        return _evaluate_mode(node_intern)
+    except ValueError:
+        # NB: not a constant expression (e.g. a variable) -> unknown mode
+        return None
 
 
-def _is_allowed_mode(node, allowed_modes, args_idx):
+def _is_allowed_mode(node, policy, args_idx):
     mode = _get_mode_arg(node, args_idx=args_idx)
-    if mode is not None and allowed_modes:
-        return mode in allowed_modes
+    if mode is not None and policy is not None:
+        return policy.allows(mode)
 
     # NB: default to True in all other cases
     return True
 
 
-def _is_shell_true_call(node: ast.Call) -> bool:
+def _has_shell_true_argument(node: ast.Call) -> bool:
     _n_args_max = 8
-    if not (isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Name)):
-        return False
-
-    # subprocess module
-    if node.func.value.id in {'subprocess', 'sp'}:
-        if node.func.attr in {'call', 'check_call', 'check_output', 'Popen', 'run'}:
-            for keyword in node.keywords:
-                if keyword.arg == 'shell' and isinstance(keyword.value, ast_Constant) and bool(keyword.value.value):
-                    return True
-            if (
-                len(node.args) > _n_args_max
-                and isinstance(node.args[_n_args_max], ast_Constant)
-                and bool(node.args[_n_args_max].value)
-            ):
-                return True
-        if node.func.attr in {'getoutput', 'getstatusoutput'}:
+    for keyword in node.keywords:
+        if keyword.arg == 'shell' and isinstance(keyword.value, ast_Constant) and bool(keyword.value.value):
             return True
-
-    # asyncio module
-    return (node.func.value.id == 'asyncio' and node.func.attr == 'create_subprocess_shell') or (
-        node.func.value.id == 'loop' and node.func.attr == 'subprocess_shell'
+    return (
+        len(node.args) > _n_args_max
+        and isinstance(node.args[_n_args_max], ast_Constant)
+        and bool(node.args[_n_args_max].value)
     )
 
 
-def _is_pdb_call(node: ast.Call) -> bool:
-    if isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Name) and node.func.value.id == 'pdb':
-        # Cover:
-        #  * pdb.func().
-        return True
-
-    # Cover:
-    # * Pdb().
-    return isinstance(node.func, ast.Name) and node.func.id == 'Pdb'
-
-
-def _is_mktemp_call(node: ast.Call) -> bool:
-    if isinstance(node.func, ast.Attribute) and node.func.attr == 'mktemp':
-        # Cover:
-        #  * tempfile.mktemp().
-        #  * xxxx.mktemp().
-        return True
-
-    # Cover:
-    #  * mktemp().
-    return isinstance(node.func, ast.Name) and node.func.id == 'mktemp'
-
-
-def _is_yaml_unsafe_call(node: ast.Call) -> bool:
+def _has_yaml_unsafe_loader(node: ast.Call) -> bool:
     _n_args_max = 2
     _safe_loaders = ('BaseLoader', 'SafeLoader')
     _unsafe_loaders = ('Loader', 'UnsafeLoader', 'FullLoader')
-    if isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Name) and node.func.value.id == 'yaml':
-        if node.func.attr in {'unsafe_load', 'full_load'}:
-            # Cover:
-            #  * yaml.full_load().
-            #  * yaml.unsafe_load().
-            return True
-        if node.func.attr == 'load':
-            for keyword in node.keywords:
-                if keyword.arg == 'Loader' and isinstance(keyword.value, ast.Name):
-                    if keyword.value.id in _unsafe_loaders:
-                        # Cover:
-                        #  * yaml.load(x, Loader=Loader).
-                        #  * yaml.load(x, Loader=UnsafeLoader).
-                        #  * yaml.load(x, Loader=FullLoader).
-                        return True
-                    if keyword.value.id in _safe_loaders:
-                        # Cover:
-                        #  * yaml.load(x, Loader=BaseLoader).
-                        #  * yaml.load(x, Loader=SafeLoader).
-                        return False
-
-            if (
-                len(node.args) < _n_args_max  # noqa: PLR0916
-                or (isinstance(node.args[1], ast.Name) and node.args[1].id in _unsafe_loaders)
-                or (
-                    isinstance(node.args[1], ast.Attribute)
-                    and node.args[1].value.id == 'yaml'
-                    and node.args[1].attr in _unsafe_loaders
-                )
-            ):
+    for keyword in node.keywords:
+        if keyword.arg == 'Loader' and isinstance(keyword.value, ast.Name):
+            if keyword.value.id in _unsafe_loaders:
                 # Cover:
-                #  * yaml.load(x).
-                #  * yaml.load(x, Loader).
-                #  * yaml.load(x, UnsafeLoader).
-                #  * yaml.load(x, FullLoader).
-                #  * yaml.load(x, yaml.Loader).
-                #  * yaml.load(x, yaml.UnsafeLoader).
-                #  * yaml.load(x, yaml.FullLoader).
+                #  * yaml.load(x, Loader=Loader).
+                #  * yaml.load(x, Loader=UnsafeLoader).
+                #  * yaml.load(x, Loader=FullLoader).
                 return True
+            if keyword.value.id in _safe_loaders:
+                # Cover:
+                #  * yaml.load(x, Loader=BaseLoader).
+                #  * yaml.load(x, Loader=SafeLoader).
+                return False
+
     # Cover:
-    #  * unsafe_load(...).
-    #  * full_load(...).
-    return isinstance(node.func, ast.Name) and node.func.id in {'unsafe_load', 'full_load'}
+    #  * yaml.load(x).
+    #  * yaml.load(x, Loader).
+    #  * yaml.load(x, UnsafeLoader).
+    #  * yaml.load(x, FullLoader).
+    #  * yaml.load(x, yaml.Loader).
+    #  * yaml.load(x, yaml.UnsafeLoader).
+    #  * yaml.load(x, yaml.FullLoader).
+    return (
+        len(node.args) < _n_args_max
+        or (isinstance(node.args[1], ast.Name) and node.args[1].id in _unsafe_loaders)
+        or (
+            isinstance(node.args[1], ast.Attribute)
+            and isinstance(node.args[1].value, ast.Name)
+            and node.args[1].value.id == 'yaml'
+            and node.args[1].attr in _unsafe_loaders
+        )
+    )
 
 
 # ==============================================================================
@@ -345,375 +469,5162 @@ _binop = {
     ast.BitOr: operator.or_,
     ast.BitAnd: operator.and_,
 }
-_chmod_known_mode_values = (
-    'S_ISUID',
-    'S_ISGID',
-    'S_ENFMT',
-    'S_ISVTX',
-    'S_IREAD',
-    'S_IWRITE',
-    'S_IEXEC',
-    'S_IRWXU',
-    'S_IRUSR',
-    'S_IWUSR',
-    'S_IXUSR',
-    'S_IRWXG',
-    'S_IRGRP',
-    'S_IWGRP',
-    'S_IXGRP',
-    'S_IRWXO',
-    'S_IROTH',
-    'S_IWOTH',
-    'S_IXOTH',
-)
+_known_mode_values = {
+    name: getattr(stat, name)
+    for name in (
+        'S_ISUID',
+        'S_ISGID',
+        'S_ENFMT',
+        'S_ISVTX',
+        'S_IREAD',
+        'S_IWRITE',
+        'S_IEXEC',
+        'S_IRWXU',
+        'S_IRUSR',
+        'S_IWUSR',
+        'S_IXUSR',
+        'S_IRWXG',
+        'S_IRGRP',
+        'S_IWGRP',
+        'S_IXGRP',
+        'S_IRWXO',
+        'S_IROTH',
+        'S_IWOTH',
+        'S_IXOTH',
+    )
+}
+
+# NB: mode expressions with more nodes than this are not evaluated (real-world ones have less than a dozen nodes)
+_MODE_EXPR_MAX_SIZE = 256
+
+
+def _flatten_mode_expr(node: ast.expr) -> tuple[int | type, ...]:
+    """
+    Flatten a mode expression into a sequence of values and operators in postfix order.
+
+    The expression is traversed iteratively and at most `_MODE_EXPR_MAX_SIZE` nodes are visited, so that arbitrarily
+    large or deep expressions are rejected without any risk of RecursionError.
+
+    Args:
+        node: an AST node
+
+    Returns:
+        A tuple of integer values and operator types (e.g. ``(0o400, 0o200, ast.BitOr)`` for
+        ``stat.S_IRUSR | stat.S_IWUSR``), which only depends on the structure of the expression
+
+    Raises:
+        ValueError: if a node is encountered that cannot be processed or if the expression is too large
+    """
+    tokens: list[int | type] = []
+    stack = [node]
+    while stack:
+        if len(tokens) >= _MODE_EXPR_MAX_SIZE:
+            msg = f'Mode expression has more than {_MODE_EXPR_MAX_SIZE} nodes'
+            raise ValueError(msg)
+        node = stack.pop()
+        if isinstance(node, ast.BinOp) and type(node.op) in _binop:
+            tokens.append(type(node.op))
+            stack.extend((node.left, node.right))
+        elif isinstance(node, ast.UnaryOp) and type(node.op) in _unop:
+            tokens.append(type(node.op))
+            stack.append(node.operand)
+        elif isinstance(node, ast_Constant) and isinstance(node.value, int) and not isinstance(node.value, bool):
+            tokens.append(node.value)
+        elif isinstance(node, ast.Name) and node.id in _known_mode_values:
+            tokens.append(_known_mode_values[node.id])
+        elif (
+            isinstance(node, ast.Attribute)
+            and isinstance(node.value, ast.Name)
+            and node.attr in _known_mode_values
+            and node.value.id == 'stat'
+        ):
+            tokens.append(_known_mode_values[node.attr])
+        else:
+            msg = f'Do not know how to process node: {ast.dump(node)}'
+            raise ValueError(msg)
+
+    # NB: operators are recorded before their operands (right operand first) -> reversed sequence is in postfix order
+    tokens.reverse()
+    return tuple(tokens)
+
+
+@functools.lru_cache(maxsize=1024)
+def _evaluate_mode_tokens(tokens: tuple[int | type, ...]) -> int | None:
+    """
+    Evaluate a mode expression flattened by `_flatten_mode_expr()`.
+
+    Returns:
+        The integer value of the expression or None if it does not evaluate to an integer (e.g. division by zero)
+    """
+    stack: list[Any] = []
+    try:
+        for token in tokens:
+            if token in _binop:
+                right = stack.pop()
+                stack[-1] = _binop[token](stack[-1], right)
+            elif token in _unop:
+                stack[-1] = _unop[token](stack[-1])
+            else:
+                stack.append(token)
+    except (ArithmeticError, TypeError):
+        return None
 
+    (value,) = stack
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    return int(value)
 
-def _chmod_get_mode(node):
+
+def _evaluate_mode(node: ast.expr) -> int:
     """
-    Extract the mode constant of a node.
+    Evaluate a constant mode expression made of integers, `stat.S_I*` constants and arithmetic operators.
+
+    This is shared by all the checks on permission modes. The evaluation is memoized on the structure of the
+    expression.
 
     Args:
         node: an AST node
 
     Raises:
-        ValueError: if a node is encountered that cannot be processed
-    """
-    if isinstance(node, ast.Name) and node.id in _chmod_known_mode_values:
-        return getattr(stat, node.id)
-    if (
-        isinstance(node, ast.Attribute)
-        and isinstance(node.value, ast.Name)
-        and node.attr in _chmod_known_mode_values
-        and node.value.id == 'stat'
-    ):
-        return getattr(stat, node.attr)
-    if isinstance(node, ast.UnaryOp):
-        return _unop[type(node.op)](_chmod_get_mode(node.operand))
-    if isinstance(node, ast.BinOp):
-        return _binop[type(node.op)](_chmod_get_mode(node.left), _chmod_get_mode(node.right))
-
-    msg = f'Do not know how to process node: {ast.dump(node)}'
-    raise ValueError(msg)
+        ValueError: if the expression cannot be evaluated
+    """
+    value = _evaluate_mode_tokens(_flatten_mode_expr(node))
+    if value is None:
+        msg = f'Mode expression does not evaluate to an integer: {ast.dump(node)}'
+        raise ValueError(msg)
+    return value
 
 
 def _chmod_has_wx_for_go(node):
-    if platform.system() == 'Windows':
-        # On Windows, only stat.S_IREAD and stat.S_IWRITE can be used, all other bits are ignored
+    mode_node = _get_mode_node(node, args_idx=1)
+    if mode_node is None:
+        # NB: incomplete code such as `os.chmod("file.txt")` or a mode passed in `*args` or `**kwargs`
         return False
-
     try:
-        modes = None
-        if len(node.args) > 1:
-            modes = _chmod_get_mode(node.args[1])
-        elif node.keywords:
-            for keyword in node.keywords:
-                if keyword.arg == 'mode':
-                    modes = _chmod_get_mode(keyword.value)
-                    break
+        modes = _evaluate_mode(mode_node)
     except ValueError:
         return False
-    else:
-        if modes is None:
-            # NB: this would be from invalid code such as `os.chmod("file.txt")`
-            msg = 'Unable to extract `mode` argument from function call!'
-            raise RuntimeError(msg)
-        # pylint: disable=no-member
-        return bool(modes & (stat.S_IWGRP | stat.S_IXGRP | stat.S_IWOTH | stat.S_IXOTH))
+    # pylint: disable=no-member
+    return bool(modes & (stat.S_IWGRP | stat.S_IXGRP | stat.S_IWOTH | stat.S_IXOTH))
 
 
 # ==============================================================================
+# Call dispatch index
 
 
-class Visitor(ast.NodeVisitor):
-    """AST visitor class for the plugin."""
+def _get_callee_parts(func: ast.expr) -> tuple[str | None, str | None]:
+    """
+    Split the callee of a function call into its dotted prefix and terminal name.
 
-    os_mkdir_modes_allowed: ClassVar[list[int]] = []
-    os_mkdir_modes_msg_arg: ClassVar[str] = ''
-    os_mkfifo_modes_allowed: ClassVar[list[int]] = []
-    os_mkfifo_modes_msg_arg: ClassVar[str] = ''
-    os_mknod_modes_allowed: ClassVar[list[int]] = []
-    os_mknod_modes_msg_arg: ClassVar[str] = ''
-    os_open_modes_allowed: ClassVar[list[int]] = []
-    os_open_modes_msg_arg: ClassVar[str] = ''
+    Args:
+        func: The ``func`` attribute of an ast.Call node
 
-    mode_msg_map: ClassVar[dict[str, str]] = {
-        SCS112: 'open',
-        SCS116: 'mkdir',
-        SCS117: 'mkfifo',
-        SCS118: 'mknod',
-    }
+    Returns:
+        A tuple ``(prefix, name)``. For a bare name call such as ``eval(x)``, ``prefix`` is the empty string. For an
+        attribute call such as ``os.path.abspath(x)``, ``prefix`` is the dotted name of the object (``'os.path'``) or
+        None if the object is not a simple dotted name (e.g. ``foo().bar()``). For any other callee, both are None.
+    """
+    if isinstance(func, ast.Name):
+        return '', func.id
+    if isinstance(func, ast.Attribute):
+        parts = []
+        value = func.value
+        while isinstance(value, ast.Attribute):
+            parts.append(value.attr)
+            value = value.value
+        if isinstance(value, ast.Name):
+            parts.append(value.id)
+            return '.'.join(reversed(parts)), func.attr
+        return None, func.attr
+    return None, None
 
-    def _format_mode_msg(self, msg_id):
-        """Format a mode message."""
-        return self.__class__.format_mode_msg(msg_id)
 
-    @classmethod
-    def format_mode_msg(cls, msg_id):
-        """Format a mode message."""
-        return msg_id.format(getattr(cls, f'os_{cls.mode_msg_map[msg_id]}_modes_msg_arg'))
+# NB: conventional aliases of some modules, resolved even if the file does not import the module under that name
+_DEFAULT_ALIASES: dict[str, str] = {'op': 'os.path', 'sp': 'subprocess'}
 
-    def __init__(self) -> None:
-        """Initialize a Visitor object."""
-        self.errors: list[tuple[int, int, str]] = []
-        self._from_imports: dict[str, str] = {}
 
-    def visit_Call(self, node: ast.Call) -> None:  # noqa: C901, PLR0912
-        """Visitor method called for ast.Call nodes."""
-        if _is_pdb_call(node):
-            self.errors.append((node.lineno, node.col_offset, SCS107))
-        elif _is_mktemp_call(node):
-            self.errors.append((node.lineno, node.col_offset, SCS104))
-        elif _is_yaml_unsafe_call(node):
-            self.errors.append((node.lineno, node.col_offset, SCS105))
-        elif _is_function_call(node, module='jsonpickle', function='decode'):
-            self.errors.append((node.lineno, node.col_offset, SCS106))
-        elif _is_function_call(node, module='os', function='system'):
-            self.errors.append((node.lineno, node.col_offset, SCS102))
-        elif _is_os_path_call(node):
-            self.errors.append((node.lineno, node.col_offset, SCS100))
-        elif _is_function_call(node, module='os', function='popen'):
-            self.errors.append((node.lineno, node.col_offset, SCS110))
-        elif _is_shell_true_call(node):
-            self.errors.append((node.lineno, node.col_offset, SCS103))
-        elif _is_builtin_open_for_writing(node):
-            self.errors.append((node.lineno, node.col_offset, SCS109))
-        elif isinstance(node.func, ast.Name) and (node.func.id in {'eval', 'exec'}):
-            self.errors.append((node.lineno, node.col_offset, SCS101))
-        elif not _is_posix() and _is_function_call(node, module='shlex', function='quote'):
-            self.errors.append((node.lineno, node.col_offset, SCS111))
-        elif (
-            _is_function_call(node, module='os', function='open')
-            and self.os_open_modes_allowed
-            and not _is_allowed_mode(node, self.os_open_modes_allowed, args_idx=2)
-        ):
-            self.errors.append((node.lineno, node.col_offset, self._format_mode_msg(SCS112)))
-        elif _is_function_call(node, module='pickle', function=('load', 'loads')):
-            self.errors.append((node.lineno, node.col_offset, SCS113))
-        elif _is_function_call(node, module='marshal', function=('load', 'loads')):
-            self.errors.append((node.lineno, node.col_offset, SCS114))
-        elif _is_function_call(node, module='shelve', function='open'):
-            self.errors.append((node.lineno, node.col_offset, SCS115))
-        elif _is_function_call(node, module='os', function='chmod') and _chmod_has_wx_for_go(node):
-            self.errors.append((node.lineno, node.col_offset, SCS119))
-        elif _is_unix():
-            if (
-                _is_function_call(node, module='os', function=('mkdir', 'makedirs'))
-                and self.os_mkdir_modes_allowed
-                and not _is_allowed_mode(node, self.os_mkdir_modes_allowed, args_idx=1)
-            ):
-                self.errors.append((node.lineno, node.col_offset, self._format_mode_msg(SCS116)))
-            elif (
-                _is_function_call(node, module='os', function='mkfifo')
-                and self.os_mkfifo_modes_allowed
-                and not _is_allowed_mode(node, self.os_mkfifo_modes_allowed, args_idx=1)
-            ):
-                self.errors.append((node.lineno, node.col_offset, self._format_mode_msg(SCS117)))
-            elif (
-                _is_function_call(node, module='os', function='mknod')
-                and self.os_mknod_modes_allowed
-                and not _is_allowed_mode(node, self.os_mknod_modes_allowed, args_idx=1)
-            ):
-                self.errors.append((node.lineno, node.col_offset, self._format_mode_msg(SCS118)))
+def _resolve_callee(func: ast.expr, aliases: dict[str, str]) -> tuple[str | None, str | None]:
+    """
+    Resolve the callee of a function call to its fully-qualified dotted prefix and terminal name.
 
-        self.generic_visit(node)
+    Args:
+        func: The ``func`` attribute of an ast.Call node
+        aliases: Mapping of local names to the fully-qualified names they were imported as
 
-    def visit_Import(self, node: ast.Import) -> None:
-        """Visitor method called for ast.Import nodes."""
-        for alias in node.names:
-            if alias.name == 'pdb':
-                # Cover:
-                #  * import pdb.
-                #  * import pdb as xxx.
-                self.errors.append((node.lineno, node.col_offset, SCS107))
+    Returns:
+        Same as `_get_callee_parts()`, except that the first component of the callee is replaced by its
+        fully-qualified name if it was imported. For example, ``proc.run(x)`` after ``import subprocess as proc``
+        resolves to ``('subprocess', 'run')`` and ``run_cmd(x)`` after ``from os import system as run_cmd`` resolves
+        to ``('os', 'system')``.
+    """
+    prefix, name = _get_callee_parts(func)
+    if prefix:
+        head, sep, tail = prefix.partition('.')
+        qualified = aliases.get(head)
+        if qualified is not None:
+            prefix = qualified + sep + tail
+    elif prefix is not None:
+        qualified = aliases.get(name)
+        if qualified is not None:
+            prefix, _, name = qualified.rpartition('.')
+    return prefix, name
 
-        self.generic_visit(node)
 
-    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:  # noqa: C901
-        """Visitor method called for ast.ImportFrom nodes."""
-        for alias in node.names:
-            if (node.module is None and alias.name == 'pdb') or node.module == 'pdb':
-                # Cover:
-                #  * from pdb import xxx.
-                self.errors.append((node.lineno, node.col_offset, SCS107))
-            elif node.module == 'tempfile' and alias.name == 'mktemp':
-                # Cover:
-                #  * from tempfile import mktemp.
-                self.errors.append((node.lineno, node.col_offset, SCS104))
-            elif node.module in {'os.path', 'op'} and alias.name in {'relpath', 'abspath'}:
-                # Cover:
-                #  * from os.path import relpath, abspath.
-                #  * import os.path as op; from op import relpath, abspath.
-                self.errors.append((node.lineno, node.col_offset, SCS100))
-            elif (node.module == 'subprocess' and alias.name in {'getoutput', 'getstatusoutput'}) or (
-                node.module == 'asyncio' and alias.name == 'create_subprocess_shell'
-            ):
-                # Cover:
-                # * from subprocess import getoutput.
-                # * from subprocess import getstatusoutput.
-                # * from asyncio import create_subprocess_shell.
-                self.errors.append((node.lineno, node.col_offset, SCS103))
-            elif node.module == 'os' and alias.name == 'system':
-                # Cover:
-                # * from os import system.
-                self.errors.append((node.lineno, node.col_offset, SCS102))
-            elif node.module == 'os' and alias.name == 'popen':
-                # Cover:
-                # * from os import popen.
-                self.errors.append((node.lineno, node.col_offset, SCS110))
-            elif not _is_posix() and node.module == 'shlex' and alias.name == 'quote':
-                # Cover:
-                # * from shlex import quote.
-                # * from shlex import quote as quoted.
-                self.errors.append((node.lineno, node.col_offset, SCS111))
-            elif node.module == 'pickle' and alias.name in {'load', 'loads'}:
-                # Cover:
-                # * from pickle import load.
-                # * from pickle import loads as load.
-                self.errors.append((node.lineno, node.col_offset, SCS113))
-            elif node.module == 'marshal' and alias.name in {'load', 'loads'}:
-                # Cover:
-                # * from marshal import load.
-                # * from marshal import loads as load.
-                self.errors.append((node.lineno, node.col_offset, SCS114))
-            elif node.module == 'shelve' and alias.name == 'open':
-                # Cover:
-                # * from shelve import open.
-                self.errors.append((node.lineno, node.col_offset, SCS115))
-        self.generic_visit(node)
+def _update_aliases(aliases: dict[str, str], node: ast.Import | ast.ImportFrom) -> None:
+    """
+    Record the names bound by an import statement in a table of aliases.
 
-    def visit_With(self, node: ast.With) -> None:
-        """Visitor method called for ast.With nodes."""
-        for item in node.items:
-            if isinstance(item.context_expr, ast.Call):
-                if _is_builtin_open_for_writing(item.context_expr):
-                    self.errors.append((node.lineno, node.col_offset, SCS109))
-                elif _is_function_call(item.context_expr, module='os', function='open') and not _is_allowed_mode(
-                    item.context_expr, self.os_open_modes_allowed, args_idx=2
-                ):
-                    self.errors.append((node.lineno, node.col_offset, self._format_mode_msg(SCS112)))
-                elif _is_function_call(item.context_expr, module='shelve', function='open'):
-                    self.errors.append((node.lineno, node.col_offset, SCS115))
+    Args:
+        aliases: Mapping of local names to the fully-qualified names they were imported as
+        node: Import statement
+    """
+    for alias in node.names:
+        if isinstance(node, ast.Import):
+            if alias.asname is not None:
+                aliases[alias.asname] = alias.name
+            else:
+                # NB: `import a.b` binds `a` to the module itself, shadowing any previous alias
+                aliases.pop(alias.name.partition('.')[0], None)
+        elif node.level == 0 and alias.name != '*':
+            aliases[alias.asname or alias.name] = f'{node.module}.{alias.name}'
+        else:
+            # NB: relative imports cannot be resolved to fully-qualified names
+            aliases.pop(alias.asname or alias.name, None)
 
-    def visit_Assert(self, node: ast.Assert) -> None:
-        """Visitor method called for ast.Assert nodes."""
-        self.errors.append((node.lineno, node.col_offset, SCS108))
-        self.generic_visit(node)
 
+def _mode_not_allowed(policy_name: str, args_idx: int) -> Callable[[Visitor, ast.Call], bool]:
+    """
+    Create a predicate checking the mode argument of a call against one of the mode policies of the Visitor class.
 
-class Plugin:  # pylint: disable=R0903
-    """Plugin class."""
+    Args:
+        policy_name: Name of the policy attribute of the Visitor class (e.g. 'os_open_mode_policy')
+        args_idx: Index of the mode argument among the positional arguments of the call
+    """
 
-    name = __name__
-    version = importlib.metadata.version(__name__)
+    def _predicate(visitor: Visitor, node: ast.Call) -> bool:
+        policy = getattr(visitor, policy_name)
+        return policy is not None and not _is_allowed_mode(node, policy, args_idx=args_idx)
 
-    def __init__(self, tree: ast.AST):
-        """Initialize a Plugin object."""
-        self._tree = tree
+    return _predicate
 
-    @classmethod
-    def add_options(cls: type[Plugin], option_manager: flake8.options.manager.OptionManager) -> None:
-        """Add command line options."""
-        options_data: ClassVar[dict[str, dict[str, str | bool]]] = (
-            (
-                '--os-mkdir-mode',
-                {
-                    'type': str,
-                    'parse_from_config': True,
-                    'default': False,
-                    'dest': 'os_mkdir_mode',
-                    'help': "If provided, configure how 'mode' parameter of the os.mkdir() function are handled",
-                },
-            ),
-            (
-                '--os-mkfifo-mode',
-                {
-                    'type': str,
-                    'parse_from_config': True,
-                    'default': False,
-                    'dest': 'os_mkfifo_mode',
-                    'help': "If provided, configure how 'mode' parameter of the os.mkfifo() function are handled",
-                },
-            ),
-            (
-                '--os-mknod-mode',
-                {
-                    'type': str,
-                    'parse_from_config': True,
-                    'default': False,
-                    'dest': 'os_mknod_mode',
-                    'help': "If provided, configure how 'mode' parameter of the os.mknod() function are handled",
-                },
-            ),
-            (
-                '--os-open-mode',
-                {
-                    'type': str,
-                    'parse_from_config': True,
-                    'default': False,
-                    'dest': 'os_open_mode',
-                    'help': "If provided, configure how 'mode' parameter of the os.open() function are handled",
-                },
-            ),
-        )
 
-        if _use_optparse:  # pragma: no cover
-            cls.add_options_optparse(option_manager, options_data)
-        else:
-            cls.add_options_argparse(option_manager, options_data)
+_CALL = 'call'
+_WITH = 'with'
+_IMPORT = 'import'
 
-    @classmethod
-    def add_options_optparse(
-        cls: type[Plugin], option_manager: flake8.options.manager.OptionManager, options_data: tuple
-    ) -> None:  # pragma: no cover
-        """Add command line options using optparse."""
 
-        def octal_mode_option_callback(option, _, value, parser):
-            """Octal mode option callback."""
-            setattr(parser.values, f'{option.dest}', _read_octal_mode_option(option.dest, value, _DEFAULT_MAX_MODE))
+class _Rule(NamedTuple):
+    """
+    Rule of the plugin for some fully-qualified name.
 
-        callback = {'action': 'callback', 'callback': octal_mode_option_callback}
-        for opt_str, kwargs in options_data:
-            option_manager.add_option(opt_str, **{**kwargs, **callback})
+    Attributes:
+        name: Fully-qualified name matched by the rule: a bare name for builtins (e.g. 'eval'), a dotted name (e.g.
+            'os.system'), a name starting with '*.' to match any callee with that terminal name (e.g. '*.mktemp') or a
+            module name followed by '.*' to match all the names of the module (e.g. 'pdb.*')
+        msg: Error message (or message template for mode-related errors)
+        forms: Forms of use matched by the rule: function calls (_CALL), function calls used as context expressions of
+            `with` statements and reported at the position of the statement (_WITH) and import statements (_IMPORT)
+        platform: Name of the `_PlatformProfile` attribute that must be true for the rule to apply or None
+        predicate: Additional check on the call node or None if matching the name is enough (not supported for
+            imports)
+    """
 
-    @classmethod
-    def add_options_argparse(
-        cls: type[Plugin], option_manager: flake8.options.manager.OptionManager, options_data: tuple
-    ) -> None:
-        """Add command line options using argparse."""
+    name: str
+    msg: str
+    forms: tuple[str, ...] = (_CALL,)
+    platform: str | None = None
+    predicate: Callable[[Visitor, ast.Call], bool] | None = None
 
-        class OctalModeAction(argparse.Action):
-            """Action class for octal mode options."""
 
-            def __call__(self, parser, namespace, values, option_string=None):  # noqa: ARG002
-                setattr(namespace, self.dest, _read_octal_mode_option(self.dest, values, _DEFAULT_MAX_MODE))
+# NB: for a given terminal name, the rules are sorted by priority and only the first matching rule is reported
+_RULES = (
+    _Rule('pdb.*', SCS107, (_CALL, _IMPORT)),
+    _Rule('Pdb', SCS107),
+    _Rule('*.mktemp', SCS104),
+    _Rule('tempfile.mktemp', SCS104, (_IMPORT,)),
+    _Rule('unsafe_load', SCS105),
+    _Rule('full_load', SCS105),
+    _Rule('yaml.unsafe_load', SCS105),
+    _Rule('yaml.full_load', SCS105),
+    _Rule('yaml.load', SCS105, predicate=lambda _, node: _has_yaml_unsafe_loader(node)),
+    _Rule('jsonpickle.decode', SCS106),
+    _Rule('os.system', SCS102, (_CALL, _IMPORT)),
+    _Rule('os.path.abspath', SCS100, (_CALL, _IMPORT)),
+    _Rule('os.path.relpath', SCS100, (_CALL, _IMPORT)),
+    _Rule('os.popen', SCS110, (_CALL, _IMPORT)),
+    *(
+        _Rule(f'subprocess.{name}', SCS103, predicate=lambda _, node: _has_shell_true_argument(node))
+        for name in ('call', 'check_call', 'check_output', 'Popen', 'run')
+    ),
+    _Rule('subprocess.getoutput', SCS103, (_CALL, _IMPORT)),
+    _Rule('subprocess.getstatusoutput', SCS103, (_CALL, _IMPORT)),
+    _Rule('asyncio.create_subprocess_shell', SCS103, (_CALL, _IMPORT)),
+    # NB: `loop` is the conventional name of an asyncio event loop, which cannot be resolved from the import statements
+    _Rule('loop.subprocess_shell', SCS103),
+    _Rule('open', SCS109, (_CALL, _WITH), predicate=lambda _, node: _is_builtin_open_for_writing(node)),
+    _Rule('eval', SCS101),
+    _Rule('exec', SCS101),
+    _Rule('shlex.quote', SCS111, (_CALL, _IMPORT), platform='non_posix'),
+    _Rule('os.open', SCS112, (_CALL, _WITH), predicate=_mode_not_allowed('os_open_mode_policy', args_idx=2)),
+    _Rule('pickle.load', SCS113, (_CALL, _IMPORT)),
+    _Rule('pickle.loads', SCS113, (_CALL, _IMPORT)),
+    _Rule('marshal.load', SCS114, (_CALL, _IMPORT)),
+    _Rule('marshal.loads', SCS114, (_CALL, _IMPORT)),
+    _Rule('shelve.open', SCS115, (_CALL, _WITH, _IMPORT)),
+    # NB: on Windows, only stat.S_IREAD and stat.S_IWRITE can be used, all other bits are ignored
+    _Rule('os.chmod', SCS119, platform='non_windows', predicate=lambda _, node: _chmod_has_wx_for_go(node)),
+    _Rule('os.mkdir', SCS116, platform='posix', predicate=_mode_not_allowed('os_mkdir_mode_policy', args_idx=1)),
+    _Rule('os.makedirs', SCS116, platform='posix', predicate=_mode_not_allowed('os_mkdir_mode_policy', args_idx=1)),
+    _Rule('os.mkfifo', SCS117, platform='posix', predicate=_mode_not_allowed('os_mkfifo_mode_policy', args_idx=1)),
+    _Rule('os.mknod', SCS118, platform='posix', predicate=_mode_not_allowed('os_mknod_mode_policy', args_idx=1)),
+)
 
-        action = {'action': OctalModeAction}
-        for opt_str, kwargs in options_data:
-            option_manager.add_option(opt_str, **{**kwargs, **action})
+
+class _CallRule(NamedTuple):
+    """
+    Rule compiled for function calls or import statements with a given terminal name.
+
+    Attributes:
+        msg: Error message (or message template for mode-related errors)
+        prefix: Accepted dotted prefix for the callee ('' for bare names) or None to accept any callee
+        platform: Name of the `_PlatformProfile` attribute that must be true for the rule to apply or None
+        predicate: Additional check on the call node or None if matching the callee is enough
+    """
+
+    msg: str
+    prefix: str | None
+    platform: str | None
+    predicate: Callable[[Visitor, ast.Call], bool] | None
+
+
+class _RuleIndex(NamedTuple):
+    """
+    Lookup structures for one form of use of a list of rules.
+
+    Attributes:
+        names: Rules indexed by terminal name, sorted by priority
+        modules: Rules applying to all the names of a module, indexed by module name
+    """
+
+    names: dict[str, tuple[_CallRule, ...]]
+    modules: dict[str, _CallRule]
+
+
+def _compile_rule_index(rules: tuple[_Rule, ...], form: str) -> _RuleIndex:
+    """
+    Compile the rules applying to one form of use into lookup structures.
+
+    Args:
+        rules: Rules, sorted by priority
+        form: Form of use (one of _CALL, _WITH or _IMPORT)
+    """
+    names: dict[str, tuple[_CallRule, ...]] = {}
+    modules: dict[str, _CallRule] = {}
+    for rule in rules:
+        if form not in rule.forms:
+            continue
+        prefix, _, name = rule.name.rpartition('.')
+        if name == '*':
+            modules.setdefault(prefix, _CallRule(rule.msg, None, rule.platform, rule.predicate))
+        else:
+            compiled = _CallRule(rule.msg, None if prefix == '*' else prefix, rule.platform, rule.predicate)
+            names[name] = (*names.get(name, ()), compiled)
+    return _RuleIndex(names, modules)
+
+
+def _get_rule_keyword(rule: _Rule) -> str:
+    """Return the name that must appear in the source code for a rule to report an error."""
+    prefix, _, name = rule.name.rpartition('.')
+    return prefix if name == '*' else name
+
+
+# ==============================================================================
+# Source code prefilter
+
+
+def _build_keywords_regex(keywords: set[str]) -> re.Pattern:
+    """
+    Build a regular expression matching any of a set of keywords as a whole word.
+
+    The keywords are arranged into a prefix tree so that the cost of matching at a given position of the text only
+    depends on the length of the keywords and not on their number.
+
+    Args:
+        keywords: Set of keywords (identifiers)
+    """
+    trie: dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def _to_regex(node: dict[str, dict]) -> str:
+        alternatives = [re.escape(char) + _to_regex(child) for char, child in sorted(node.items()) if char]
+        if not alternatives:
+            return ''
+        if '' in node:
+            return f'(?:{"|".join(alternatives)})?'
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return f'(?:{"|".join(alternatives)})'
+
+    return re.compile(rf'\b{_to_regex(trie)}\b', re.ASCII)
+
+
+def _may_have_errors(lines: list[str], keywords_re: re.Pattern) -> bool:
+    """
+    Check whether some source code may contain errors reported by the plugin.
+
+    This is a single pass over the source code, looking for any of the names that the enabled rules of the plugin rely
+    on. If none can be found, the AST cannot contain any error either.
+
+    Args:
+        lines: Lines of source code
+        keywords_re: Regular expression matching the keywords of the enabled rules
+    """
+    text = ''.join(lines)
+    if not text.isascii():
+        # NB: non-ASCII identifiers are NFKC-normalized by the parser, so a keyword may not appear verbatim in the text
+        return True
+    return keywords_re.search(text) is not None
+
+
+_NON_ASCII_RE = re.compile(rb'[^\x00-\x7f]')
+
+
+_ASCII_CHARS = ''.join(map(chr, range(128)))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_bytes_keywords_regex(keywords_re: re.Pattern) -> re.Pattern:
+    """Return the equivalent of a regular expression built by `_build_keywords_regex()` matching bytes."""
+    return re.compile(keywords_re.pattern.encode('ascii'))
+
+
+@functools.lru_cache(maxsize=None)
+def _is_ascii_compatible(encoding: str) -> bool:
+    """Check whether an encoding decodes ASCII bytes to the same characters (unlike e.g. UTF-7 or EBCDIC codecs)."""
+    try:
+        return _ASCII_CHARS.encode('ascii').decode(encoding) == _ASCII_CHARS
+    except (LookupError, UnicodeDecodeError):
+        return False
+
+
+def _may_have_errors_in_buffer(data: bytes | mmap.mmap, keywords_re: re.Pattern) -> bool:
+    """
+    Check whether the raw content of a file may contain errors reported by the plugin (see `_may_have_errors()`).
+
+    The content is searched without decoding it (nor copying it), which gives the same answer as long as the encoding
+    of the file (see PEP 263) is compatible with ASCII.
+
+    Args:
+        data: Content of the file (e.g. a memory-mapped file)
+        keywords_re: Regular expression matching the keywords of the enabled rules
+    """
+    if _get_bytes_keywords_regex(keywords_re).search(data) is not None:
+        return True
+    # NB: non-ASCII identifiers are NFKC-normalized by the parser, so a keyword may not appear verbatim in the text
+    if _NON_ASCII_RE.search(data) is not None:
+        return True
+
+    try:
+        encoding = _detect_buffer_encoding(data)
+    except SyntaxError:
+        return True
+    return not _is_ascii_compatible(encoding)
+
+
+def _detect_buffer_encoding(data: bytes | mmap.mmap) -> str:
+    """
+    Detect the encoding of the raw content of a file (see PEP 263) without copying it.
+
+    Raises:
+        SyntaxError: if the encoding declaration is invalid
+    """
+    # NB: the coding cookie can only be found in the first two lines
+    end = data.find(b'\n', data.find(b'\n') + 1)
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(data[: end + 1 if end >= 0 else len(data)]).readline)
+    return encoding
+
+
+# ==============================================================================
+# Rule sets
+
+_ALL_MESSAGES = (
+    SCS100,
+    SCS101,
+    SCS102,
+    SCS103,
+    SCS104,
+    SCS105,
+    SCS106,
+    SCS107,
+    SCS108,
+    SCS109,
+    SCS110,
+    SCS111,
+    SCS112,
+    SCS113,
+    SCS114,
+    SCS115,
+    SCS116,
+    SCS117,
+    SCS118,
+    SCS119,
+)
+
+# NB: messages reported by the handlers of statements that are not covered by the rule table
+_STATEMENT_MESSAGES = {ast.Assert: (SCS108,)}
+
+# NB: names that must appear in the source code for the statements above to report an error
+_STATEMENT_KEYWORDS = {SCS108: ('assert',)}
+
+
+def _get_code(msg: str) -> str:
+    """Return the error code (e.g. 'SCS100') of a message."""
+    return msg.split(' ', 1)[0]
+
+
+_ALL_CODES = frozenset(_get_code(msg) for msg in _ALL_MESSAGES)
+
+
+class _RuleSet(NamedTuple):
+    """
+    Set of enabled rules, compiled into the lookup structures used by the Visitor class.
+
+    Attributes:
+        codes: Enabled error codes
+        messages: Messages (or message templates) of the enabled rules
+        call_rules: Enabled rules for function calls
+        with_rules: Enabled rules for function calls used as context expressions of `with` statements
+        import_rules: Enabled rules for import statements
+        node_types: Types of AST nodes for which a handler needs to be called
+        keywords_re: Regular expression matching any of the names the enabled rules rely on, or None if no rule is
+            enabled
+    """
+
+    codes: frozenset[str]
+    messages: frozenset[str]
+    call_rules: _RuleIndex
+    with_rules: _RuleIndex
+    import_rules: _RuleIndex
+    node_types: frozenset[type]
+    keywords_re: re.Pattern | None
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_rule_set(codes: frozenset[str]) -> _RuleSet:
+    """
+    Compile the set of rules for a set of enabled error codes.
+
+    Args:
+        codes: Set of enabled error codes (e.g. {'SCS100', 'SCS108'})
+    """
+    codes = codes.intersection(_ALL_CODES)
+    messages = frozenset(msg for msg in _ALL_MESSAGES if _get_code(msg) in codes)
+    rules = tuple(rule for rule in _RULES if rule.msg in messages)
+    call_rules = _compile_rule_index(rules, _CALL)
+    with_rules = _compile_rule_index(rules, _WITH)
+    import_rules = _compile_rule_index(rules, _IMPORT)
+
+    node_types = {node_type for node_type, msgs in _STATEMENT_MESSAGES.items() if messages.intersection(msgs)}
+    if any(rule_index.names or rule_index.modules for rule_index in (call_rules, with_rules, import_rules)):
+        # NB: import statements are always visited to resolve the callees to their fully-qualified names
+        node_types.update((ast.Import, ast.ImportFrom))
+    if call_rules.names or call_rules.modules:
+        node_types.add(ast.Call)
+    if with_rules.names:
+        node_types.add(ast.With)
+
+    keywords = {_get_rule_keyword(rule) for rule in rules}
+    for msg, msg_keywords in _STATEMENT_KEYWORDS.items():
+        if msg in messages:
+            keywords.update(msg_keywords)
+
+    return _RuleSet(
+        codes=codes,
+        messages=messages,
+        call_rules=call_rules,
+        with_rules=with_rules,
+        import_rules=import_rules,
+        node_types=frozenset(node_types),
+        keywords_re=_build_keywords_regex(keywords) if keywords else None,
+    )
+
+
+_ALL_RULES = _compile_rule_set(_ALL_CODES)
+
+
+def _get_enabled_codes(options: argparse.Namespace) -> frozenset[str]:
+    """
+    Return the error codes of the plugin that are enabled by flake8's select and ignore options.
+
+    Args:
+        options: Options as parsed by flake8
+    """
+    codes = _ALL_CODES
+    if not hasattr(options, 'extended_default_select'):
+        # NB: options not parsed by flake8 (e.g. read from the configuration files by `flake8-scs scan`)
+        return _get_selected_codes(options)
+    try:
+        from flake8.style_guide import Decision, DecisionEngine  # noqa: PLC0415
+
+        engine = DecisionEngine(options)
+    except (ImportError, AttributeError):
+        # NB: options not coming from flake8 (or from a version without DecisionEngine) -> enable everything
+        return codes
+    return frozenset(code for code in codes if engine.decision_for(code) is Decision.Selected)
+
+
+def _get_selected_codes(options: argparse.Namespace) -> frozenset[str]:
+    """
+    Return the error codes of the plugin that are enabled by the select and ignore options, like flake8 does.
+
+    The codes of the plugin are selected by default (unless the select option is set) and a code matched by both the
+    select and ignore options is only enabled if it is selected explicitly and if the longest matching prefix is a
+    selected one.
+
+    Args:
+        options: Options with (optional) `select`, `ignore`, `extend_select` and `extend_ignore` lists of code prefixes
+    """
+    select = getattr(options, 'select', None)
+    extend_select = tuple(getattr(options, 'extend_select', None) or ())
+    explicitly_selected = (*(select or ()), *extend_select)
+    # NB: SCS is the prefix of the entry point of the plugin, selected by default by flake8
+    selected = (*(('SCS',) if select is None else select), *extend_select)
+    ignored = (*(getattr(options, 'ignore', None) or ()), *(getattr(options, 'extend_ignore', None) or ()))
+
+    def _longest_prefix(code, prefixes):
+        # NB: -1 if no prefix matches
+        return max((len(prefix) for prefix in prefixes if code.startswith(prefix)), default=-1)
+
+    codes = set()
+    for code in _ALL_CODES:
+        ignore_len = _longest_prefix(code, ignored)
+        if ignore_len < 0:
+            if _longest_prefix(code, selected) >= 0:
+                codes.add(code)
+        elif _longest_prefix(code, explicitly_selected) >= 0 and _longest_prefix(code, selected) > ignore_len:
+            codes.add(code)
+    return frozenset(codes)
+
+
+# ==============================================================================
+# Per-path rules
+
+# NB: same tokens as the ones of flake8's `per-file-ignores` option
+_FILES_TO_CODES_TOKEN_RE = re.compile(
+    r'(?P<code>[A-Z]+[0-9]*(?=$|\s|,))|(?P<file>[^\s:,]+)|(?P<colon>\s*:\s*)|(?P<sep>\s*,\s*|\s+)'
+)
+
+
+def _parse_files_to_codes_mapping(value: str | list[str]) -> list[tuple[str, list[str]]]:
+    """
+    Parse a mapping of file patterns to error codes, in the format of flake8's `per-file-ignores` option.
+
+    Args:
+        value: Mapping, e.g. `'tests/*.py: SCS108 setup.py,docs/*: SCS100'` (or list of lines of a mapping)
+
+    Returns:
+        List of (pattern, list of code prefixes) pairs
+
+    Raises:
+        ValueError: if the mapping is not valid
+    """
+    if not isinstance(value, str):
+        value = '\n'.join(value)
+    if not value.strip():
+        return []
+    msg = f'Expected a mapping from file patterns to error codes: {value.strip()!r}'
+
+    mapping = []
+    filenames: list[str] = []
+    codes: list[str] = []
+    seen_sep, seen_colon = True, False
+    for match in _FILES_TO_CODES_TOKEN_RE.finditer(value):
+        kind, token = match.lastgroup, match.group().strip()
+        if kind == 'sep':
+            seen_sep = True
+        elif kind == 'colon' and not seen_colon:
+            seen_colon = seen_sep = True
+        elif not seen_sep or kind == 'colon' or (kind == 'code' and not seen_colon):
+            raise ValueError(msg)
+        elif kind == 'file' and seen_colon:
+            mapping.extend((filename, codes) for filename in filenames if codes)
+            filenames, codes, seen_colon, seen_sep = [token], [], False, False
+        else:
+            (codes if seen_colon else filenames).append(token)
+            seen_sep = False
+    if not seen_colon:
+        raise ValueError(msg)
+    mapping.extend((filename, codes) for filename in filenames if codes)
+    return mapping
+
+
+class _PathRules:
+    """
+    Index of the error codes disabled for some paths.
+
+    Paths are specified using the same patterns as flake8's `per-file-ignores` option: patterns without a path
+    separator are matched against the name of the file, others against its absolute path. Contrary to
+    `per-file-ignores`, the codes disabled by all the matching patterns are combined.
+
+    Finding the codes disabled for a file costs a dictionary lookup per directory in its path plus a few pattern
+    matches, independently of the number of literal paths in the configuration.
+    """
+
+    def __init__(self, mapping: list[tuple[str, list[str]]], parent: str = os.curdir) -> None:
+        """
+        Initialize a _PathRules object.
+
+        Args:
+            mapping: List of (pattern, list of code prefixes) pairs
+            parent: Directory relative to which the patterns containing a path separator are interpreted
+        """
+        self._literal_paths: dict[str, frozenset[str]] = {}
+        self._name_patterns: list[tuple[str, frozenset[str]]] = []
+        self._path_patterns: dict[str, list[tuple[str, frozenset[str]]]] = {}
+
+        for pattern, prefixes in mapping:
+            codes = frozenset(code for code in _ALL_CODES if code.startswith(tuple(prefixes)))
+            if not codes:
+                continue
+
+            separators = (os.path.sep, os.path.altsep or os.path.sep)
+            if not any(separator in pattern for separator in separators):
+                self._name_patterns.append((pattern, codes))
+                continue
+
+            path = os.path.abspath(os.path.join(parent, pattern)).rstrip(''.join(separators))  # noqa: PTH100, PTH118
+            glob_index = next((idx for idx, char in enumerate(path) if char in '*?['), None)
+            if glob_index is None:
+                self._literal_paths[path] = self._literal_paths.get(path, frozenset()) | codes
+            else:
+                # NB: index the pattern by the directory containing its longest literal prefix
+                directory = os.path.dirname(path[: glob_index + 1])  # noqa: PTH120
+                self._path_patterns.setdefault(directory, []).append((path, codes))
 
     @classmethod
-    def parse_options(cls: type[Plugin], options: argparse.Namespace) -> None:
-        """Parse command line options."""
+    def from_option(cls: type[_PathRules], value: str | list[str]) -> _PathRules | None:
+        """
+        Create an index from the value of the `scs-per-path-rules` option.
 
-        def _set_mode_option(name, modes):
-            if isinstance(modes, int) and modes > 0:
-                setattr(Visitor, f'os_{name}_modes_allowed', list(range(modes + 1)))
-                setattr(Visitor, f'os_{name}_modes_msg_arg', f'0 < mode < {oct(modes)}')
-            elif modes:
-                setattr(Visitor, f'os_{name}_modes_allowed', modes)
-                setattr(Visitor, f'os_{name}_modes_msg_arg', f'mode in {[oct(mode) for mode in modes]}')
+        Args:
+            value: Value of the option, in the same format as flake8's `per-file-ignores` option
+
+        Returns:
+            The path rules or None if the option is empty
+
+        Raises:
+            ValueError: if the value is not a valid mapping
+        """
+        mapping = _parse_files_to_codes_mapping(value)
+        return cls(mapping) if mapping else None
+
+    def disabled_codes(self, filename: str) -> frozenset[str]:
+        """
+        Return the error codes disabled for a file.
+
+        Args:
+            filename: Path to the file
+        """
+        path = os.path.abspath(filename)  # noqa: PTH100
+        name = os.path.basename(path)  # noqa: PTH119
+        codes = self._literal_paths.get(path, frozenset())
+        for pattern, pattern_codes in self._name_patterns:
+            if fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(path, pattern):
+                codes |= pattern_codes
+
+        directory = path
+        while True:
+            parent = os.path.dirname(directory)  # noqa: PTH120
+            for pattern, pattern_codes in self._path_patterns.get(parent, ()):
+                if fnmatch.fnmatch(path, pattern):
+                    codes |= pattern_codes
+            if parent == directory:
+                break
+            directory = parent
+        return codes
+
+
+# ==============================================================================
+# Changed lines
+
+_HUNK_HEADER_RE = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+
+class _LineIntervals:
+    """
+    Sorted set of non-overlapping intervals of line numbers, supporting overlap queries in logarithmic time.
+
+    Attributes:
+        starts: First line of each interval
+        ends: Last line of each interval (inclusive)
+    """
+
+    def __init__(self, intervals: list[tuple[int, int]]) -> None:
+        """
+        Initialize a _LineIntervals object.
+
+        Args:
+            intervals: List of (first line, last line) intervals, in any order and possibly overlapping
+        """
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+        for start, end in sorted(intervals):
+            if self.ends and start <= self.ends[-1] + 1:
+                self.ends[-1] = max(self.ends[-1], end)
             else:
-                getattr(Visitor, f'os_{name}_modes_allowed').clear()
+                self.starts.append(start)
+                self.ends.append(end)
 
-        _set_mode_option('mkdir', options.os_mkdir_mode)
-        _set_mode_option('mkfifo', options.os_mkfifo_mode)
-        _set_mode_option('mknod', options.os_mknod_mode)
-        _set_mode_option('open', options.os_open_mode)
+    def overlaps(self, start: int, end: int) -> bool:
+        """Return True if some line between `start` and `end` (inclusive) is part of an interval."""
+        idx = bisect.bisect_right(self.starts, end) - 1
+        return idx >= 0 and self.ends[idx] >= start
 
-    def run(self) -> Generator[tuple[int, int, str, type[Any]], None, None]:
-        """Entry point for flake8."""
-        visitor = Visitor()
-        visitor.visit(self._tree)
 
-        for line, col, msg in visitor.errors:
-            yield line, col, msg, type(self)
+# NB: used for files that are not tracked by git or that were added since the git reference
+_ALL_LINES = _LineIntervals([(1, sys.maxsize)])
+
+
+class _DiffIndex:
+    """Index of the lines changed in each file since some git reference."""
+
+    def __init__(self, changed_lines: dict[str, _LineIntervals]) -> None:
+        """
+        Initialize a _DiffIndex object.
+
+        Args:
+            changed_lines: Intervals of changed lines, indexed by absolute path
+        """
+        self._changed_lines = changed_lines
+
+    @classmethod
+    def from_git(cls: type[_DiffIndex], ref: str, cwd: str | None = None) -> _DiffIndex:
+        """
+        Compute the lines changed in the working tree since a git reference.
+
+        Files that are not tracked by git (and not ignored) are considered as entirely changed.
+
+        Args:
+            ref: Any git reference (e.g. 'origin/main' or a commit SHA)
+            cwd: Directory from which to run git (defaults to the current directory)
+
+        Raises:
+            ValueError: if git fails (e.g. not in a git repository or invalid reference)
+        """
+        toplevel = Path(_run_git(['rev-parse', '--show-toplevel'], cwd).strip())
+        diff = _run_git(['diff', '--unified=0', '--no-color', '--no-ext-diff', '--no-renames', ref, '--'], toplevel)
+        untracked = _run_git(['ls-files', '--others', '--exclude-standard', '-z'], toplevel)
+
+        changed_lines = _parse_git_diff(diff, toplevel)
+        for path in untracked.split('\0'):
+            if path:
+                changed_lines[str(toplevel / path)] = _ALL_LINES
+        return cls(changed_lines)
+
+    def changed_lines(self, filename: str) -> _LineIntervals | None:
+        """
+        Return the lines changed in a file.
+
+        Args:
+            filename: Path to the file
+
+        Returns:
+            The intervals of changed lines or None if the file did not change
+        """
+        return self._changed_lines.get(str(Path(filename).resolve()))
+
+
+class _StagedIndex(_DiffIndex):
+    """
+    Index of the lines changed in the files staged for the next commit, along with their staged content.
+
+    The staged content of the files is read from the git index when needed, so that the working tree is left untouched
+    (e.g. files with changes that are not staged are checked as they will be committed).
+    """
+
+    def __init__(self, changed_lines: dict[str, _LineIntervals], toplevel: Path) -> None:
+        """
+        Initialize a _StagedIndex object.
+
+        Args:
+            changed_lines: Intervals of changed lines, indexed by absolute path
+            toplevel: Top-level directory of the git repository
+        """
+        super().__init__(changed_lines)
+        self._toplevel = toplevel
+        self._cat_file: _GitCatFile | None = None
+        self._pid = 0
+
+    @classmethod
+    def from_git(cls: type[_StagedIndex], ref: str = '', cwd: str | None = None) -> _StagedIndex:
+        """
+        Compute the lines changed in the git index since a git reference.
+
+        Args:
+            ref: Any git reference (defaults to HEAD)
+            cwd: Directory from which to run git (defaults to the current directory)
+
+        Raises:
+            ValueError: if git fails (e.g. not in a git repository or invalid reference)
+        """
+        toplevel = Path(_run_git(['rev-parse', '--show-toplevel'], cwd).strip())
+        # NB: without a reference, git compares the index to HEAD (or to an empty tree before the first commit)
+        refs = [ref] if ref else []
+        diff = _run_git(
+            ['diff', '--cached', '--unified=0', '--no-color', '--no-ext-diff', '--no-renames', *refs, '--'], toplevel
+        )
+        return cls(_parse_git_diff(diff, toplevel), toplevel)
+
+    def read_lines(self, filename: str) -> list[str] | None:
+        """
+        Read the lines of the staged content of a file.
+
+        Args:
+            filename: Path to the file
+
+        Returns:
+            Lines of source code of the file (decoded like flake8 does) or None if it cannot be read or decoded
+
+        Raises:
+            ValueError: if git cannot be run
+        """
+        try:
+            path = Path(filename).resolve().relative_to(self._toplevel).as_posix()
+        except ValueError:
+            return None
+        # NB: with `flake8 -j`, the worker processes may be forked from the main one and cannot share its git process
+        if self._cat_file is None or self._pid != os.getpid():
+            self._cat_file, self._pid = _GitCatFile(self._toplevel), os.getpid()
+        obj = self._cat_file.read(f':{path}')
+        if obj is None or obj[0] != 'blob':
+            return None
+        buffer = io.BytesIO(obj[1])
+        try:
+            encoding, _ = tokenize.detect_encoding(buffer.readline)
+            buffer.seek(0)
+            return io.TextIOWrapper(buffer, encoding, line_buffering=True).readlines()
+        except (LookupError, SyntaxError, UnicodeError):
+            return None
+
+
+def _parse_git_diff(diff: str, toplevel: Path) -> dict[str, _LineIntervals]:
+    """
+    Parse the output of `git diff --unified=0`.
+
+    Args:
+        diff: Output of git
+        toplevel: Top-level directory of the git repository
+
+    Returns:
+        Intervals of changed lines (in the new version of the files), indexed by absolute path
+    """
+    intervals: dict[str, list[tuple[int, int]]] = {}
+    added: set[str] = set()
+    current, is_added = None, False
+    for line in diff.splitlines():
+        if line.startswith('--- '):
+            is_added = line == '--- /dev/null'
+        elif line.startswith('+++ '):
+            path = _unquote_git_path(line[4:])
+            current = None if path is None else intervals.setdefault(str(toplevel / path), [])
+            if path is not None and is_added:
+                added.add(str(toplevel / path))
+        elif current is not None and line.startswith('@@'):
+            match = _HUNK_HEADER_RE.match(line)
+            if match is not None:
+                start, count = int(match.group(1)), int(match.group(2) or 1)
+                # NB: for deleted lines, mark the lines around the deletion as changed
+                current.append((start, start + count - 1) if count else (max(start, 1), start + 1))
+    # NB: files added since the reference are entirely changed, which allows to use the result cache for them
+    return {
+        path: _ALL_LINES if path in added else _LineIntervals(path_intervals)
+        for path, path_intervals in intervals.items()
+    }
+
+
+def _run_git(args: list[str], cwd: str | Path | None) -> str:
+    """
+    Run a git command and return its output.
+
+    Raises:
+        ValueError: if the command fails
+    """
+    try:
+        result = subprocess.run(
+            ['git', '-c', 'core.quotePath=false', *args],  # noqa: S607
+            cwd=cwd,
+            capture_output=True,
+            check=False,
+            encoding='utf-8',
+            errors='surrogateescape',
+        )
+    except OSError as err:
+        msg = f'Unable to run git: {err}'
+        raise ValueError(msg) from err
+    if result.returncode != 0:
+        msg = f'`git {" ".join(args)}` failed: {result.stderr.strip()}'
+        raise ValueError(msg)
+    return result.stdout
+
+
+def _unquote_git_path(path: str) -> str | None:
+    """
+    Convert a path from the header of a git diff to a path relative to the top-level directory of the repository.
+
+    Returns:
+        The path or None for /dev/null (deleted files)
+    """
+    if path.startswith('"'):
+        # NB: paths with special characters are quoted using C-style escapes
+        path = ast.literal_eval(f'b{path}').decode('utf-8', 'surrogateescape')
+    if path == '/dev/null':
+        return None
+    return path[2:] if path.startswith('b/') else path
+
+
+class _GitCatFile:
+    """
+    Reader of the objects of a git repository, through a single long-lived `git cat-file --batch` process.
+
+    Attributes:
+        n_objects: Number of objects read so far
+        hash_size: Size of the object IDs of the repository in bytes (20 for SHA-1, 32 for SHA-256), as found in the
+            header of the last object read
+    """
+
+    def __init__(self, cwd: str | Path | None = None) -> None:
+        """
+        Initialize a _GitCatFile object.
+
+        Args:
+            cwd: Directory from which to run git (defaults to the current directory)
+
+        Raises:
+            ValueError: if git cannot be run
+        """
+        try:
+            self._process = subprocess.Popen(
+                ['git', 'cat-file', '--batch'],  # noqa: S607
+                cwd=cwd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as err:
+            msg = f'Unable to run git: {err}'
+            raise ValueError(msg) from err
+        self.n_objects = 0
+        self.hash_size = 20
+
+    def __enter__(self) -> _GitCatFile:
+        """Enter the runtime context (nothing to do)."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Exit the runtime context, stopping the git process."""
+        self.close()
+
+    def close(self) -> None:
+        """Stop the git process."""
+        self._process.stdin.close()
+        self._process.stdout.close()
+        self._process.wait()
+
+    def read(self, name: str) -> tuple[str, bytes] | None:
+        """
+        Read an object.
+
+        Args:
+            name: Name of the object (e.g. SHA, `HEAD:path/to/file` or `:path/to/file` for the index)
+
+        Returns:
+            Type (e.g. 'blob') and content of the object, or None if there is no such object
+
+        Raises:
+            ValueError: if the git process exited
+        """
+        stdin, stdout = self._process.stdin, self._process.stdout
+        try:
+            stdin.write(name.encode('utf-8', 'surrogateescape') + b'\n')
+            stdin.flush()
+        except BrokenPipeError as err:
+            msg = '`git cat-file --batch` exited unexpectedly'
+            raise ValueError(msg) from err
+        header = stdout.readline()
+        if not header:
+            msg = '`git cat-file --batch` exited unexpectedly'
+            raise ValueError(msg)
+        # NB: the name of a missing or ambiguous object (which may contain spaces) is followed by `missing` or
+        #     `ambiguous`, the other objects by their SHA, type and size
+        header = header.rstrip(b'\n')
+        if header.endswith((b' missing', b' ambiguous')):
+            return None
+        sha, obj_type, size = header.rsplit(b' ', 2)
+        content = stdout.read(int(size) + 1)[:-1]
+        self.n_objects += 1
+        self.hash_size = len(sha) // 2
+        return obj_type.decode('ascii'), content
+
+
+def _parse_git_tree(content: bytes, hash_size: int = 20) -> dict[str, tuple[bytes, str]]:
+    """
+    Parse the content of a git tree object.
+
+    Args:
+        content: Content of the tree object, as read by `git cat-file`
+        hash_size: Size of the object IDs of the repository in bytes (20 for SHA-1, 32 for SHA-256)
+
+    Returns:
+        Mode (e.g. b'100644' for a file or b'40000' for a tree) and SHA of each entry of the tree, indexed by name
+    """
+    entries = {}
+    pos = 0
+    while pos < len(content):
+        space = content.index(b' ', pos)
+        nul = content.index(b'\0', space)
+        entries[content[space + 1 : nul].decode('utf-8', 'surrogateescape')] = (
+            content[pos:space],
+            content[nul + 1 : nul + 1 + hash_size].hex(),
+        )
+        pos = nul + 1 + hash_size
+    return entries
+
+
+# ==============================================================================
+# Baseline
+
+_BASELINE_HEADER = '# flake8-secure-coding-standard baseline v1\n'
+
+# NB: types of the nodes at the position of the errors reported by the plugin
+_REPORTED_NODE_TYPES = (ast.Assert, ast.Call, ast.Import, ast.ImportFrom, ast.With)
+_SCOPE_NODE_TYPES = (ast.AsyncFunctionDef, ast.ClassDef, ast.FunctionDef)
+
+_FLAKE8_OUTPUT_RE = re.compile(r'^(?P<path>.+?):(?P<line>\d+):(?P<col>\d+): (?P<code>SCS\d+) ')
+
+
+def _get_baseline_path(filename: str) -> str:
+    """Return the path of a file as stored in a baseline (relative to the current directory if possible)."""
+    path = Path(filename).resolve()
+    with contextlib.suppress(ValueError):
+        path = path.relative_to(Path.cwd())
+    return path.as_posix()
+
+
+# NB: types of the nodes of the lists containing statements (ast.match_case only exists since Python 3.10)
+_STATEMENT_CONTAINER_TYPES = tuple(
+    getattr(ast, name) for name in ('stmt', 'excepthandler', 'match_case') if hasattr(ast, name)
+)
+
+
+def _update_statement_aliases(aliases: dict[str, str], tree: ast.stmt) -> None:
+    """
+    Update a table of aliases with the import statements of a statement and of its nested statements.
+
+    The import statements of function and class definitions are skipped, since they only apply within them.
+
+    Args:
+        aliases: Table of aliases
+        tree: Statement
+    """
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            _update_aliases(aliases, node)
+            continue
+        if isinstance(node, _SCOPE_NODE_TYPES):
+            continue
+        for field in reversed(node._fields):
+            value = getattr(node, field, None)
+            # NB: import statements may only be found in lists of statements (e.g. bodies of compound statements)
+            if isinstance(value, list) and value and isinstance(value[0], _STATEMENT_CONTAINER_TYPES):
+                stack.extend(reversed(value))
+
+
+def _find_reported_nodes(
+    tree: ast.AST, errors: list[tuple[int, int, str]]
+) -> tuple[dict[tuple[int, int], tuple[ast.AST, str]], dict[str, str]]:
+    """
+    Find the nodes at the position of some errors.
+
+    Args:
+        tree: AST of the file
+        errors: Errors reported for the file, as (line, column, message) tuples
+
+    Returns:
+        Node and name of the enclosing functions or classes at each position, and table of aliases of the file
+    """
+    positions = {(line, col) for line, col, _ in errors}
+    error_lines = sorted(line for line, _ in positions)
+    nodes: dict[tuple[int, int], tuple[ast.AST, str]] = {}
+    aliases = dict(_DEFAULT_ALIASES)
+    stack: list[tuple[ast.AST, str]] = [(tree, '')]
+    while stack:
+        node, scope = stack.pop()
+        if isinstance(node, ast.stmt):
+            idx = bisect.bisect_left(error_lines, _get_first_lineno(node))
+            if idx == len(error_lines) or error_lines[idx] > node.end_lineno:
+                # NB: statements without errors are only searched for the import statements they contain
+                if not scope:
+                    _update_statement_aliases(aliases, node)
+                continue
+        if isinstance(node, _REPORTED_NODE_TYPES):
+            position = (node.lineno, node.col_offset)
+            if position in positions:
+                nodes.setdefault(position, (node, scope))
+            # NB: the import statements of functions and classes do not apply to the rest of the file
+            if isinstance(node, (ast.Import, ast.ImportFrom)) and not scope:
+                _update_aliases(aliases, node)
+        elif isinstance(node, _SCOPE_NODE_TYPES):
+            scope = f'{scope}.{node.name}' if scope else node.name
+        stack.extend((child, scope) for child in reversed(list(ast.iter_child_nodes(node))))
+
+    return nodes, aliases
+
+
+def _get_fingerprints(tree: ast.AST, filename: str, errors: list[tuple[int, int, str]]) -> list[str]:
+    """
+    Compute stable fingerprints for errors reported in a file.
+
+    A fingerprint does not depend on line numbers but on the path of the file, the error code, the name of the
+    enclosing function or class, the fully-qualified name of the callee (if any) and the reported node, normalized by
+    dumping its AST without positions. It is therefore preserved when code is moved around or reformatted within a
+    file.
+
+    Args:
+        tree: AST of the file
+        filename: Path to the file
+        errors: Errors reported for the file, as (line, column, message) tuples
+
+    Returns:
+        One fingerprint (hexadecimal string) per error
+    """
+    nodes, aliases = _find_reported_nodes(tree, errors)
+    path = _get_baseline_path(filename)
+    fingerprints = []
+    for line, col, msg in errors:
+        node, scope = nodes.get((line, col), (None, ''))
+        callee = ''
+        if isinstance(node, ast.With):
+            exprs = [item.context_expr for item in node.items]
+            calls = [expr for expr in exprs if isinstance(expr, ast.Call)]
+            if calls:
+                callee = '.'.join(filter(None, _resolve_callee(calls[0].func, aliases)))
+            text = ', '.join(map(ast.dump, exprs))
+        else:
+            if isinstance(node, ast.Call):
+                callee = '.'.join(filter(None, _resolve_callee(node.func, aliases)))
+            text = ast.dump(node) if node is not None else ''
+        key = '\0'.join((path, _get_code(msg), scope, callee, text))
+        fingerprints.append(hashlib.sha256(key.encode('utf-8', 'surrogatepass')).hexdigest()[:32])
+    return fingerprints
+
+
+class _Baseline:
+    """
+    Set of known errors that are not reported, indexed by fingerprint.
+
+    A baseline file starts with a header line followed by one line per known error, made of its fingerprint, its error
+    code and the path of the file it was reported in (the last two are only informative). The same fingerprint may
+    appear several times, in which case as many identical errors are not reported.
+    """
+
+    def __init__(self, counts: dict[str, int]) -> None:
+        """
+        Initialize a _Baseline object.
+
+        Args:
+            counts: Number of known errors for each fingerprint
+        """
+        self._counts = counts
+
+    @classmethod
+    def from_file(cls: type[_Baseline], filename: str) -> _Baseline:
+        """
+        Load a baseline file.
+
+        Args:
+            filename: Path to the baseline file
+
+        Raises:
+            ValueError: if the file cannot be read or is not a baseline file
+        """
+        counts: dict[str, int] = {}
+        try:
+            with Path(filename).open(encoding='utf-8') as fd:
+                if fd.readline() != _BASELINE_HEADER:
+                    msg = f'{filename} is not a baseline file'
+                    raise ValueError(msg)
+                for line in fd:
+                    fingerprint = line.partition(' ')[0]
+                    if fingerprint and not fingerprint.startswith('#'):
+                        counts[fingerprint] = counts.get(fingerprint, 0) + 1
+        except OSError as err:
+            msg = f'Unable to read baseline file: {err}'
+            raise ValueError(msg) from err
+        return cls(counts)
+
+    def __len__(self) -> int:
+        """Return the number of known errors."""
+        return sum(self._counts.values())
+
+    def filter(self, tree: ast.AST, filename: str, errors: list[tuple[int, int, str]]) -> list[tuple[int, int, str]]:
+        """
+        Remove the known errors from the errors reported for a file.
+
+        Args:
+            tree: AST of the file
+            filename: Path to the file
+            errors: Errors reported for the file, as (line, column, message) tuples
+        """
+        if not errors:
+            return errors
+        seen: dict[str, int] = {}
+        new_errors = []
+        for error, fingerprint in zip(errors, _get_fingerprints(tree, filename, errors)):
+            seen[fingerprint] = seen.get(fingerprint, 0) + 1
+            if seen[fingerprint] > self._counts.get(fingerprint, 0):
+                new_errors.append(error)
+        return new_errors
+
+
+def _write_baseline(flake8_output: Iterable[str], output: TextIO) -> int:
+    """
+    Convert the output of flake8 (in its default format) into a baseline file.
+
+    Errors are processed one file at a time as they are read, so that the whole output never needs to be held in
+    memory. Lines that are not errors reported by this plugin are ignored.
+
+    Args:
+        flake8_output: Lines of the output of flake8
+        output: Stream to write the baseline file to
+
+    Returns:
+        The number of errors written to the baseline
+    """
+    output.write(_BASELINE_HEADER)
+    n_errors = 0
+
+    def _flush(filename: str, errors: list[tuple[int, int, str]]) -> int:
+        try:
+            source = Path(filename).read_text(encoding='utf-8')
+            tree = ast.parse(source)
+        except (OSError, SyntaxError, ValueError):
+            return 0
+        path = _get_baseline_path(filename)
+        output.writelines(
+            f'{fingerprint} {_get_code(msg)} {path}\n'
+            for (_, _, msg), fingerprint in zip(errors, _get_fingerprints(tree, filename, errors))
+        )
+        return len(errors)
+
+    filename, errors = None, []
+    for line in flake8_output:
+        match = _FLAKE8_OUTPUT_RE.match(line)
+        if match is None:
+            continue
+        if match.group('path') != filename:
+            if errors:
+                n_errors += _flush(filename, errors)
+            filename, errors = match.group('path'), []
+        # NB: flake8 reports 1-based columns
+        errors.append((int(match.group('line')), int(match.group('col')) - 1, match.group('code')))
+    if errors:
+        n_errors += _flush(filename, errors)
+    return n_errors
+
+
+# ==============================================================================
+# Duplicate files
+
+
+def _get_content_key(lines: list[str], rule_set: _RuleSet) -> str:
+    """
+    Compute a key identifying some source code checked with some rules.
+
+    Args:
+        lines: Lines of source code
+        rule_set: Rules enabled for the source code
+    """
+    digest = hashlib.sha256(','.join(sorted(rule_set.codes)).encode())
+    digest.update(b'\0')
+    for line in lines:
+        digest.update(line.encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+class _ContentTable:
+    """
+    Table of the errors reported for each distinct source code.
+
+    Since errors only depend on the source code of a file (and the enabled rules), identical files (e.g. vendored
+    modules or generated stubs) are only checked once per process and their errors are reported for every path. When
+    flake8 uses several worker processes, the table is backed by a table shared by all the processes of the run (see
+    `_SharedTable`), so that identical files are only checked once per run.
+
+    Attributes:
+        shared: Table shared by the processes of the run (if any)
+        cache: Result cache of the current process (if enabled), whose statistics are published along with those of
+            the table
+        hits: Number of files whose errors were read from the table
+        misses: Number of files that were checked
+        saved_bytes: Total size of the source code of the files whose errors were read from the table
+    """
+
+    def __init__(self, shared: _SharedTable | None = None, cache: _ResultCache | None = None) -> None:
+        """
+        Initialize a _ContentTable object.
+
+        Args:
+            shared: Table shared by the processes of the run
+            cache: Result cache of the current process
+        """
+        self.shared = shared
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self.saved_bytes = 0
+        self._errors: dict[str, tuple[tuple[int, int, str], ...]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of distinct source codes in the in-process table."""
+        return len(self._errors)
+
+    def get(self, key: str, size: int) -> list[tuple[int, int, str]] | None:
+        """
+        Read the errors stored for some source code.
+
+        Args:
+            key: Key of the source code (see `_get_content_key()`)
+            size: Size of the source code (only used for statistics)
+
+        Returns:
+            The stored errors or None if the source code was not checked yet
+        """
+        errors = self._errors.get(key)
+        if errors is None and self.shared is not None:
+            shared_errors = self.shared.get(key)
+            if shared_errors is not None:
+                errors = self._errors[key] = tuple(shared_errors)
+
+        if errors is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.saved_bytes += size
+        self.publish_stats()
+        return None if errors is None else list(errors)
+
+    def put(self, key: str, errors: list[tuple[int, int, str]]) -> None:
+        """
+        Store the errors reported for some source code.
+
+        Args:
+            key: Key of the source code (see `_get_content_key()`)
+            errors: Errors reported for the source code
+        """
+        self._errors[key] = tuple(errors)
+        if self.shared is not None:
+            self.shared.put(key, errors)
+
+    def publish_stats(self) -> None:
+        """Publish the statistics of the current process (and of its result cache) to the shared table (if any)."""
+        if self.shared is not None:
+            cache_stats = (0, 0, 0, 0) if self.cache is None else self.cache.get_stats()
+            self.shared.update_stats(self.hits + self.misses, self.hits, self.saved_bytes, cache_stats)
+
+    def get_stats(self) -> tuple[int, int, int]:
+        """
+        Return the statistics of the run.
+
+        Returns:
+            The number of files, number of duplicate files and size of the duplicate files, for all the processes of
+            the run if the table is shared
+        """
+        if self.shared is not None:
+            return self.shared.get_stats()
+        return self.hits + self.misses, self.hits, self.saved_bytes
+
+    def get_cache_stats(self) -> tuple[int, int, int, int]:
+        """
+        Return the statistics of the result cache during the run.
+
+        Returns:
+            The number of hits, misses, units of code reused and units of code checked again, for all the processes of
+            the run if the table is shared
+        """
+        if self.shared is not None:
+            return self.shared.get_cache_stats()
+        return (0, 0, 0, 0) if self.cache is None else self.cache.get_stats()
+
+
+class _SharedTable:
+    """
+    Lookup table of the errors reported for each distinct source code, shared by all the processes of a run.
+
+    The table lives in a memory-mapped temporary file created by the main process of flake8, which is inherited by
+    forked worker processes (or attached through an environment variable by spawned ones). It is an open-addressing hash
+    table of fixed-size slots, each made of a header (hash of the source code, checksum, size of the payload) and of the
+    errors encoded in JSON. Reads and writes do not take any lock: a writer writes the payload before the header and a
+    reader copies the whole slot and ignores it if its checksum does not match, so that torn reads and concurrent writes
+    of the same slot only result in cache misses. The table is lossy: once all the candidate slots of a key are taken,
+    the first one is overwritten, and errors that do not fit in a slot are not shared.
+
+    The file also holds one row of statistics per process, each only written by the process that owns it.
+
+    Attributes:
+        path: Path to the memory-mapped file
+        context: Fingerprint of everything but the source code that the results depend on
+        n_slots: Number of slots of the table
+    """
+
+    env_var: ClassVar[str] = 'FLAKE8_SCS_SHARED_TABLE'
+    slot_size: ClassVar[int] = 1024
+    max_probes: ClassVar[int] = 8
+    n_stats_rows: ClassVar[int] = 1024
+
+    # NB: hash of the source code, CRC32 of the hash and payload, size of the payload
+    _slot_header = struct.Struct('<16sII')
+    # NB: process ID, number of files, number of duplicate files, size of the duplicate files, then hits, misses, units
+    #     of code reused and checked again of the result cache
+    _stats_row = struct.Struct('<qqqqqqqq')
+
+    def __init__(self, path: str, context: str, *, n_slots: int | None = None) -> None:
+        """
+        Initialize a _SharedTable object.
+
+        Args:
+            path: Path to the file backing the table
+            context: Fingerprint of everything but the source code that the results depend on
+            n_slots: Number of slots of the table to allocate in the file (which must be empty), or None to attach to
+                an existing table
+
+        Raises:
+            OSError: if the file cannot be opened or mapped into memory (or is not a table)
+        """
+        create = n_slots is not None
+        self.path = path
+        self.context = context
+        self._slots_offset = self.n_stats_rows * self._stats_row.size
+        with Path(path).open('r+b') as fd:
+            if n_slots is None:
+                # NB: the number of slots of an existing table is given by the size of its file
+                n_slots = (os.fstat(fd.fileno()).st_size - self._slots_offset) // self.slot_size
+                if n_slots <= 0:
+                    raise OSError(errno.EINVAL, 'Not a shared table', path)
+            size = self._slots_offset + n_slots * self.slot_size
+            if create:
+                # NB: sparse file, pages are only allocated when written to
+                fd.truncate(size)
+            self._mmap = mmap.mmap(fd.fileno(), size)
+        self.n_slots = n_slots
+        self._stats_offset: int | None = None
+        self._stats_pid: int | None = None
+        self._owner_pid = os.getpid() if create else None
+
+    @classmethod
+    def create(cls: type[_SharedTable], context: str, n_slots: int | None = None) -> _SharedTable:
+        """
+        Create a new table and advertise it to spawned worker processes through an environment variable.
+
+        The file is removed when the table is closed or when the current process exits.
+
+        Args:
+            context: Fingerprint of everything but the source code that the results depend on
+            n_slots: Number of slots of the table (defaults to the default size of the `scs-shared-table-size` option)
+        """
+        if n_slots is None:
+            n_slots = _DEFAULT_SHARED_TABLE_SIZE * 1024 * 1024 // cls.slot_size
+        directory = '/dev/shm' if Path('/dev/shm').is_dir() else None  # noqa: S108
+        fd, path = tempfile.mkstemp(dir=directory, prefix='flake8-scs-', suffix='.bin')
+        os.close(fd)
+        try:
+            table = cls(path, context, n_slots=n_slots)
+        except OSError:
+            Path(path).unlink(missing_ok=True)
+            raise
+        os.environ[cls.env_var] = f'{os.getpid()}:{path}'
+        atexit.register(table.close)
+        return table
+
+    @classmethod
+    def attach(cls: type[_SharedTable], context: str) -> _SharedTable | None:
+        """
+        Attach to the table created by the parent process of a spawned worker process.
+
+        Args:
+            context: Fingerprint of everything but the source code that the results depend on
+
+        Returns:
+            The shared table or None if there is none (or if it was created by the current process)
+        """
+        pid, _, path = os.environ.get(cls.env_var, '').partition(':')
+        if not path or pid == str(os.getpid()):
+            return None
+        try:
+            return cls(path, context)
+        except OSError:
+            return None
+
+    def close(self) -> None:
+        """Unmap the table, also removing its file if it was created by the current process."""
+        self._mmap.close()
+        if self._owner_pid != os.getpid():
+            return
+        atexit.unregister(self.close)
+        with contextlib.suppress(OSError):
+            Path(self.path).unlink(missing_ok=True)
+        if os.environ.get(self.env_var) == f'{self._owner_pid}:{self.path}':
+            del os.environ[self.env_var]
+
+    def get(self, content_key: str) -> list[tuple[int, int, str]] | None:
+        """
+        Read the errors stored for some source code.
+
+        Args:
+            content_key: Key of the source code (see `_get_content_key()`)
+
+        Returns:
+            The stored errors or None if they are not in the table
+        """
+        digest = self._digest(content_key)
+        header_size = self._slot_header.size
+        for offset in self._probe(digest):
+            slot = self._mmap[offset : offset + self.slot_size]
+            key, checksum, size = self._slot_header.unpack_from(slot)
+            if key == digest:
+                payload = slot[header_size : header_size + size]
+                if size > self.slot_size - header_size or zlib.crc32(payload, zlib.crc32(key)) != checksum:
+                    return None
+                try:
+                    return [tuple(error) for error in json.loads(payload)]
+                except (ValueError, TypeError):
+                    return None
+            if not any(key):
+                return None
+        return None
+
+    def put(self, content_key: str, errors: list[tuple[int, int, str]]) -> None:
+        """
+        Store the errors reported for some source code.
+
+        Args:
+            content_key: Key of the source code (see `_get_content_key()`)
+            errors: Errors reported for the source code
+        """
+        payload = json.dumps(errors, separators=(',', ':')).encode()
+        header_size = self._slot_header.size
+        if len(payload) > self.slot_size - header_size:
+            return
+
+        digest = self._digest(content_key)
+        offsets = list(self._probe(digest))
+        target = offsets[0]
+        for offset in offsets:
+            key = self._mmap[offset : offset + len(digest)]
+            if key == digest or not any(key):
+                target = offset
+                break
+
+        self._mmap[target + header_size : target + header_size + len(payload)] = payload
+        self._mmap[target : target + header_size] = self._slot_header.pack(
+            digest, zlib.crc32(payload, zlib.crc32(digest)), len(payload)
+        )
+
+    def update_stats(
+        self, n_files: int, n_duplicates: int, saved_bytes: int, cache_stats: tuple[int, int, int, int] = (0, 0, 0, 0)
+    ) -> None:
+        """
+        Publish the statistics of the current process.
+
+        Args:
+            n_files: Number of files checked by the current process
+            n_duplicates: Number of duplicate files that were not checked again by the current process
+            saved_bytes: Total size of those duplicate files
+            cache_stats: Hits, misses, units of code reused and units of code checked again of the result cache of the
+                current process
+        """
+        pid = os.getpid()
+        # NB: forked processes inherit the row of their parent process
+        if self._stats_pid != pid:
+            self._stats_offset = None
+            self._stats_pid = pid
+            # NB: best effort, two processes may claim the same row if they start at the same time
+            row_size = self._stats_row.size
+            for idx in range(self.n_stats_rows):
+                offset = ((pid + idx) % self.n_stats_rows) * row_size
+                owner = self._stats_row.unpack_from(self._mmap, offset)[0]
+                if owner in {0, pid}:
+                    self._stats_offset = offset
+                    break
+        if self._stats_offset is None:
+            return
+        self._stats_row.pack_into(self._mmap, self._stats_offset, pid, n_files, n_duplicates, saved_bytes, *cache_stats)
+
+    def get_stats(self) -> tuple[int, int, int]:
+        """
+        Return the statistics of all the processes.
+
+        Returns:
+            The total number of files, number of duplicate files and size of the duplicate files
+        """
+        totals = self._get_totals()
+        return totals[0], totals[1], totals[2]
+
+    def get_cache_stats(self) -> tuple[int, int, int, int]:
+        """
+        Return the statistics of the result cache of all the processes.
+
+        Returns:
+            The total number of hits, misses, units of code reused and units of code checked again
+        """
+        totals = self._get_totals()
+        return totals[3], totals[4], totals[5], totals[6]
+
+    def _get_totals(self) -> list[int]:
+        totals = [0] * (len(self._stats_row.format) - 2)
+        for pid, *stats in self._stats_row.iter_unpack(self._mmap[: self._slots_offset]):
+            if pid:
+                totals = [total + value for total, value in zip(totals, stats)]
+        return totals
+
+    def _digest(self, content_key: str) -> bytes:
+        return hashlib.sha256(f'{self.context}\0{content_key}'.encode()).digest()[:16]
+
+    def _probe(self, digest: bytes) -> Generator[int, None, None]:
+        home = int.from_bytes(digest[:8], 'little')
+        for idx in range(self.max_probes):
+            yield self._slots_offset + ((home + idx) % self.n_slots) * self.slot_size
+
+
+def _is_parallel_run(options: argparse.Namespace) -> bool:
+    """
+    Check whether flake8 is going to check the files with several worker processes.
+
+    Args:
+        options: Options of flake8
+    """
+    return _get_n_jobs(options) > 1
+
+
+def _get_n_jobs(options: argparse.Namespace) -> int:
+    """
+    Return the number of worker processes of flake8.
+
+    Args:
+        options: Options of flake8 (`jobs` is either 'auto' or a number of processes)
+    """
+    jobs = str(getattr(options, 'jobs', 1))
+    if jobs == 'auto':
+        return os.cpu_count() or 1
+    return int(jobs) if jobs.isdigit() else 1
+
+
+# ==============================================================================
+# Result cache
+
+
+class _ResultCache:
+    """
+    Persistent cache of the errors reported for some source code.
+
+    Entries are stored as one JSON file per source code, named after a hash of the source code and of everything else
+    the results depend on (version of the plugin and of Python, options of the plugin). Files are written atomically
+    (temporary file + rename), so that a cache directory may be shared by concurrent flake8 processes (e.g. with
+    `flake8 -j`), and their modification times are updated on each hit to evict the least recently used entries once
+    the cache grows beyond its maximum number of entries.
+
+    For large files, the results of each top-level unit of code (see `Visitor.visit_units()`) are also stored in one
+    entry per file path, so that only the units that changed since the last run need to be checked again.
+
+    Attributes:
+        directory: Path to the cache directory
+        max_entries: Maximum number of entries in the cache
+        context: Fingerprint of everything but the source code that the results depend on
+        hits: Number of cache hits in the current process
+        misses: Number of cache misses in the current process
+        unit_hits: Number of units of code whose results were reused in the current process
+        unit_misses: Number of units of code that were checked again in the current process
+    """
+
+    # NB: the size of the cache is checked on the first write and then every so many writes of each process
+    prune_interval: ClassVar[int] = 1000
+
+    # NB: smaller files are always checked as a whole on a cache miss
+    incremental_min_lines: ClassVar[int] = 1000
+
+    def __init__(self, directory: str, max_entries: int, context: str) -> None:
+        """
+        Initialize a _ResultCache object.
+
+        Args:
+            directory: Path to the cache directory (created on the first write)
+            max_entries: Maximum number of entries in the cache
+            context: Fingerprint of everything but the source code that the results depend on
+        """
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.context = context
+        self.hits = 0
+        self.misses = 0
+        self.unit_hits = 0
+        self.unit_misses = 0
+        self._writes = 0
+
+    def get_stats(self) -> tuple[int, int, int, int]:
+        """Return the number of hits, misses, units of code reused and units of code checked again."""
+        return self.hits, self.misses, self.unit_hits, self.unit_misses
+
+    def key(self, content_key: str) -> str:
+        """
+        Compute the key of the cache entry for some source code.
+
+        Args:
+            content_key: Key of the source code and of the rules enabled for it (see `_get_content_key()`)
+        """
+        return hashlib.sha256(f'{self.context}\0{content_key}'.encode()).hexdigest()
+
+    def units_key(self, filename: str, rule_set: _RuleSet) -> str:
+        """
+        Compute the key of the cache entry for the units of code of a file.
+
+        Args:
+            filename: Path to the file
+            rule_set: Rules enabled for the file
+        """
+        digest = hashlib.sha256(self.context.encode())
+        digest.update(','.join(sorted(rule_set.codes)).encode())
+        digest.update(b'\0units\0')
+        digest.update(str(Path(filename).resolve()).encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> list[tuple[int, int, str]] | None:
+        """
+        Read the errors stored for a key.
+
+        Args:
+            key: Key of the cache entry
+
+        Returns:
+            The stored errors or None if there is no (valid) entry for this key
+        """
+        try:
+            errors = [tuple(error) for error in self._read(key)]
+        except (OSError, ValueError, TypeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return errors
+
+    def put(self, key: str, errors: list[tuple[int, int, str]]) -> None:
+        """
+        Store the errors for a key.
+
+        Failures to write to the cache directory are silently ignored.
+
+        Args:
+            key: Key of the cache entry
+            errors: Errors reported for the source code
+        """
+        self._write(key, errors)
+
+    def get_units(self, key: str) -> dict[str, list]:
+        """
+        Read the results stored for the units of code of a file.
+
+        Args:
+            key: Key of the cache entry
+
+        Returns:
+            A dictionary mapping the keys of the units to their results (empty if there is no valid entry)
+        """
+        try:
+            units = self._read(key)
+        except (OSError, ValueError):
+            return {}
+        return units if isinstance(units, dict) else {}
+
+    def put_units(self, key: str, units: dict[str, list], previous_units: dict[str, list]) -> None:
+        """
+        Store the results of the units of code of a file.
+
+        Args:
+            key: Key of the cache entry
+            units: Dictionary mapping the keys of the units to their results
+            previous_units: Results read from the cache before checking the file
+        """
+        reused = len(units.keys() & previous_units.keys())
+        self.unit_hits += reused
+        self.unit_misses += len(units) - reused
+        self._write(key, units)
+
+    def prune(self) -> None:
+        """Remove the least recently used entries until the cache has at most `max_entries` entries."""
+        entries = []
+        with contextlib.suppress(OSError):
+            for path in self.directory.glob('*.json'):
+                with contextlib.suppress(OSError):
+                    entries.append((path.stat().st_mtime, path))
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, path in entries[: len(entries) - self.max_entries]:
+            with contextlib.suppress(OSError):
+                path.unlink(missing_ok=True)
+
+    def _read(self, key: str) -> list | dict:
+        path = self.directory / f'{key}.json'
+        with path.open(encoding='utf-8') as fd:
+            value = json.load(fd)
+        path.touch()
+        return value
+
+    def _write(self, key: str, value: list | dict) -> None:
+        tmp_path = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.', suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as tmp_fd:
+                json.dump(value, tmp_fd)
+            Path(tmp_path).replace(self.directory / f'{key}.json')
+        except OSError:
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
+            return
+
+        if self._writes % self.prune_interval == 0:
+            self.prune()
+        self._writes += 1
+
+
+def _get_cache_context(version: str) -> str:
+    """
+    Return a fingerprint of everything but the source code that the results of the plugin depend on.
+
+    Args:
+        version: Version of the plugin
+    """
+    return repr((
+        version,
+        sys.version,
+        Visitor.os_mkdir_mode_policy,
+        Visitor.os_mkfifo_mode_policy,
+        Visitor.os_mknod_mode_policy,
+        Visitor.os_open_mode_policy,
+        Visitor.platform_profile,
+    ))
+
+
+# ==============================================================================
+# AST traversal
+
+# NB: nodes of these types cannot contain any node that is checked by the plugin
+_LEAF_NODE_TYPES = frozenset((
+    ast.Name,
+    ast.Constant,
+    ast.alias,
+    ast.Pass,
+    ast.Break,
+    ast.Continue,
+    ast.Global,
+    ast.Nonlocal,
+    *ast.expr_context.__subclasses__(),
+    *ast.operator.__subclasses__(),
+    *ast.unaryop.__subclasses__(),
+    *ast.cmpop.__subclasses__(),
+    *ast.boolop.__subclasses__(),
+))
+
+
+def _get_first_lineno(node: ast.stmt) -> int:
+    """Return the first line of a statement, including its decorators."""
+    return min((decorator.lineno for decorator in getattr(node, 'decorator_list', ())), default=node.lineno)
+
+
+# NB: end of the lines followed by a line that may start a statement (not a comment or a closing bracket) for a given
+# indentation
+_CHUNK_START_PATTERN = r'\n{}[^\s#)\]}}]'
+_CLAUSE_RE = re.compile(r'(?:else|elif|except|finally)\b')
+_CLASS_RE = re.compile(r'class\b')
+_TRIPLE_QUOTE_RE = re.compile(r"'''|\"\"\"")
+
+# NB: comments and string literals, so that quotes within comments and nested quotes are skipped
+_STRING_RE = re.compile(
+    r'#[^\n]*'
+    r"|'''[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*(?:'''|\Z)"
+    r'|"""[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*(?:"""|\Z)'
+    r"|'[^'\\\n]*(?:\\.[^'\\\n]*)*'?"
+    r'|"[^"\\\n]*(?:\\.[^"\\\n]*)*"?',
+    re.DOTALL,
+)
+
+
+class _SourceLines(NamedTuple):
+    """Lines of source code indexed by `_get_source_lines()` for `_split_chunks()`."""
+
+    lines: list[str]
+    text: str
+    offsets: list[int]
+    string_lines: set[int]
+
+
+def _get_source_lines(lines: list[str]) -> _SourceLines:
+    """
+    Index some lines of source code, finding the lines that start within a string literal.
+
+    Only the lines containing triple quotes (and the lines they continue after a backslash) are tokenized (using a
+    regular expression), since the other string literals cannot span several lines.
+
+    Args:
+        lines: Lines of source code
+
+    Returns:
+        Lines of source code along with their offsets in the text and the index of the lines starting within a string
+    """
+    text = ''.join(lines)
+    offsets = [0, *itertools.accumulate(map(len, lines))]
+    string_lines: set[int] = set()
+    pos = 0
+    while True:
+        triple_quote = _TRIPLE_QUOTE_RE.search(text, pos)
+        if triple_quote is None:
+            break
+        quote = triple_quote.start()
+        line_start = text.rfind('\n', 0, quote) + 1
+        # NB: a line following a backslash may start within a string literal
+        while line_start > pos and text.endswith(('\\\n', '\\\r\n'), 0, line_start):
+            line_start = text.rfind('\n', 0, line_start - 2) + 1
+        for match in _STRING_RE.finditer(text, max(pos, line_start)):
+            start, pos = match.span()
+            if not text.startswith('#', start):
+                string_lines.update(range(bisect.bisect_right(offsets, start), bisect.bisect_left(offsets, pos)))
+            if pos > quote:
+                break
+    return _SourceLines(lines, text, offsets, string_lines)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_chunk_start_re(indent: str) -> re.Pattern:
+    return re.compile(_CHUNK_START_PATTERN.format(re.escape(indent)))
+
+
+def _split_chunks(source: _SourceLines, start: int, stop: int, indent: str) -> list[int]:
+    """
+    Split a block of source code into chunks of lines that most likely start with a statement.
+
+    A chunk starts at each line indented with exactly `indent` that does not look like the continuation of a statement
+    (line within a string literal, closing bracket, clause of a compound statement or definition following a
+    decorator). Lines within brackets may still start a chunk, which is detected when the chunk cannot be parsed on its
+    own (see `Visitor.visit_chunks()`).
+
+    Args:
+        source: Lines of source code
+        start: Index of the first line of the block
+        stop: Index of the line following the block
+        indent: Indentation of the statements of the block
+
+    Returns:
+        Index of the first line of each chunk
+    """
+    lines, offsets, offset = source.lines, source.offsets, len(indent)
+    starts = [start]
+    decorated = lines[start].startswith('@', offset) if start < stop else False
+    for match in _get_chunk_start_re(indent).finditer(source.text, offsets[start], offsets[stop]):
+        idx = bisect.bisect_right(offsets, match.start())
+        if idx in source.string_lines:
+            continue
+        if not decorated and not _CLAUSE_RE.match(lines[idx], offset):
+            starts.append(idx)
+        decorated = lines[idx].startswith('@', offset)
+    return starts
+
+
+def _find_class_body(lines: list[str], start: int, stop: int, indent: str) -> tuple[int, str] | None:
+    """
+    Find the body of a (decorated) class definition.
+
+    Args:
+        lines: Lines of source code
+        start: Index of the first line of the class definition
+        stop: Index of the line following the class definition
+        indent: Indentation of the class definition
+
+    Returns:
+        Index of the line following the header of the class and indentation of its body, or None if the lines do not
+        look like a class definition
+    """
+    offset = len(indent)
+    idx = start
+    while idx < stop and lines[idx].startswith('@', offset):
+        idx += 1
+    if idx == stop or not _CLASS_RE.match(lines[idx], offset):
+        return None
+    while idx < stop and not lines[idx].split('#', 1)[0].rstrip().endswith(':'):
+        idx += 1
+    for line in lines[idx + 1 : stop]:
+        body = line.lstrip()
+        if body and not body.startswith('#'):
+            body_indent = line[: len(line) - len(body)]
+            if len(body_indent) > offset and body_indent.startswith(indent):
+                return idx + 1, body_indent
+            return None
+    return None
+
+
+class _ScopeExit:
+    """Marker pushed onto the stack of `Visitor.visit()` to restore the table of aliases at the end of a scope."""
+
+    __slots__ = ('aliases',)
+    _fields = ()
+
+    def __init__(self, aliases: dict[str, str]) -> None:
+        """
+        Initialize a _ScopeExit object.
+
+        Args:
+            aliases: Table of aliases in effect before the scope
+        """
+        self.aliases = aliases
+
+
+class Visitor:
+    """
+    AST visitor class for the plugin.
+
+    Contrary to `ast.NodeVisitor`, the tree is traversed iteratively using an explicit stack, so that there is no limit
+    on the depth of the tree. Handlers are only called for the types of nodes checked by the plugin.
+
+    Import statements are recorded in a table of aliases during the traversal, so that function calls are matched
+    using the fully-qualified names of their callees (e.g. ``proc.run()`` after ``import subprocess as proc``). Since
+    the tree is traversed in source order, an import statement only applies to the code that follows it, and only
+    within the function or class definition containing it (if any).
+    """
+
+    os_mkdir_mode_policy: ClassVar[_ModePolicy | None] = None
+    os_mkfifo_mode_policy: ClassVar[_ModePolicy | None] = None
+    os_mknod_mode_policy: ClassVar[_ModePolicy | None] = None
+    os_open_mode_policy: ClassVar[_ModePolicy | None] = None
+
+    platform_profile: ClassVar[_PlatformProfile] = _get_platform_profile('auto')
+
+    rule_set: ClassVar[_RuleSet] = _ALL_RULES
+
+    mode_msg_map: ClassVar[dict[str, str]] = {
+        SCS112: 'open',
+        SCS116: 'mkdir',
+        SCS117: 'mkfifo',
+        SCS118: 'mknod',
+    }
+
+    # NB: maximum number of chunks merged together by visit_chunks() when a chunk cannot be parsed on its own
+    max_merged_chunks: ClassVar[int] = 8
+    # NB: minimum number of lines of a class definition split into smaller chunks by visit_chunks() (and of a function
+    #     definition split into smaller units by visit_units())
+    min_split_lines: ClassVar[int] = 64
+
+    def _format_mode_msg(self, msg_id):
+        """Format a mode message."""
+        return self.__class__.format_mode_msg(msg_id)
+
+    @classmethod
+    def format_mode_msg(cls, msg_id):
+        """Format a mode message."""
+        return msg_id.format(getattr(cls, f'os_{cls.mode_msg_map[msg_id]}_mode_policy').msg_arg)
+
+    def __init__(self, rule_set: _RuleSet | None = None, aliases: dict[str, str] | None = None) -> None:
+        """
+        Initialize a Visitor object.
+
+        Args:
+            rule_set: Set of enabled rules (defaults to the rules enabled by the options of the plugin)
+            aliases: Table of the import aliases in effect before the visited code (e.g. when visiting a part of a
+                file), defaults to the conventional aliases of some modules
+        """
+        self._rule_set = self.rule_set if rule_set is None else rule_set
+        self.errors: list[tuple[int, int, str]] = []
+        self._aliases: dict[str, str] = dict(_DEFAULT_ALIASES if aliases is None else aliases)
+        self._reported_calls: set[ast.Call] = set()
+        handlers = {
+            ast.Assert: self.visit_Assert,
+            ast.Call: self.visit_Call,
+            ast.Import: self.visit_Import,
+            ast.ImportFrom: self.visit_ImportFrom,
+            ast.With: self.visit_With,
+        }
+        self._handlers: dict[type, Callable[[Any], None]] = {
+            node_type: handler for node_type, handler in handlers.items() if node_type in self._rule_set.node_types
+        }
+        if ast.Import in self._handlers:
+            # NB: scopes only matter for the aliases recorded by the handlers of import statements
+            self._handlers.update(dict.fromkeys(_SCOPE_NODE_TYPES, self._enter_scope))
+            self._handlers[_ScopeExit] = self._exit_scope
+        self._stack: list[Any] = []
+        self._skipped_chunks = False
+
+    def visit(self, tree: ast.AST) -> None:
+        """
+        Visit all the nodes of an AST in depth-first order.
+
+        Args:
+            tree: Root node of the tree
+        """
+        handlers = self._handlers
+        leaf_types = _LEAF_NODE_TYPES
+        stack = self._stack = [tree]
+        push = stack.append
+        while stack:
+            node = stack.pop()
+            handler = handlers.get(type(node))
+            if handler is not None:
+                handler(node)
+
+            # NB: children are pushed in reverse order so that they are visited in source order
+            for field in reversed(node._fields):
+                value = getattr(node, field, None)
+                if isinstance(value, list):
+                    for item in reversed(value):
+                        if isinstance(item, ast.AST) and type(item) not in leaf_types:
+                            push(item)
+                elif isinstance(value, ast.AST) and type(value) not in leaf_types:
+                    push(value)
+
+    def _enter_scope(self, node: ast.AST) -> None:  # noqa: ARG002
+        """Handler called for function and class definitions, making their import statements local to them."""
+        self._stack.append(_ScopeExit(self._aliases))
+        self._aliases = dict(self._aliases)
+
+    def _exit_scope(self, node: _ScopeExit) -> None:
+        """Handler called once all the nodes of a function or class definition are visited."""
+        self._aliases = node.aliases
+
+    def visit_units(
+        self, body: list[ast.stmt], lines: list[str], units: dict[str, list], new_units: dict[str, list]
+    ) -> None:
+        """
+        Visit a list of statements as independent units of code, reusing the results of units that did not change.
+
+        Each statement of the body of a module is a unit of code, except for class definitions and large function
+        definitions (at least `min_split_lines` lines) whose body statements are themselves split into units
+        (recursively), so that a change within a large function does not invalidate the whole function. A unit is
+        identified by a hash of its lines of source code, of
+        its columns in them and of the import aliases in effect before it, so that its results only depend on its key
+        and can be shifted to the current position of the unit in the file when reused.
+
+        Args:
+            body: List of statements (e.g. body of an ast.Module node)
+            lines: Lines of source code of the file
+            units: Results of the units from a previous run, indexed by key
+            new_units: Dictionary filled with the results of the units of this run, indexed by key
+        """
+        for node in body:
+            header = None
+            if isinstance(node, ast.ClassDef):
+                header = [*node.bases, *node.keywords]
+            elif (
+                isinstance(node, (ast.AsyncFunctionDef, ast.FunctionDef))
+                and node.end_lineno - _get_first_lineno(node) + 1 >= self.min_split_lines
+            ):
+                header = [node.args, *([] if node.returns is None else [node.returns])]
+            if header is not None:
+                for child in (*header, *node.decorator_list, *getattr(node, 'type_params', [])):
+                    self.visit(child)
+                # NB: the import statements of the body of the class or function only apply within it
+                scope_aliases, self._aliases = self._aliases, dict(self._aliases)
+                self.visit_units(node.body, lines, units, new_units)
+                self._aliases = scope_aliases
+                continue
+
+            start = _get_first_lineno(node)
+            # NB: statements sharing a line are told apart by their columns
+            columns = (node.col_offset, node.end_col_offset)
+            digest = hashlib.sha256(repr((columns, sorted(self._aliases.items()))).encode())
+            digest.update(''.join(lines[start - 1 : node.end_lineno]).encode('utf-8', 'surrogatepass'))
+            key = digest.hexdigest()
+
+            unit = units.get(key)
+            if unit is None:
+                n_errors = len(self.errors)
+                aliases = dict(self._aliases)
+                self.visit(node)
+                unit = [
+                    [(line - start, col, msg) for line, col, msg in self.errors[n_errors:]],
+                    None if self._aliases == aliases else dict(self._aliases),
+                ]
+            else:
+                errors, aliases = unit
+                self.errors.extend((line + start, col, msg) for line, col, msg in errors)
+                if aliases is not None:
+                    self._aliases = dict(aliases)
+            new_units[key] = unit
+
+    def visit_chunks(
+        self,
+        lines: list[str],
+        units: dict[str, list],
+        new_units: dict[str, list],
+        cancelled: Callable[[], bool] | None = None,
+    ) -> bool:
+        """
+        Parse and visit source code one chunk of statements at a time, reusing the results of known chunks.
+
+        Chunks (see `_split_chunks()`) are identified like units of code (see `visit_units()`) by a hash of their source
+        code and of the import aliases in effect before them, so that only the chunks that changed are parsed. Large
+        class definitions are split into their header and the statements of their body (recursively). A chunk that
+        cannot be parsed on its own is merged with the following ones, then with the rest of its block if that does not
+        help. If some chunk still cannot be parsed (e.g. if the chunks were not split at the start of statements), the
+        whole source code is parsed and visited instead, and the results of the chunks are only kept if it cannot be
+        parsed either (e.g. if it contains a syntax error). The chunks that cannot be parsed are remembered like the
+        other ones, so that they are not parsed again by the next visits.
+
+        Args:
+            lines: Lines of source code
+            units: Results of the chunks from a previous run, indexed by key
+            new_units: Dictionary filled with the results of the chunks of this run, indexed by key
+            cancelled: Function called between two chunks, returning whether to stop
+
+        Returns:
+            False if the visit was cancelled, True otherwise
+        """
+        source = _get_source_lines(lines)
+        n_errors, aliases = len(self.errors), dict(self._aliases)
+        self._skipped_chunks = False
+        if not self._visit_block(source, 0, len(lines), '', units=units, new_units=new_units, cancelled=cancelled):
+            return False
+        if self._skipped_chunks:
+            chunk_errors, chunk_aliases = self.errors[n_errors:], self._aliases
+            del self.errors[n_errors:]
+            self._aliases = aliases
+            prefix = repr(('', sorted(aliases.items()))).encode()
+            if not self._visit_chunk(prefix, source.text, 0, '', units=units, new_units=new_units):
+                self.errors.extend(chunk_errors)
+                self._aliases = chunk_aliases
+        return True
+
+    def _visit_block(  # noqa: PLR0913
+        self,
+        source: _SourceLines,
+        start: int,
+        stop: int,
+        indent: str,
+        *,
+        units: dict[str, list],
+        new_units: dict[str, list],
+        cancelled: Callable[[], bool] | None,
+    ) -> bool:
+        lines = source.lines
+        starts = [*_split_chunks(source, start, stop, indent), stop]
+        aliases, prefix = None, b''
+        idx = 0
+        while idx < len(starts) - 1:
+            if cancelled is not None and cancelled():
+                return False
+            # NB: the table of aliases is replaced (not updated) by _visit_chunk() when it changes
+            if self._aliases is not aliases:
+                aliases, prefix = self._aliases, repr((indent, sorted(self._aliases.items()))).encode()
+
+            chunk_start, chunk_stop = starts[idx], starts[idx + 1]
+            body = None
+            if chunk_stop - chunk_start >= self.min_split_lines:
+                body = _find_class_body(lines, chunk_start, chunk_stop, indent)
+            if body is not None:
+                body_start, body_indent = body
+                header = ''.join(lines[chunk_start:body_start]) + body_indent + 'pass\n'
+                if self._visit_chunk(prefix, header, chunk_start, indent, units=units, new_units=new_units):
+                    # NB: the import statements of the body of the class only apply within it
+                    class_aliases, self._aliases = self._aliases, dict(self._aliases)
+                    if not self._visit_block(
+                        source,
+                        body_start,
+                        chunk_stop,
+                        body_indent,
+                        units=units,
+                        new_units=new_units,
+                        cancelled=cancelled,
+                    ):
+                        return False
+                    self._aliases = class_aliases
+                    idx += 1
+                    continue
+
+            idx = self._visit_merged_chunks(prefix, lines, starts, idx, indent, units=units, new_units=new_units)
+        return True
+
+    def _visit_merged_chunks(  # noqa: PLR0913
+        self,
+        prefix: bytes,
+        lines: list[str],
+        starts: list[int],
+        idx: int,
+        indent: str,
+        *,
+        units: dict[str, list],
+        new_units: dict[str, list],
+    ) -> int:
+        for end_idx in range(idx + 1, min(idx + 1 + self.max_merged_chunks, len(starts))):
+            if self._visit_chunk(
+                prefix,
+                ''.join(lines[starts[idx] : starts[end_idx]]),
+                starts[idx],
+                indent,
+                units=units,
+                new_units=new_units,
+            ):
+                return end_idx
+            # NB: large chunks are not merged with the previous ones, which would only be parsed again and again
+            if end_idx + 1 < len(starts) and starts[end_idx + 1] - starts[end_idx] >= self.min_split_lines:
+                break
+
+        # NB: a statement spanning more chunks than can be merged (e.g. a list literal whose items are indented like the
+        #     statements of the block) is visited along with the rest of the block
+        if not self._skipped_chunks and self._visit_chunk(
+            prefix, ''.join(lines[starts[idx] : starts[-1]]), starts[idx], indent, units=units, new_units=new_units
+        ):
+            return len(starts) - 1
+        # NB: the whole source code is visited instead once all the chunks are visited (see visit_chunks()), hence the
+        #     rest of the blocks is not parsed anymore, so that a syntax error does not make the visit quadratic
+        self._skipped_chunks = True
+        return idx + 1
+
+    def _visit_chunk(  # noqa: PLR0913
+        self,
+        prefix: bytes,
+        source: str,
+        start: int,
+        indent: str,
+        *,
+        units: dict[str, list],
+        new_units: dict[str, list],
+    ) -> bool:
+        digest = hashlib.sha256(prefix)
+        digest.update(source.encode('utf-8', 'surrogatepass'))
+        key = digest.hexdigest()
+        unit = new_units.get(key) or units.get(key)
+        if unit is None:
+            try:
+                # NB: indented statements are parsed as the body of a compound statement, one line above them
+                tree = ast.parse(f'if 1:\n{source}' if indent else source)
+            except (SyntaxError, ValueError):
+                tree = None
+            if tree is None:
+                unit = [None, None]
+            else:
+                n_errors, aliases = len(self.errors), dict(self._aliases)
+                self.visit(tree)
+                shift = 2 if indent else 1
+                unit = [
+                    [(line - shift, col, msg) for line, col, msg in self.errors[n_errors:]],
+                    None if self._aliases == aliases else dict(self._aliases),
+                ]
+                del self.errors[n_errors:]
+
+        new_units[key] = unit
+        errors, aliases = unit
+        if errors is None:
+            return False
+        self.errors.extend((line + start + 1, col, msg) for line, col, msg in errors)
+        if aliases is not None:
+            self._aliases = dict(aliases)
+        return True
+
+    def visit_changed(self, body: list[ast.stmt], lines: list[str], changed_lines: _LineIntervals) -> None:
+        """
+        Visit only the statements of a list that overlap some changed lines.
+
+        The other statements are only visited for their import statements (if their source code contains any), so that
+        the import aliases in effect for the changed statements are the same as when visiting the whole list.
+
+        Args:
+            body: List of statements (e.g. body of an ast.Module node)
+            lines: Lines of source code of the file
+            changed_lines: Intervals of changed lines
+        """
+        import_handlers = {
+            node_type: handler
+            for node_type, handler in self._handlers.items()
+            if node_type not in {ast.Assert, ast.Call, ast.With}
+        }
+        for node in body:
+            start = _get_first_lineno(node)
+            if changed_lines.overlaps(start, node.end_lineno):
+                self.visit(node)
+            elif import_handlers and any('import' in line for line in lines[start - 1 : node.end_lineno]):
+                handlers, n_errors = self._handlers, len(self.errors)
+                self._handlers = import_handlers
+                try:
+                    self.visit(node)
+                finally:
+                    self._handlers = handlers
+                    del self.errors[n_errors:]
+
+    def _match(self, rule_index: _RuleIndex, prefix: str | None, name: str | None, node: ast.AST) -> str | None:
+        """
+        Find the first rule of an index matching a fully-qualified name.
+
+        Args:
+            rule_index: Compiled rules for the form of use of the name
+            prefix: Dotted prefix of the name ('' for bare names, None if unknown)
+            name: Terminal name
+            node: AST node passed to the predicates of the rules
+
+        Returns:
+            The (formatted) message of the first matching rule or None if no rule matches
+        """
+        rule = rule_index.modules.get(prefix)
+        rules = (rule,) if rule is not None else rule_index.names.get(name, ())
+        for rule in rules:
+            if (rule.prefix is None or rule.prefix == prefix) and self._applies(rule, node):
+                return self._format_mode_msg(rule.msg) if rule.msg in self.mode_msg_map else rule.msg
+        return None
+
+    def _applies(self, rule: _CallRule, node: ast.AST) -> bool:
+        """Check whether a rule matching the name of a node applies to the target platform and to the node itself."""
+        if rule.platform is not None and not getattr(self.platform_profile, rule.platform):
+            return False
+        return rule.predicate is None or rule.predicate(self, node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        """Visitor method called for ast.Call nodes."""
+        if node in self._reported_calls:
+            # NB: already reported as a context expression of a `with` statement
+            return
+        prefix, name = _resolve_callee(node.func, self._aliases)
+        msg = self._match(self._rule_set.call_rules, prefix, name, node)
+        if msg is not None:
+            self.errors.append((node.lineno, node.col_offset, msg))
+
+    def visit_Import(self, node: ast.Import) -> None:
+        """Visitor method called for ast.Import nodes."""
+        _update_aliases(self._aliases, node)
+        import_rules = self._rule_set.import_rules
+        for alias in node.names:
+            # Cover:
+            #  * import pdb.
+            #  * import pdb as xxx.
+            msg = self._match(import_rules, alias.name, None, node)
+            if msg is not None:
+                self.errors.append((node.lineno, node.col_offset, msg))
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        """Visitor method called for ast.ImportFrom nodes."""
+        import_rules = self._rule_set.import_rules
+        module = node.module
+        if module is not None:
+            # NB: also cover the conventional aliases, e.g. `from op import abspath`
+            head, sep, tail = module.partition('.')
+            module = _DEFAULT_ALIASES.get(head, head) + sep + tail
+
+        _update_aliases(self._aliases, node)
+        for alias in node.names:
+            # Cover:
+            #  * from pdb import xxx.
+            #  * from . import pdb.
+            #  * from os import system.
+            #  * from pickle import loads as load.
+            #  * etc.
+            if module is None:
+                msg = self._match(import_rules, alias.name, None, node)
+            else:
+                msg = self._match(import_rules, module, alias.name, node)
+            if msg is not None:
+                self.errors.append((node.lineno, node.col_offset, msg))
+
+    def visit_With(self, node: ast.With) -> None:
+        """Visitor method called for ast.With nodes."""
+        with_rules = self._rule_set.with_rules
+        for item in node.items:
+            call = item.context_expr
+            if isinstance(call, ast.Call):
+                prefix, name = _resolve_callee(call.func, self._aliases)
+                msg = self._match(with_rules, prefix, name, call)
+                if msg is not None:
+                    self.errors.append((node.lineno, node.col_offset, msg))
+                    self._reported_calls.add(call)
+
+    def visit_Assert(self, node: ast.Assert) -> None:
+        """Visitor method called for ast.Assert nodes."""
+        self.errors.append((node.lineno, node.col_offset, SCS108))
+
+
+class Plugin:  # pylint: disable=R0903
+    """Plugin class."""
+
+    name = __name__
+    # NB: not using __name__ since it is '__main__' when running `python3 -m flake8_secure_coding_standard`
+    version = _DistributionVersion('flake8_secure_coding_standard')
+
+    path_rules: ClassVar[_PathRules | None] = None
+    result_cache: ClassVar[_ResultCache | None] = None
+    diff_index: ClassVar[_DiffIndex | None] = None
+    baseline: ClassVar[_Baseline | None] = None
+    content_table: ClassVar[_ContentTable | None] = None
+    print_stats: ClassVar[bool] = False
+
+    def __init__(self, tree: ast.AST, lines: list[str] | None = None, filename: str | None = None):
+        """
+        Initialize a Plugin object.
+
+        Args:
+            tree: AST of the file to check
+            lines: Lines of source code of the file (if provided, files that cannot contain any error are skipped)
+            filename: Path to the file (if provided, used to apply the `scs-per-path-rules` option)
+        """
+        self._tree = tree
+        self._lines = lines
+        self._filename = filename
+
+    @classmethod
+    def add_options(cls: type[Plugin], option_manager: flake8.options.manager.OptionManager) -> None:
+        """Add command line options."""
+        options_data: ClassVar[dict[str, dict[str, str | bool]]] = (
+            (
+                '--os-mkdir-mode',
+                {
+                    'type': str,
+                    'parse_from_config': True,
+                    'default': False,
+                    'dest': 'os_mkdir_mode',
+                    'help': "If provided, configure how 'mode' parameter of the os.mkdir() function are handled",
+                },
+            ),
+            (
+                '--os-mkfifo-mode',
+                {
+                    'type': str,
+                    'parse_from_config': True,
+                    'default': False,
+                    'dest': 'os_mkfifo_mode',
+                    'help': "If provided, configure how 'mode' parameter of the os.mkfifo() function are handled",
+                },
+            ),
+            (
+                '--os-mknod-mode',
+                {
+                    'type': str,
+                    'parse_from_config': True,
+                    'default': False,
+                    'dest': 'os_mknod_mode',
+                    'help': "If provided, configure how 'mode' parameter of the os.mknod() function are handled",
+                },
+            ),
+            (
+                '--os-open-mode',
+                {
+                    'type': str,
+                    'parse_from_config': True,
+                    'default': False,
+                    'dest': 'os_open_mode',
+                    'help': "If provided, configure how 'mode' parameter of the os.open() function are handled",
+                },
+            ),
+        )
+
+        if _use_optparse():  # pragma: no cover
+            cls.add_options_optparse(option_manager, options_data)
+        else:
+            cls.add_options_argparse(option_manager, options_data)
+
+        option_manager.add_option(
+            '--scs-target-platform',
+            type=str,
+            choices=_TARGET_PLATFORMS,
+            parse_from_config=True,
+            default='auto',
+            dest='scs_target_platform',
+            help='Platform(s) the code is targeting for platform-dependent checks (SCS111, SCS116-SCS119): '
+            "'auto' for the current system, 'posix', 'windows' or 'both' (default: %(default)s)",
+        )
+        option_manager.add_option(
+            '--scs-per-path-rules',
+            type=str,
+            parse_from_config=True,
+            default='',
+            dest='scs_per_path_rules',
+            help='Error codes of this plugin to disable for some files, using the same format as --per-file-ignores '
+            "(e.g. 'tests/*:SCS108 tools/*:SCS101,SCS107'). The checks are then not performed at all on those files.",
+        )
+        option_manager.add_option(
+            '--scs-cache-dir',
+            type=str,
+            parse_from_config=True,
+            default='',
+            dest='scs_cache_dir',
+            help='If provided, directory where the results of this plugin are cached across runs, keyed by the hash of '
+            'the source code of each file (may be shared by concurrent runs)',
+        )
+        option_manager.add_option(
+            '--scs-cache-max-entries',
+            type=int,
+            parse_from_config=True,
+            default=_DEFAULT_CACHE_MAX_ENTRIES,
+            dest='scs_cache_max_entries',
+            help='Maximum number of files in the result cache, the least recently used ones being evicted first '
+            '(default: %(default)s)',
+        )
+        option_manager.add_option(
+            '--scs-diff-base',
+            type=str,
+            parse_from_config=True,
+            default='',
+            dest='scs_diff_base',
+            help='If provided, git reference (e.g. origin/main) against which to compute the changes of the working '
+            'tree: files that did not change are skipped and only the top-level statements overlapping changed lines '
+            'are checked',
+        )
+        option_manager.add_option(
+            '--scs-staged',
+            action='store_true',
+            parse_from_config=True,
+            default=False,
+            dest='scs_staged',
+            help='Check the content of the files staged for the next commit (read from the git index) instead of their '
+            'content in the working tree: files that are not staged are skipped and only the top-level statements '
+            'overlapping staged changes (since `--scs-diff-base` if provided, HEAD otherwise) are checked',
+        )
+        option_manager.add_option(
+            '--scs-baseline',
+            type=str,
+            parse_from_config=True,
+            default='',
+            dest='scs_baseline',
+            help='If provided, path to a baseline file listing known errors of this plugin that are not reported '
+            '(see `flake8-scs baseline`)',
+        )
+        option_manager.add_option(
+            '--scs-stats',
+            action='store_true',
+            parse_from_config=True,
+            default=False,
+            dest='scs_stats',
+            help='Print statistics about the work saved by this plugin (duplicate files, result cache) at the end of '
+            'the run',
+        )
+        option_manager.add_option(
+            '--scs-shared-table-size',
+            type=int,
+            parse_from_config=True,
+            default=_DEFAULT_SHARED_TABLE_SIZE,
+            dest='scs_shared_table_size',
+            help='Maximum size in MiB of the table through which the worker processes of flake8 -j share their results '
+            '(only created with --scs-cache-dir or --scs-stats), 0 to never create it (default: %(default)s)',
+        )
+
+    @classmethod
+    def add_options_optparse(
+        cls: type[Plugin], option_manager: flake8.options.manager.OptionManager, options_data: tuple
+    ) -> None:  # pragma: no cover
+        """Add command line options using optparse."""
+
+        def octal_mode_option_callback(option, _, value, parser):
+            """Octal mode option callback."""
+            setattr(parser.values, f'{option.dest}', _read_octal_mode_option(option.dest, value, _DEFAULT_MAX_MODE))
+
+        callback = {'action': 'callback', 'callback': octal_mode_option_callback}
+        for opt_str, kwargs in options_data:
+            option_manager.add_option(opt_str, **{**kwargs, **callback})
+
+    @classmethod
+    def add_options_argparse(
+        cls: type[Plugin], option_manager: flake8.options.manager.OptionManager, options_data: tuple
+    ) -> None:
+        """Add command line options using argparse."""
+        import argparse  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+        class OctalModeAction(argparse.Action):
+            """Action class for octal mode options."""
+
+            def __call__(self, parser, namespace, values, option_string=None):  # noqa: ARG002
+                setattr(namespace, self.dest, _read_octal_mode_option(self.dest, values, _DEFAULT_MAX_MODE))
+
+        action = {'action': OctalModeAction}
+        for opt_str, kwargs in options_data:
+            option_manager.add_option(opt_str, **{**kwargs, **action})
+
+    @classmethod
+    def parse_options(cls: type[Plugin], options: argparse.Namespace) -> None:
+        """Parse command line options."""
+
+        def _set_mode_option(name, modes):
+            if isinstance(modes, str):
+                # NB: flake8 does not call the action of an option for the values read from its configuration files
+                modes = _read_octal_mode_option(f'os_{name}_mode', modes, _DEFAULT_MAX_MODE)
+            setattr(Visitor, f'os_{name}_mode_policy', _ModePolicy.from_option(modes))
+
+        _set_mode_option('mkdir', options.os_mkdir_mode)
+        _set_mode_option('mkfifo', options.os_mkfifo_mode)
+        _set_mode_option('mknod', options.os_mknod_mode)
+        _set_mode_option('open', options.os_open_mode)
+
+        Visitor.platform_profile = _get_platform_profile(options.scs_target_platform)
+        Visitor.rule_set = _compile_rule_set(_get_enabled_codes(options))
+        cls.path_rules = _PathRules.from_option(options.scs_per_path_rules)
+        cls.result_cache = None
+        if options.scs_cache_dir:
+            cls.result_cache = _ResultCache(
+                options.scs_cache_dir, options.scs_cache_max_entries, _get_cache_context(cls.version)
+            )
+        cls.diff_index = None
+        if options.scs_staged:
+            cls.diff_index = _StagedIndex.from_git(options.scs_diff_base)
+        elif options.scs_diff_base:
+            cls.diff_index = _DiffIndex.from_git(options.scs_diff_base)
+        cls.baseline = _Baseline.from_file(options.scs_baseline) if options.scs_baseline else None
+        if cls.content_table is not None and cls.content_table.shared is not None:
+            cls.content_table.shared.close()
+        context = _get_cache_context(cls.version)
+        shared_table = _SharedTable.attach(context)
+        n_slots = options.scs_shared_table_size * 1024 * 1024 // _SharedTable.slot_size
+        # NB: the worker processes only have something to share if their results are cached or counted, duplicate
+        #     files are otherwise only checked once per worker process
+        if (
+            shared_table is None
+            and n_slots > 0
+            and (cls.result_cache is not None or options.scs_stats)
+            and _is_parallel_run(options)
+        ):
+            with contextlib.suppress(OSError):
+                shared_table = _SharedTable.create(context, n_slots)
+        cls.content_table = _ContentTable(shared_table, cls.result_cache)
+        cls.print_stats = options.scs_stats
+        atexit.unregister(cls.report_stats)
+        if cls.print_stats:
+            atexit.register(cls.report_stats)
+
+    @classmethod
+    def report_stats(cls: type[Plugin], file: TextIO | None = None) -> None:
+        """
+        Print statistics about the work saved during the run (by all the processes of the run).
+
+        Args:
+            file: Output stream (defaults to the standard error)
+        """
+        table, cache = cls.content_table, cls.result_cache
+        if table is None:
+            return
+        n_files, n_duplicates, saved_bytes = table.get_stats()
+        if n_files == 0:
+            return
+        file = sys.stderr if file is None else file
+        print(
+            f'{cls.name}: {n_files} files, {n_duplicates} duplicates not checked again '
+            f'({saved_bytes / 1024:.1f} KiB of source code)',
+            file=file,
+        )
+        if cache is not None:
+            hits, misses, unit_hits, unit_misses = table.get_cache_stats()
+            print(
+                f'{cls.name}: result cache: {hits} hits, {misses} misses, '
+                f'{unit_hits} units of code reused, {unit_misses} checked again',
+                file=file,
+            )
+
+    @classmethod
+    def get_rule_set(cls: type[Plugin], filename: str | None) -> _RuleSet:
+        """
+        Return the rules enabled for a file, taking the `scs-per-path-rules` option into account.
+
+        Args:
+            filename: Path to the file (if any)
+        """
+        rule_set = Visitor.rule_set
+        if cls.path_rules is not None and filename is not None:
+            disabled_codes = cls.path_rules.disabled_codes(filename)
+            if disabled_codes:
+                rule_set = _compile_rule_set(rule_set.codes - disabled_codes)
+        return rule_set
+
+    def run(self) -> Generator[tuple[int, int, str, type[Any]], None, None]:
+        """Entry point for flake8."""
+        rule_set = self.get_rule_set(self._filename)
+
+        changed_lines = None
+        if self.diff_index is not None and self._filename is not None:
+            changed_lines = self.diff_index.changed_lines(self._filename)
+            if changed_lines is None or (isinstance(self.diff_index, _StagedIndex) and not self._read_staged()):
+                return
+
+        keywords_re = rule_set.keywords_re
+        if keywords_re is None or (self._lines is not None and not _may_have_errors(self._lines, keywords_re)):
+            return
+
+        if changed_lines is not None and changed_lines is not _ALL_LINES:
+            errors = self._check_changed(rule_set, changed_lines)
+        else:
+            errors = self._check_cached(rule_set)
+
+        if self.baseline is not None and self._filename is not None:
+            errors = self.baseline.filter(self._tree, self._filename, errors)
+
+        if isinstance(self.diff_index, _StagedIndex):
+            # NB: flake8 looks for `# noqa` comments in the working tree, which may differ from the staged content
+            errors = [
+                (line, col, msg)
+                for line, col, msg in errors
+                if not (0 < line <= len(self._lines) and _is_noqa(self._lines[line - 1], _get_code(msg)))
+            ]
+
+        for line, col, msg in errors:
+            yield line, col, msg, type(self)
+
+    def _read_staged(self) -> bool:
+        """
+        Replace the source code of the file by its staged content.
+
+        Returns:
+            False if the staged content cannot be read or parsed, True otherwise
+        """
+        lines = self.diff_index.read_lines(self._filename)
+        if lines is None:
+            return False
+        if lines == self._lines:
+            # NB: usual case where all the changes of the file are staged (the AST parsed by flake8 is reused)
+            return True
+        try:
+            self._tree = ast.parse(''.join(lines))
+        except (SyntaxError, ValueError):
+            return False
+        self._lines = lines
+        return True
+
+    def _check_changed(self, rule_set: _RuleSet, changed_lines: _LineIntervals) -> list[tuple[int, int, str]]:
+        """
+        Check the top-level statements of the file that overlap some changed lines.
+
+        If the errors of the whole file are already known (identical file or result cache), only the errors of these
+        statements are kept instead.
+
+        Args:
+            rule_set: Rules enabled for the file
+            changed_lines: Intervals of changed lines
+
+        Returns:
+            List of errors as (line, column, message) tuples
+        """
+        visitor = Visitor(rule_set)
+        if self._lines is None or not isinstance(self._tree, ast.Module):
+            visitor.visit(self._tree)
+            return visitor.errors
+
+        errors = self._get_known_errors(_get_content_key(self._lines, rule_set))
+        if errors is not None:
+            changed_statements = _LineIntervals([
+                (start, node.end_lineno)
+                for node in self._tree.body
+                for start in (_get_first_lineno(node),)
+                if changed_lines.overlaps(start, node.end_lineno)
+            ])
+            return [error for error in errors if changed_statements.overlaps(error[0], error[0])]
+
+        visitor.visit_changed(self._tree.body, self._lines, changed_lines)
+        return visitor.errors
+
+    def _get_known_errors(self, content_key: str) -> list[tuple[int, int, str]] | None:
+        """
+        Look for the errors of an identical file checked earlier in the run (or in a previous run).
+
+        Args:
+            content_key: Key of the source code of the file
+
+        Returns:
+            List of errors as (line, column, message) tuples or None if not found
+        """
+        errors = None
+        if self.content_table is not None:
+            errors = self.content_table.get(content_key, sum(map(len, self._lines)))
+        if errors is None and self.result_cache is not None:
+            errors = self.result_cache.get(self.result_cache.key(content_key))
+            if self.content_table is not None:
+                self.content_table.publish_stats()
+        return errors
+
+    def _check_cached(self, rule_set: _RuleSet) -> list[tuple[int, int, str]]:
+        """
+        Check the file, reusing the errors of identical files and the result cache if it is enabled.
+
+        Args:
+            rule_set: Rules enabled for the file
+
+        Returns:
+            List of errors as (line, column, message) tuples
+        """
+        table, cache = self.content_table, self.result_cache
+        if self._lines is None or (table is None and cache is None):
+            return self._check(rule_set, None)
+
+        content_key = _get_content_key(self._lines, rule_set)
+        if table is not None:
+            errors = table.get(content_key, sum(map(len, self._lines)))
+            if errors is not None:
+                return errors
+
+        if cache is None:
+            errors = self._check(rule_set, None)
+        else:
+            # NB: identical files checked by other processes (e.g. with `flake8 -j`) are found in the result cache
+            cache_key = cache.key(content_key)
+            errors = cache.get(cache_key)
+            if errors is None:
+                errors = self._check(rule_set, cache)
+                cache.put(cache_key, errors)
+
+        if table is not None:
+            table.put(content_key, errors)
+            table.publish_stats()
+        return errors
+
+    def _check(self, rule_set: _RuleSet, cache: _ResultCache | None) -> list[tuple[int, int, str]]:
+        """
+        Check the AST of the file.
+
+        Args:
+            rule_set: Rules enabled for the file
+            cache: Result cache (if provided, large files are checked incrementally)
+
+        Returns:
+            List of errors as (line, column, message) tuples
+        """
+        visitor = Visitor(rule_set)
+        if (
+            cache is None
+            or self._filename is None
+            or len(self._lines) < cache.incremental_min_lines
+            or not isinstance(self._tree, ast.Module)
+        ):
+            visitor.visit(self._tree)
+            return visitor.errors
+
+        units_key = cache.units_key(self._filename, rule_set)
+        units = cache.get_units(units_key)
+        new_units: dict[str, list] = {}
+        visitor.visit_units(self._tree.body, self._lines, units, new_units)
+        cache.put_units(units_key, new_units, units)
+        return visitor.errors
+
+
+# ==============================================================================
+# Library API
+
+
+class Finding(NamedTuple):
+    """
+    Error found by `scan_source()` or `scan_tree()`.
+
+    Attributes:
+        line: Line number (starting at 1)
+        col: Column offset (starting at 0, in bytes of the UTF-8 encoded line like the `col_offset` of AST nodes)
+        code: Error code (e.g. 'SCS101')
+        message: Error message (without the error code)
+    """
+
+    line: int
+    col: int
+    code: str
+    message: str
+
+
+class ScanPolicy(NamedTuple):
+    """
+    Configuration of the checks of `scan_source()` and `scan_tree()`, equivalent to the options of the plugin.
+
+    Mode-like values use the same syntax as the mode-like options of the plugin (e.g. '0o755', '0o644,0o755' or
+    'mask:0o755'), None disabling the corresponding check like 'no' does.
+
+    Attributes:
+        codes: Enabled error codes (all of them if None)
+        target_platform: Platform(s) targeted by platform-dependent checks: 'auto', 'posix', 'windows' or 'both'
+        os_mkdir_mode: Mode-like value for SCS116
+        os_mkfifo_mode: Mode-like value for SCS117
+        os_mknod_mode: Mode-like value for SCS118
+        os_open_mode: Mode-like value for SCS112
+    """
+
+    codes: frozenset[str] | None = None
+    target_platform: str = 'auto'
+    os_mkdir_mode: str | None = None
+    os_mkfifo_mode: str | None = None
+    os_mknod_mode: str | None = None
+    os_open_mode: str | None = None
+
+
+_DEFAULT_POLICY = ScanPolicy()
+
+
+@functools.lru_cache(maxsize=128)
+def _get_policy_visitor(policy: ScanPolicy) -> type[Visitor]:
+    """
+    Create a subclass of the Visitor class configured by a policy instead of the options of the plugin.
+
+    Args:
+        policy: Configuration of the checks
+
+    Raises:
+        ValueError: if some value of the policy is not valid
+    """
+    codes = _ALL_CODES if policy.codes is None else frozenset(policy.codes)
+    if not codes <= _ALL_CODES:
+        msg = f'Unknown error codes: {sorted(codes - _ALL_CODES)}'
+        raise ValueError(msg)
+    attributes: dict[str, Any] = {
+        'rule_set': _compile_rule_set(codes),
+        'platform_profile': _get_platform_profile(policy.target_platform),
+    }
+    for name in ('mkdir', 'mkfifo', 'mknod', 'open'):
+        modes = getattr(policy, f'os_{name}_mode')
+        attributes[f'os_{name}_mode_policy'] = (
+            None
+            if modes is None
+            else _ModePolicy.from_option(_read_octal_mode_option(f'os_{name}_mode', modes, _DEFAULT_MAX_MODE))
+        )
+    return type(Visitor.__name__, (Visitor,), attributes)
+
+
+def _to_findings(errors: list[tuple[int, int, str]]) -> list[Finding]:
+    """Convert errors as (line, column, message) tuples into sorted findings."""
+    findings = []
+    for line, col, msg in errors:
+        code, _, message = msg.partition(' ')
+        findings.append(Finding(line, col, code, message))
+    findings.sort()
+    return findings
+
+
+def scan_tree(tree: ast.AST, *, policy: ScanPolicy = _DEFAULT_POLICY) -> list[Finding]:
+    """
+    Check an AST with the rules of this plugin.
+
+    Contrary to `scan_source()`, `# noqa` comments cannot be taken into account (they are not part of the AST).
+
+    Args:
+        tree: AST to check (e.g. as returned by `ast.parse()`)
+        policy: Configuration of the checks (all checks with their default settings by default)
+
+    Returns:
+        Errors found, sorted by position
+
+    Raises:
+        ValueError: if some value of the policy is not valid
+    """
+    visitor = _get_policy_visitor(policy)()
+    visitor.visit(tree)
+    return _to_findings(visitor.errors)
+
+
+def scan_source(text: str, *, policy: ScanPolicy = _DEFAULT_POLICY, filename: str = '<unknown>') -> list[Finding]:
+    """
+    Check some source code with the rules of this plugin, taking `# noqa` comments into account.
+
+    Unlike the flake8 plugin, this neither imports flake8 nor relies on the configuration of the Visitor class, so that
+    it may be called with different policies (e.g. from several threads). Source code that does not contain any of the
+    names the enabled rules rely on is not even parsed.
+
+    Args:
+        text: Source code
+        policy: Configuration of the checks (all checks with their default settings by default)
+        filename: Name of the file reported in syntax errors
+
+    Returns:
+        Errors found, sorted by position
+
+    Raises:
+        SyntaxError: if the source code cannot be parsed (only when it may contain errors)
+        ValueError: if some value of the policy is not valid or if the source code contains null bytes
+    """
+    visitor_class = _get_policy_visitor(policy)
+    keywords_re = visitor_class.rule_set.keywords_re
+    if keywords_re is None or not _may_have_errors([text], keywords_re):
+        return []
+
+    visitor = visitor_class()
+    visitor.visit(ast.parse(text, filename))
+    if not visitor.errors:
+        return []
+    lines = _split_lines(text)
+    return _to_findings([
+        (line, col, msg)
+        for line, col, msg in visitor.errors
+        if not (0 < line <= len(lines) and _is_noqa(lines[line - 1], _get_code(msg)))
+    ])
+
+
+class FileFindings(NamedTuple):
+    """
+    Result of the check of a file by `scan_paths()`.
+
+    Attributes:
+        path: Path to the file
+        findings: Errors found, sorted by position
+        error: Exception raised while reading, decoding, parsing or checking the file (in which case there are no
+            findings) or None
+    """
+
+    path: str
+    findings: list[Finding]
+    error: Exception | None = None
+
+
+def _scan_file_content(content: bytes, filename: str, policy: ScanPolicy) -> list[Finding]:
+    """
+    Decode the content of a file like flake8 does (taking PEP 263 encoding declarations into account) and check it.
+
+    Raises:
+        SyntaxError: if the content cannot be decoded or parsed
+        UnicodeDecodeError: if the content cannot be decoded
+        ValueError: if some value of the policy is not valid or if the source code contains null bytes
+    """
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(content).readline)
+    return scan_source(content.decode(encoding), policy=policy, filename=filename)
+
+
+class _AsyncScan:
+    """
+    Pipeline of tasks checking files for `scan_paths()`.
+
+    Reader tasks put the content of the files into a bounded queue, from which checker tasks take them to check them in
+    an executor, putting the results into another bounded queue.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        paths: Iterable[str | os.PathLike[str]],
+        policy: ScanPolicy,
+        concurrency: int,
+        executor: concurrent.futures.Executor | None,
+        read: Callable[[str], Awaitable[bytes]] | None,
+    ) -> None:
+        """
+        Initialize an _AsyncScan object (see `scan_paths()` for the arguments).
+
+        Must be called from a coroutine.
+        """
+        import asyncio  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+        self._asyncio = asyncio
+        self._loop = asyncio.get_running_loop()
+        self._paths = iter(paths)
+        self._policy = policy
+        self._executor = executor
+        self._read = self._read_file if read is None else read
+        self._contents: asyncio.Queue[tuple[str, bytes] | None] = asyncio.Queue(maxsize=concurrency)
+        self.results: asyncio.Queue[FileFindings | Exception | None] = asyncio.Queue(maxsize=concurrency)
+        self._checkers = [asyncio.ensure_future(self._check_files()) for _ in range(concurrency)]
+        self._readers = [asyncio.ensure_future(self._read_files()) for _ in range(concurrency)]
+        self._tasks = [*self._checkers, *self._readers, asyncio.ensure_future(self._run())]
+
+    def cancel(self) -> None:
+        """Cancel all the tasks of the pipeline."""
+        for task in self._tasks:
+            task.cancel()
+
+    async def _read_file(self, path: str) -> bytes:
+        return await self._loop.run_in_executor(None, Path(path).read_bytes)
+
+    async def _read_files(self) -> None:
+        # NB: the readers share the iterator of paths, each one reading the next file once done with the previous one
+        for path in map(os.fspath, self._paths):
+            try:
+                content = await self._read(path)
+            except OSError as err:  # noqa: PERF203
+                await self.results.put(FileFindings(path, [], err))
+            else:
+                await self._contents.put((path, content))
+
+    async def _check_files(self) -> None:
+        while True:
+            item = await self._contents.get()
+            if item is None:
+                return
+            path, content = item
+            try:
+                findings = await self._loop.run_in_executor(
+                    self._executor, _scan_file_content, content, path, self._policy
+                )
+            except Exception as err:  # noqa: BLE001
+                # NB: the errors of a file (including unexpected ones) do not stop the check of the other files
+                await self.results.put(FileFindings(path, [], err))
+            else:
+                await self.results.put(FileFindings(path, findings))
+
+    async def _run(self) -> None:
+        try:
+            await self._asyncio.gather(*self._readers)
+            for _ in self._checkers:
+                await self._contents.put(None)
+            await self._asyncio.gather(*self._checkers)
+        except Exception as err:  # noqa: BLE001
+            # NB: unexpected errors (e.g. raised by the function reading the files) are raised again by scan_paths()
+            await self.results.put(err)
+        await self.results.put(None)
+
+
+async def scan_paths(
+    paths: Iterable[str | os.PathLike[str]],
+    *,
+    policy: ScanPolicy = _DEFAULT_POLICY,
+    concurrency: int = 8,
+    executor: concurrent.futures.Executor | None = None,
+    read: Callable[[str], Awaitable[bytes]] | None = None,
+) -> AsyncIterator[FileFindings]:
+    """
+    Check files asynchronously, yielding the results of each file as soon as it is checked.
+
+    Up to `concurrency` files are read at the same time while the files already read are checked in an executor, so
+    that reading files from slow storage overlaps with checking them and the event loop is never blocked. Files read
+    and results not consumed yet are held in bounded queues: once they are full, no more files are read until the
+    results are consumed by the caller (backpressure).
+
+    Args:
+        paths: Paths to the files to check (consumed lazily)
+        policy: Configuration of the checks (all checks with their default settings by default)
+        concurrency: Maximum number of files read or checked at the same time
+        executor: Executor in which the files are checked (defaults to the default executor of the event loop), e.g. a
+            `concurrent.futures.ProcessPoolExecutor` to check several files in parallel
+        read: Coroutine function returning the content of a file given its path (defaults to reading local files in the
+            default executor of the event loop), e.g. to read files from some artifact store
+
+    Yields:
+        The results of each file, in the order in which their checks completed
+
+    Raises:
+        ValueError: if `concurrency` is not positive or if some value of the policy is not valid
+    """
+    if concurrency < 1:
+        msg = f'Invalid concurrency: {concurrency}'
+        raise ValueError(msg)
+    _get_policy_visitor(policy)
+
+    scan = _AsyncScan(paths, policy, concurrency, executor, read)
+    try:
+        while True:
+            result = await scan.results.get()
+            if result is None:
+                return
+            if isinstance(result, Exception):
+                raise result
+            yield result
+    finally:
+        scan.cancel()
+
+
+# ==============================================================================
+# Watch mode
+
+_CONFIG_FILENAMES = frozenset(('setup.cfg', 'tox.ini', '.flake8', 'pyproject.toml'))
+
+# NB: same syntax as the one accepted by flake8
+_NOQA_RE = re.compile(r'# noqa(?::[\s]?(?P<codes>[A-Z]+[0-9]+(?:[,\s]+[A-Z]+[0-9]+)*))?', re.IGNORECASE)
+
+
+def _load_flake8_options() -> argparse.Namespace:
+    """
+    Load the options of flake8 from the configuration files of the current directory.
+
+    This also configures this plugin, as flake8 calls `Plugin.parse_options()`.
+    """
+    from flake8.api import legacy  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    return legacy.get_style_guide().options
+
+
+def _read_pyproject_config(path: str) -> dict[str, Any] | None:
+    """
+    Read the `[tool.flake8]` table of a pyproject.toml file (as used by the Flake8-pyproject plugin).
+
+    Args:
+        path: Path to the pyproject.toml file
+
+    Returns:
+        Options of the table or None if the file does not exist, cannot be parsed (e.g. without a TOML parser on
+        Python < 3.11) or has no such table
+    """
+    try:
+        import tomllib  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+    except ImportError:  # pragma: no cover
+        try:
+            import tomli as tomllib  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+        except ImportError:
+            return None
+
+    try:
+        with open(path, 'rb') as file:  # noqa: PTH123
+            config = tomllib.load(file).get('tool', {}).get('flake8')
+    except (OSError, ValueError):
+        return None
+    return config if isinstance(config, dict) else None
+
+
+def _read_flake8_config(directory: str) -> tuple[dict[str, Any], str]:
+    """
+    Find and read the `[flake8]` section of the configuration files like flake8 does, without flake8.
+
+    The setup.cfg, tox.ini and .flake8 files (then the `[tool.flake8]` table of pyproject.toml) of the directory and of
+    its parents (up to the home directory) are looked into, the first file with a flake8 section being the
+    configuration file.
+
+    Args:
+        directory: Directory where to start looking for the configuration file
+
+    Returns:
+        Options of the configuration file (with dashes in their names) and directory of the configuration file (or the
+        given directory if none was found)
+    """
+    import configparser  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    home = os.path.expanduser('~')  # noqa: PTH111
+    path = os.path.abspath(directory)  # noqa: PTH100
+    while True:
+        for name in ('setup.cfg', 'tox.ini', '.flake8'):
+            parser = configparser.RawConfigParser()
+            try:
+                parser.read(os.path.join(path, name), encoding='utf-8')  # noqa: PTH118
+            except (UnicodeDecodeError, configparser.Error):
+                continue
+            if parser.has_section('flake8') or parser.has_section('flake8:local-plugins'):
+                config = dict(parser.items('flake8')) if parser.has_section('flake8') else {}
+                break
+        else:
+            config = _read_pyproject_config(os.path.join(path, 'pyproject.toml'))  # noqa: PTH118
+        if config is not None:
+            return {key.replace('_', '-'): value for key, value in config.items()}, path
+
+        parent = os.path.dirname(path)  # noqa: PTH120
+        if parent in {path, home}:
+            return {}, os.path.abspath(directory)  # noqa: PTH100
+        path = parent
+
+
+def _load_config_options() -> argparse.Namespace:
+    """
+    Load the options used by the `flake8-scs` commands from the configuration files of the current directory.
+
+    Contrary to `_load_flake8_options()`, flake8 is neither imported nor run (no registration of options nor discovery
+    of plugins): only the options of flake8 selecting the files (`filename`, `exclude`, `extend-exclude`, `jobs`) and
+    the error codes (`select`, `ignore`, `extend-select`, `extend-ignore`) and the options of this plugin are read (see
+    `_read_flake8_config()`), with the same syntax and defaults as flake8. This also configures this plugin.
+
+    Raises:
+        ValueError: if the value of an option is not valid
+    """
+    import argparse  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+    import configparser  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    config, directory = _read_flake8_config(os.curdir)
+
+    def _list(value):
+        # NB: same as flake8's comma-separated lists (pyproject.toml files may also use TOML arrays)
+        items = value if isinstance(value, list) else re.split(r'[,\s]', value)
+        return [item for item in (str(item).strip() for item in items) if item]
+
+    def _paths(value):
+        separators = os.path.sep + (os.path.altsep or '')
+        return [
+            (
+                os.path.abspath(os.path.join(directory, path))  # noqa: PTH100, PTH118
+                if path == '.' or any(separator in path for separator in separators)
+                else path
+            ).rstrip(separators)
+            for path in _list(value)
+        ]
+
+    def _bool(value):
+        if isinstance(value, bool):
+            return value
+        try:
+            return configparser.RawConfigParser.BOOLEAN_STATES[str(value).lower()]
+        except KeyError:
+            msg = f'Not a boolean: {value!r}'
+            raise ValueError(msg) from None
+
+    def _get(name, convert=None, *, default=None):
+        value = config.get(name)
+        if value is None:
+            return default
+        return value if convert is None else convert(value)
+
+    options = argparse.Namespace(
+        filename=_get('filename', _paths, default=['*.py']),
+        exclude=_get('exclude', _paths, default=list(_DEFAULT_EXCLUDE)),
+        extend_exclude=_get('extend-exclude', _paths, default=[]),
+        jobs=_get('jobs', str, default='auto'),
+        select=_get('select', _list),
+        ignore=_get('ignore', _list),
+        extend_select=_get('extend-select', _list, default=[]),
+        extend_ignore=_get('extend-ignore', _list, default=[]),
+        os_mkdir_mode=_get('os-mkdir-mode', default=False),
+        os_mkfifo_mode=_get('os-mkfifo-mode', default=False),
+        os_mknod_mode=_get('os-mknod-mode', default=False),
+        os_open_mode=_get('os-open-mode', default=False),
+        scs_target_platform=_get('scs-target-platform', default='auto'),
+        scs_per_path_rules=_get('scs-per-path-rules', default=''),
+        scs_cache_dir=_get('scs-cache-dir', default=''),
+        scs_cache_max_entries=_get('scs-cache-max-entries', int, default=_DEFAULT_CACHE_MAX_ENTRIES),
+        scs_diff_base=_get('scs-diff-base', default=''),
+        scs_staged=_get('scs-staged', _bool, default=False),
+        scs_baseline=_get('scs-baseline', default=''),
+        scs_stats=_get('scs-stats', _bool, default=False),
+        scs_shared_table_size=_get('scs-shared-table-size', int, default=_DEFAULT_SHARED_TABLE_SIZE),
+    )
+    Plugin.parse_options(options)
+    return options
+
+
+def _is_noqa(line: str, code: str) -> bool:
+    """
+    Check whether an error is disabled by a `# noqa` comment.
+
+    Args:
+        line: Line of source code the error is reported on
+        code: Error code
+    """
+    match = _NOQA_RE.search(line)
+    if match is None:
+        return False
+    codes = match.group('codes')
+    return codes is None or code.startswith(tuple(re.split(r'[,\s]+', codes.upper())))
+
+
+def _decode_lines(source: bytes | mmap.mmap) -> list[str]:
+    """
+    Decode the content of a file (taking PEP 263 encoding declarations into account) and split it into lines.
+
+    Raises:
+        SyntaxError: if the encoding declaration is invalid
+        UnicodeDecodeError: if the file cannot be decoded
+    """
+    return str(source, _detect_buffer_encoding(source)).splitlines(keepends=True)
+
+
+def _check_source(
+    source: bytes | mmap.mmap, filename: str
+) -> tuple[ast.Module, int, list[tuple[int, int, str]]] | None:
+    """
+    Check the content of a file like flake8 does, taking `# noqa` comments into account.
+
+    The content is parsed as is (e.g. straight from a memory-mapped file) and is only decoded into lines if the plugin
+    needs them (result cache, table of duplicate files or changed lines) or if errors are found.
+
+    Args:
+        source: Content of the file
+        filename: Path to the file
+
+    Returns:
+        AST, number of lines and errors (as (line, column, message) tuples) of the file, or None if it cannot be
+        decoded or parsed
+    """
+    try:
+        # NB: the parser decodes the source code itself, taking PEP 263 encoding declarations into account
+        tree = ast.parse(source, filename)
+        lines = None
+        if Plugin.result_cache is not None or Plugin.content_table is not None or Plugin.diff_index is not None:
+            lines = _decode_lines(source)
+    except (SyntaxError, UnicodeDecodeError, ValueError):
+        return None
+
+    errors = [(line, col, msg) for line, col, msg, _ in Plugin(tree, lines, filename).run()]
+    if errors and lines is None:
+        try:
+            lines = _decode_lines(source)
+        except (SyntaxError, UnicodeDecodeError):
+            return None
+    if lines is None:
+        return tree, _count_lines(source), errors
+    errors = [
+        (line, col, msg)
+        for line, col, msg in errors
+        if not (0 < line <= len(lines) and _is_noqa(lines[line - 1], _get_code(msg)))
+    ]
+    return tree, len(lines), errors
+
+
+class _FileResults(NamedTuple):
+    """Errors reported for a file by the watch mode."""
+
+    digest: str
+    errors: list[tuple[int, int, str]]
+    fingerprints: list[str]
+
+
+class _WatchSession:
+    """
+    State of the `flake8-scs watch` command: options of flake8 and errors reported for each watched file.
+
+    Attributes:
+        paths: Files and directories to check
+        results: Errors reported for each file, by path
+        output: Output stream
+    """
+
+    def __init__(self, paths: list[str], output: TextIO) -> None:
+        """
+        Initialize a _WatchSession object.
+
+        Args:
+            paths: Files and directories to check
+            output: Output stream
+        """
+        self.paths = paths
+        self.output = output
+        self.results: dict[str, _FileResults] = {}
+        self._filename_patterns: list[str] = ['*.py']
+        self._exclude: list[str] = []
+
+    def configure(self) -> argparse.Namespace:
+        """
+        Load the configuration of flake8 (and of this plugin) from the configuration files.
+
+        The configuration files are read without flake8 (see `_load_config_options()`).
+
+        Returns:
+            Options read from the configuration files
+        """
+        options = _load_config_options()
+        self._filename_patterns = list(options.filename or ['*.py'])
+        self._exclude = [*(options.exclude or []), *(getattr(options, 'extend_exclude', None) or [])]
+        return options
+
+    def is_excluded(self, path: str) -> bool:
+        """
+        Check whether a file or directory is excluded by the `exclude` option of flake8.
+
+        Args:
+            path: Path to a file or directory
+        """
+        name, abs_path = os.path.basename(path), os.path.abspath(path)  # noqa: PTH119, PTH100
+        return any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(abs_path, pattern) for pattern in self._exclude)
+
+    def is_checked(self, path: str) -> bool:
+        """
+        Check whether a file is checked, according to the `filename` and `exclude` options of flake8.
+
+        Args:
+            path: Path to a file
+        """
+        name = os.path.basename(path)  # noqa: PTH119
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self._filename_patterns) and not self.is_excluded(path)
+
+    def is_watched(self, path: str) -> bool:
+        """
+        Check whether a file is one of the paths of the session or is inside one of them.
+
+        Args:
+            path: Path to a file
+        """
+        path = os.path.abspath(path)  # noqa: PTH100
+        return any(
+            path == root or path.startswith(os.path.join(root, ''))  # noqa: PTH118
+            for root in map(os.path.abspath, self.paths)
+        )
+
+    def discover(self, paths: Iterable[str] | None = None) -> Generator[str, None, None]:
+        """
+        Find the files to check.
+
+        Args:
+            paths: Files and directories to look into (defaults to the paths of the session)
+        """
+        for path in self.paths if paths is None else paths:
+            if not os.path.isdir(path):  # noqa: PTH112
+                # NB: like flake8, files given explicitly are always checked
+                if paths is None or self.is_checked(path):
+                    yield os.path.normpath(path)
+                continue
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = sorted(name for name in dirnames if not self.is_excluded(os.path.join(dirpath, name)))  # noqa: PTH118
+                for name in sorted(filenames):
+                    filename = os.path.normpath(os.path.join(dirpath, name))  # noqa: PTH118
+                    if self.is_checked(filename):
+                        yield filename
+
+    def reload(self) -> list[str]:
+        """
+        Load the configuration again and check all the files.
+
+        Returns:
+            Changes in the reported errors, as lines of output
+        """
+        self.configure()
+        previous, self.results = self.results, {}
+        lines = []
+        for filename in self.discover():
+            new = self._check(filename, None)
+            if new is not None:
+                self.results[filename] = new
+        for filename in sorted(previous.keys() | self.results.keys()):
+            lines.extend(self._get_delta(filename, previous.get(filename), self.results.get(filename)))
+        return lines
+
+    def update(self, paths: Iterable[str]) -> list[str]:
+        """
+        Check the files that changed.
+
+        Files whose content did not change are not checked again.
+
+        Args:
+            paths: Paths to files or directories that were created, modified or deleted
+
+        Returns:
+            Changes in the reported errors, as lines of output
+        """
+        filenames = set()
+        for path in map(os.path.normpath, paths):
+            if path in self.results:
+                filenames.add(path)
+            elif not self.is_watched(path):
+                continue
+            elif os.path.isdir(path):  # noqa: PTH112
+                filenames.update(self.discover([path]))
+            elif os.path.exists(path):  # noqa: PTH110
+                if self.is_checked(path):
+                    filenames.add(path)
+            else:
+                prefix = os.path.join(path, '')  # noqa: PTH118
+                filenames.update(name for name in self.results if name == path or name.startswith(prefix))
+
+        lines = []
+        for filename in sorted(filenames):
+            old = self.results.get(filename)
+            new = self._check(filename, old)
+            if new is old:
+                continue
+            if new is None:
+                del self.results[filename]
+            else:
+                self.results[filename] = new
+            lines.extend(self._get_delta(filename, old, new))
+        return lines
+
+    def summary(self) -> str:
+        """Return a summary of the errors currently reported."""
+        n_errors = sum(len(results.errors) for results in self.results.values())
+        n_files = sum(1 for results in self.results.values() if results.errors)
+        return f'{n_errors} errors in {n_files} files ({len(self.results)} files watched)'
+
+    @staticmethod
+    def _check(filename: str, old: _FileResults | None) -> _FileResults | None:
+        try:
+            source = Path(filename).read_bytes()
+        except OSError:
+            return None
+        digest = hashlib.sha256(source).hexdigest()
+        if old is not None and old.digest == digest:
+            return old
+
+        try:
+            checked = _check_source(source, filename)
+            if checked is None:
+                # NB: syntax errors are reported by flake8 itself (E999)
+                return _FileResults(digest, [], [])
+            tree, _, errors = checked
+            return _FileResults(digest, errors, _get_fingerprints(tree, filename, errors))
+        except Exception as err:  # noqa: BLE001
+            # NB: the errors previously reported for the file are kept and the other files are still watched
+            print(f'{filename}: unexpected error while checking the file: {err!r}', file=sys.stderr)
+            return old
+
+    @staticmethod
+    def _get_delta(filename: str, old: _FileResults | None, new: _FileResults | None) -> list[str]:
+        old_errors = list(zip(old.fingerprints, old.errors)) if old is not None else []
+        new_errors = list(zip(new.fingerprints, new.errors)) if new is not None else []
+
+        def _unmatched(errors, others):
+            # NB: errors are matched by fingerprint, so that errors that only moved are not reported again
+            counts: dict[str, int] = {}
+            for fingerprint, _ in others:
+                counts[fingerprint] = counts.get(fingerprint, 0) + 1
+            for fingerprint, error in errors:
+                if counts.get(fingerprint, 0):
+                    counts[fingerprint] -= 1
+                else:
+                    yield error
+
+        removed = [f'- {filename}:{line}:{col + 1}: {msg}' for line, col, msg in _unmatched(old_errors, new_errors)]
+        added = [f'+ {filename}:{line}:{col + 1}: {msg}' for line, col, msg in _unmatched(new_errors, old_errors)]
+        return removed + added
+
+
+class _PollingWatcher:
+    """Watch files by periodically comparing their modification times and sizes."""
+
+    def __init__(self, discover: Callable[[], Iterable[str]], interval: float) -> None:
+        """
+        Initialize a _PollingWatcher object.
+
+        Args:
+            discover: Function returning the paths of the files to watch
+            interval: Time between two scans of the files (in seconds)
+        """
+        self.discover = discover
+        self.interval = interval
+        self._stats = self._scan()
+
+    def wait(self) -> set[str]:
+        """Wait until some files are created, modified or deleted and return their paths."""
+        while True:
+            time.sleep(self.interval)
+            stats = self._scan()
+            changed = {path for path in stats.keys() | self._stats.keys() if stats.get(path) != self._stats.get(path)}
+            self._stats = stats
+            if changed:
+                return changed
+
+    def close(self) -> None:
+        """Stop watching the files."""
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        stats = {}
+        for path in self.discover():
+            with contextlib.suppress(OSError):
+                stat_result = os.stat(path)  # noqa: PTH116
+                stats[path] = (stat_result.st_mtime_ns, stat_result.st_size)
+        return stats
+
+
+class _InotifyWatcher:
+    """Watch directories for changes using inotify (Linux only, through ctypes)."""
+
+    # NB: values from <sys/inotify.h>
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    _event = struct.Struct('iIII')
+
+    # NB: time to wait for more events once an event is received, so that the many events of a single save or checkout
+    #     are handled together
+    debounce_delay: ClassVar[float] = 0.05
+
+    def __init__(self, libc: ctypes.CDLL, roots: list[str], is_excluded: Callable[[str], bool]) -> None:
+        """
+        Initialize an _InotifyWatcher object.
+
+        Directories are watched recursively, while only the parent directories of files are watched, as well as the
+        current directory for changes of the configuration files of flake8.
+
+        Args:
+            libc: C library (loaded with ctypes)
+            roots: Files and directories to watch
+            is_excluded: Function returning whether a directory should not be watched
+
+        Raises:
+            OSError: if inotify is not available or if the directories cannot be watched (e.g. because of the limit on
+                the number of watches)
+        """
+        self._libc = libc
+        self._is_excluded = is_excluded
+        self._fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise self._get_last_error()
+        self._directories: dict[int, str] = {}
+        try:
+            for root in roots:
+                if os.path.isdir(root):  # noqa: PTH112
+                    self._add_tree(root)
+                else:
+                    self._add_watch(os.path.dirname(root) or os.curdir)  # noqa: PTH120
+            self._add_watch(os.curdir)
+        except OSError:
+            self.close()
+            raise
+
+    @classmethod
+    def create(
+        cls: type[_InotifyWatcher], roots: list[str], is_excluded: Callable[[str], bool]
+    ) -> _InotifyWatcher | None:
+        """
+        Create an _InotifyWatcher object if inotify is available.
+
+        Args:
+            roots: Files and directories to watch
+            is_excluded: Function returning whether a directory should not be watched
+
+        Returns:
+            The watcher or None if inotify is not available
+        """
+        if not sys.platform.startswith('linux'):
+            return None
+        import ctypes.util  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            return cls(libc, roots, is_excluded)
+        except (OSError, AttributeError):
+            return None
+
+    def wait(self) -> set[str]:
+        """
+        Wait until some files or directories are created, modified or deleted and return their paths.
+
+        Returns:
+            The paths that changed (if events were lost, the watched directories themselves)
+        """
+        changed: set[str] = set()
+        timeout = None
+        while True:
+            readable, _, _ = select.select([self._fd], [], [], timeout)
+            if not readable:
+                return changed
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                continue
+            changed.update(self._parse(data))
+            timeout = self.debounce_delay
+
+    def close(self) -> None:
+        """Stop watching the directories."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _add_tree(self, root: str) -> None:
+        for dirpath, dirnames, _ in os.walk(root):
+            dirnames[:] = [name for name in dirnames if not self._is_excluded(os.path.join(dirpath, name))]  # noqa: PTH118
+            try:
+                self._add_watch(dirpath)
+            except OSError as err:
+                # NB: directories may be removed while walking the tree
+                if dirpath == root or err.errno == errno.ENOSPC:
+                    raise
+
+    def _add_watch(self, directory: str) -> None:
+        mask = (
+            self.IN_MODIFY
+            | self.IN_CLOSE_WRITE
+            | self.IN_MOVED_FROM
+            | self.IN_MOVED_TO
+            | self.IN_CREATE
+            | self.IN_DELETE
+            | self.IN_DELETE_SELF
+        )
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), mask)
+        if wd < 0:
+            raise self._get_last_error(directory)
+        self._directories[wd] = directory
+
+    @staticmethod
+    def _get_last_error(*args: str) -> OSError:
+        import ctypes  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+        err = ctypes.get_errno()
+        return OSError(err, os.strerror(err), *args)
+
+    def _parse(self, data: bytes) -> set[str]:
+        changed = set()
+        offset = 0
+        while offset + self._event.size <= len(data):
+            wd, mask, _, length = self._event.unpack_from(data, offset)
+            offset += self._event.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                changed.update(self._directories.values())
+                continue
+            directory = self._directories.get(wd)
+            if directory is None:
+                continue
+            if mask & (self.IN_IGNORED | self.IN_DELETE_SELF):
+                del self._directories[wd]
+                changed.add(directory)
+                continue
+
+            path = os.path.join(directory, name) if name else directory  # noqa: PTH118
+            changed.add(path)
+            if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO) and not self._is_excluded(path):
+                with contextlib.suppress(OSError):
+                    self._add_tree(path)
+        return changed
+
+
+def _is_config_file(path: str) -> bool:
+    """
+    Check whether a path is one of the configuration files of flake8 in the current directory.
+
+    Args:
+        path: Path to a file
+    """
+    return Path(path).name in _CONFIG_FILENAMES and Path(path).parent.resolve() == Path.cwd().resolve()
+
+
+def _watch(session: _WatchSession, *, poll: bool, interval: float) -> None:
+    """
+    Check files and print the changes in the reported errors each time files are modified.
+
+    Args:
+        session: State of the watch mode
+        poll: Whether to always poll the files for changes instead of using inotify
+        interval: Time between two scans of the files when polling for changes (in seconds)
+    """
+
+    def _print(lines):
+        for line in lines:
+            print(line, file=session.output)
+        print(session.summary(), file=sys.stderr)
+        session.output.flush()
+
+    _print(session.reload())
+
+    def _discover():
+        yield from session.discover()
+        yield from (name for name in _CONFIG_FILENAMES if os.path.isfile(name))  # noqa: PTH113
+
+    watcher: _InotifyWatcher | _PollingWatcher | None = None
+    if not poll:
+        watcher = _InotifyWatcher.create(session.paths, session.is_excluded)
+    if watcher is None:
+        watcher = _PollingWatcher(_discover, interval)
+
+    try:
+        while True:
+            changed = watcher.wait()
+            lines = session.reload() if any(map(_is_config_file, changed)) else session.update(changed)
+            if lines:
+                _print(lines)
+    finally:
+        watcher.close()
+
+
+# ==============================================================================
+# Language server
+
+# NB: line breaks of the Language Server Protocol (and of the Python tokenizer)
+_LINE_RE = re.compile(r'[^\r\n]*(?:\r\n?|\n)|[^\r\n]+')
+
+
+def _split_lines(text: str) -> list[str]:
+    """Split a text into lines (keeping their line breaks) like the Language Server Protocol."""
+    return _LINE_RE.findall(text)
+
+
+def _from_utf16(line: str, character: int) -> int:
+    """
+    Convert a position in a line from UTF-16 code units (as used by the Language Server Protocol) to characters.
+
+    Args:
+        line: Line of text (without line break)
+        character: Position in UTF-16 code units
+    """
+    if line.isascii():
+        return min(character, len(line))
+    return len(line.encode('utf-16-le')[: 2 * character].decode('utf-16-le', 'ignore'))
+
+
+def _to_utf16(line: str, index: int) -> int:
+    """
+    Convert a position in a line from characters to UTF-16 code units (as used by the Language Server Protocol).
+
+    Args:
+        line: Line of text
+        index: Position in characters
+    """
+    if line.isascii():
+        return index
+    return len(line[:index].encode('utf-16-le', 'surrogatepass')) // 2
+
+
+def _uri_to_path(uri: str) -> str | None:
+    """Return the path of a `file:` URI (None for other URIs)."""
+    from urllib.parse import unquote, urlparse  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+    from urllib.request import url2pathname  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    parsed = urlparse(uri)
+    if parsed.scheme != 'file':
+        return None
+    return url2pathname(unquote(parsed.path))
+
+
+class _TextDocument:
+    """
+    Text document opened in an editor, checked one chunk of statements at a time.
+
+    The results of each chunk are kept between two checks (see `Visitor.visit_chunks()`), so that only the chunks that
+    were edited since the last check are parsed and traversed again.
+
+    Attributes:
+        uri: URI of the document
+        filename: Path to the document (None if the document is not a file)
+        lines: Lines of the document (with their line breaks)
+        version: Version number of the document
+    """
+
+    def __init__(self, uri: str, text: str, version: int | None = None) -> None:
+        """
+        Initialize a _TextDocument object.
+
+        Args:
+            uri: URI of the document
+            text: Content of the document
+            version: Version number of the document
+        """
+        self.uri = uri
+        self.filename = _uri_to_path(uri)
+        self.lines = _split_lines(text)
+        self.version = version
+        self._units: dict[str, list] = {}
+
+    def apply_change(self, change: dict[str, Any]) -> None:
+        """
+        Apply a change to the content of the document.
+
+        Args:
+            change: `TextDocumentContentChangeEvent` object (replacement of either a range or the whole content)
+        """
+        if 'range' not in change:
+            self.lines = _split_lines(change['text'])
+            return
+
+        lines, start, end = self.lines, change['range']['start'], change['range']['end']
+        first, last = start['line'], end['line']
+        prefix = suffix = ''
+        if first < len(lines):
+            line = lines[first].rstrip('\r\n')
+            prefix = line[: _from_utf16(line, start['character'])]
+        if last < len(lines):
+            line = lines[last].rstrip('\r\n')
+            suffix = lines[last][_from_utf16(line, end['character']) :]
+        text = prefix + change['text'] + suffix
+
+        # NB: a carriage return followed by a line feed is a single line break
+        if not prefix and 0 < first <= len(lines) and text.startswith('\n') and lines[first - 1].endswith('\r'):
+            first -= 1
+            text = lines[first] + text
+        lines[first : last + 1] = _split_lines(text)
+
+    def check(self, cancelled: Callable[[], bool] | None = None) -> list[tuple[int, int, str]] | None:
+        """
+        Check the content of the document.
+
+        Args:
+            cancelled: Function called between two chunks, returning whether to stop the check
+
+        Returns:
+            List of errors as (line, column, message) tuples or None if the check was cancelled
+        """
+        rule_set = Plugin.get_rule_set(self.filename)
+        keywords_re = rule_set.keywords_re
+        if keywords_re is None or not _may_have_errors(self.lines, keywords_re):
+            return []
+
+        visitor = Visitor(rule_set)
+        new_units: dict[str, list] = {}
+        if not visitor.visit_chunks(self.lines, self._units, new_units, cancelled):
+            # NB: keep the results of the chunks checked so far for the next check
+            self._units.update(new_units)
+            return None
+        self._units = new_units
+        return [
+            (line, col, msg)
+            for line, col, msg in visitor.errors
+            if not (0 < line <= len(self.lines) and _is_noqa(self.lines[line - 1], _get_code(msg)))
+        ]
+
+    def get_diagnostics(self, errors: list[tuple[int, int, str]]) -> list[dict[str, Any]]:
+        """
+        Convert errors into `Diagnostic` objects of the Language Server Protocol.
+
+        Args:
+            errors: List of errors as (line, column, message) tuples
+
+        Returns:
+            Diagnostics ranging from the position of each error to the end of its line
+        """
+        diagnostics = []
+        for line, col, msg in sorted(errors):
+            text = self.lines[line - 1].rstrip('\r\n') if 0 < line <= len(self.lines) else ''
+            # NB: the column of an error is an offset in bytes of the UTF-8 encoded line
+            index = col if text.isascii() else len(text.encode('utf-8')[:col].decode('utf-8', 'ignore'))
+            code, _, message = msg.partition(' ')
+            diagnostics.append({
+                'range': {
+                    'start': {'line': line - 1, 'character': _to_utf16(text, index)},
+                    'end': {'line': line - 1, 'character': _to_utf16(text, len(text))},
+                },
+                'severity': 2,
+                'code': code,
+                'source': 'flake8-secure-coding-standard',
+                'message': message,
+            })
+        return diagnostics
+
+
+def _read_lsp_message(stream: BinaryIO) -> dict[str, Any] | None:
+    """
+    Read a message of the Language Server Protocol (a JSON-RPC message preceded by its headers).
+
+    Args:
+        stream: Input stream
+
+    Returns:
+        Message or None at the end of the stream
+    """
+    length = None
+    while True:
+        header = stream.readline()
+        if not header:
+            return None
+        header = header.strip()
+        if header:
+            name, _, value = header.decode('ascii').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        elif length is not None:
+            # NB: unbuffered streams may return fewer bytes than requested
+            body = b''
+            while len(body) < length:
+                data = stream.read(length - len(body))
+                if not data:
+                    return None
+                body += data
+            return json.loads(body)
+
+
+def _write_lsp_message(stream: BinaryIO, message: dict[str, Any]) -> None:
+    """
+    Write a message of the Language Server Protocol (a JSON-RPC message preceded by its headers).
+
+    Args:
+        stream: Output stream
+        message: Message
+    """
+    body = json.dumps({'jsonrpc': '2.0', **message}).encode()
+    stream.write(b'Content-Length: %d\r\n\r\n%s' % (len(body), body))
+    stream.flush()
+
+
+class _LanguageServer:
+    """
+    State of the `flake8-scs lsp` command: documents opened in the editor and their pending checks.
+
+    A document is checked once no change was made to it for `debounce_delay` seconds, and its diagnostics are published
+    when the check completes. Checks are cancelled as soon as a new message is received from the editor, and resumed
+    afterwards from their last completed chunk.
+
+    Attributes:
+        output: Output stream
+        documents: Documents opened in the editor, by URI
+        exit_code: Exit status of the server, once it received an `exit` notification
+    """
+
+    debounce_delay: ClassVar[float] = 0.05
+
+    def __init__(self, output: BinaryIO) -> None:
+        """
+        Initialize a _LanguageServer object.
+
+        Args:
+            output: Output stream
+        """
+        self.output = output
+        self.documents: dict[str, _TextDocument] = {}
+        self.exit_code: int | None = None
+        self._deadlines: dict[str, float] = {}
+        self._shutdown = False
+
+    def get_timeout(self) -> float | None:
+        """Return the time until the next pending check, in seconds (None if no check is pending)."""
+        if not self._deadlines:
+            return None
+        return max(min(self._deadlines.values()) - time.monotonic(), 0)
+
+    def handle(self, message: dict[str, Any]) -> None:
+        """
+        Handle a message received from the editor.
+
+        Errors raised while handling a request (e.g. if its parameters are malformed) are replied to the editor, and
+        those raised while handling a notification are logged, so that the server keeps running.
+
+        Args:
+            message: Request or notification
+        """
+        method, params = message.get('method'), message.get('params') or {}
+        if 'id' in message and method is None:
+            return  # NB: response to a request of the server
+
+        handler = getattr(self, f'_on_{str(method).replace("/", "_").replace("$", "")}', None)
+        if 'id' not in message:
+            if handler is not None and (not self._shutdown or method == 'exit'):
+                try:
+                    handler(params)
+                except Exception as err:  # noqa: BLE001
+                    self._log(f'Error while handling {method}: {err!r}')
+            return
+
+        if self._shutdown:
+            self._reply(message['id'], error={'code': -32600, 'message': 'Server is shutting down'})
+        elif handler is None:
+            self._reply(message['id'], error={'code': -32601, 'message': f'Method not found: {method}'})
+        else:
+            try:
+                result = handler(params)
+            except (AttributeError, IndexError, KeyError, TypeError) as err:
+                self._reply(message['id'], error={'code': -32602, 'message': f'Invalid params: {err!r}'})
+            except Exception as err:  # noqa: BLE001
+                self._reply(message['id'], error={'code': -32603, 'message': f'Internal error: {err!r}'})
+            else:
+                self._reply(message['id'], result=result)
+
+    def check_pending(self, cancelled: Callable[[], bool] | None = None) -> None:
+        """
+        Check the documents whose pending check is due and publish their diagnostics.
+
+        Args:
+            cancelled: Function called between two chunks, returning whether to stop the checks
+        """
+        now = time.monotonic()
+        for uri, deadline in sorted(self._deadlines.items(), key=operator.itemgetter(1)):
+            if deadline > now:
+                break
+            document = self.documents[uri]
+            try:
+                errors = document.check(cancelled)
+            except Exception as err:  # noqa: BLE001
+                # NB: the diagnostics previously published for the document are kept and the server keeps running
+                del self._deadlines[uri]
+                self._log(f'Unexpected error while checking {document.uri}: {err!r}')
+                continue
+            if errors is None:
+                return
+            del self._deadlines[uri]
+            self._publish(document, document.get_diagnostics(errors))
+
+    def _reply(self, request_id: int | str, **response: Any) -> None:
+        _write_lsp_message(self.output, {'id': request_id, **response})
+
+    def _publish(self, document: _TextDocument, diagnostics: list[dict[str, Any]]) -> None:
+        params: dict[str, Any] = {'uri': document.uri, 'diagnostics': diagnostics}
+        if document.version is not None:
+            params['version'] = document.version
+        _write_lsp_message(self.output, {'method': 'textDocument/publishDiagnostics', 'params': params})
+
+    def _log(self, message: str) -> None:
+        _write_lsp_message(self.output, {'method': 'window/logMessage', 'params': {'type': 1, 'message': message}})
+
+    @staticmethod
+    def _on_initialize(params: dict[str, Any]) -> dict[str, Any]:
+        root = _uri_to_path(params['rootUri']) if params.get('rootUri') else params.get('rootPath')
+        if root and os.path.isdir(root):  # noqa: PTH112
+            os.chdir(root)
+        _load_flake8_options()
+        return {
+            'capabilities': {'textDocumentSync': {'openClose': True, 'change': 2}},
+            'serverInfo': {'name': 'flake8-secure-coding-standard', 'version': Plugin.version},
+        }
+
+    def _on_shutdown(self, params: dict[str, Any]) -> None:  # noqa: ARG002
+        self._shutdown = True
+
+    def _on_exit(self, params: dict[str, Any]) -> None:  # noqa: ARG002
+        self.exit_code = 0 if self._shutdown else 1
+
+    def _on_textDocument_didOpen(self, params: dict[str, Any]) -> None:  # noqa: N802
+        item = params['textDocument']
+        self.documents[item['uri']] = _TextDocument(item['uri'], item['text'], item.get('version'))
+        self._deadlines[item['uri']] = time.monotonic()
+
+    def _on_textDocument_didChange(self, params: dict[str, Any]) -> None:  # noqa: N802
+        document = self.documents.get(params['textDocument']['uri'])
+        if document is None:
+            return
+        for change in params['contentChanges']:
+            document.apply_change(change)
+        document.version = params['textDocument'].get('version')
+        self._deadlines[document.uri] = time.monotonic() + self.debounce_delay
+
+    def _on_textDocument_didClose(self, params: dict[str, Any]) -> None:  # noqa: N802
+        document = self.documents.pop(params['textDocument']['uri'], None)
+        if document is not None:
+            self._deadlines.pop(document.uri, None)
+            document.version = None
+            self._publish(document, [])
+
+
+def _serve_lsp(input_stream: BinaryIO, output_stream: BinaryIO) -> int:
+    """
+    Run a language server over a pair of streams until it receives an `exit` notification.
+
+    Messages are read by a separate thread, so that the checks can be cancelled as soon as a new message arrives.
+
+    Args:
+        input_stream: Input stream (e.g. standard input)
+        output_stream: Output stream (e.g. standard output)
+
+    Returns:
+        Exit status
+    """
+    messages: queue.Queue[dict[str, Any] | None] = queue.Queue()
+
+    def _read() -> None:
+        while True:
+            message = _read_lsp_message(input_stream)
+            messages.put(message)
+            if message is None:
+                return
+
+    threading.Thread(target=_read, daemon=True).start()
+    server = _LanguageServer(output_stream)
+    while server.exit_code is None:
+        try:
+            message = messages.get(timeout=server.get_timeout())
+        except queue.Empty:
+            server.check_pending(cancelled=lambda: not messages.empty())
+            continue
+        if message is None:
+            return 1
+        server.handle(message)
+    return server.exit_code
+
+
+# ==============================================================================
+# Git history
+
+
+class _HistoryFinding(NamedTuple):
+    """
+    Error found in the history of a git repository.
+
+    Attributes:
+        path: Path to the file (relative to the top-level directory of the repository)
+        line: Line of the error, in the last version of the file it was found in
+        col: Column of the error, in the last version of the file it was found in
+        msg: Error message
+        first_seen: SHA of the first commit the error was found in
+        last_seen: SHA of the last commit the error was found in
+        present: Whether the error is found in the last commit
+    """
+
+    path: str
+    line: int
+    col: int
+    msg: str
+    first_seen: str
+    last_seen: str
+    present: bool
+
+
+# NB: modes of the entries of git trees (sub-trees and regular or executable files)
+_GIT_TREE_MODE = b'40000'
+_GIT_BLOB_MODES = (b'100644', b'100755')
+
+
+class _HistoryScanner:
+    """
+    Scanner of the history of a git repository, reporting the first and last commits each error was found in.
+
+    Commits are read in order through a single `git cat-file --batch` process. The files that changed between two
+    commits are found by comparing their trees, skipping the sub-trees that did not change, and each distinct blob is
+    only checked once. Errors are identified by their path and fingerprint (see `_get_fingerprints()`), so that they are
+    followed across the commits that only move them around within a file.
+
+    Attributes:
+        n_commits: Number of commits scanned
+        n_blobs: Number of distinct blobs checked
+    """
+
+    def __init__(
+        self, cat_file: _GitCatFile, toplevel: Path, paths: list[str] | None = None, patterns: list[str] | None = None
+    ) -> None:
+        """
+        Initialize a _HistoryScanner object.
+
+        Args:
+            cat_file: Reader of the objects of the repository
+            toplevel: Top-level directory of the repository
+            paths: Only scan these files and directories (relative to the top-level directory, all by default)
+            patterns: Patterns of the names of the files to check (defaults to `*.py`)
+        """
+        self._cat_file = cat_file
+        self._toplevel = toplevel
+        self._paths = paths
+        self._patterns = patterns or ['*.py']
+        self._trees: dict[str, dict[str, tuple[bytes, str]]] = {}
+        self._next_trees: dict[str, dict[str, tuple[bytes, str]]] = {}
+        self._blobs: dict[tuple[str, frozenset[str]], list[tuple[str, int, int, str]]] = {}
+        self.n_commits = 0
+
+    @property
+    def n_blobs(self) -> int:
+        """Number of distinct blobs checked."""
+        return len(self._blobs)
+
+    def scan(self, commits: Iterable[str]) -> list[_HistoryFinding]:
+        """
+        Scan some commits.
+
+        Args:
+            commits: SHA of the commits, in chronological order (e.g. from `git rev-list --reverse`)
+
+        Returns:
+            Errors found in the commits, sorted by path and position
+        """
+        # NB: errors currently found in each file, identified by (path, fingerprint, index among identical errors)
+        files: dict[str, list[tuple[tuple[str, str, int], int, int, str]]] = {}
+        first_seen: dict[tuple[str, str, int], str] = {}
+        last_seen: dict[tuple[str, str, int], str] = {}
+        positions: dict[tuple[str, str, int], tuple[int, int, str]] = {}
+
+        tree, commit, previous_commit = None, '', ''
+        for commit in commits:
+            previous_tree, tree = tree, self._read_commit_tree(commit)
+            for path, blob in self._diff_trees(previous_tree, tree, ''):
+                for key, *_ in files.pop(path, ()):
+                    last_seen[key] = previous_commit
+                if blob is None:
+                    continue
+                counts: dict[str, int] = {}
+                errors = []
+                for fingerprint, line, col, msg in self._check_blob(blob, path):
+                    index = counts.get(fingerprint, 0)
+                    counts[fingerprint] = index + 1
+                    key = (path, fingerprint, index)
+                    first_seen.setdefault(key, commit)
+                    positions[key] = (line, col, msg)
+                    errors.append((key, line, col, msg))
+                files[path] = errors
+            previous_commit = commit
+            self._trees, self._next_trees = self._next_trees, {}
+            self.n_commits += 1
+
+        present = {key for errors in files.values() for key, *_ in errors}
+        for key in present:
+            last_seen[key] = commit
+        return sorted(
+            _HistoryFinding(key[0], *positions[key], first_seen[key], last_seen[key], key in present)
+            for key in first_seen
+        )
+
+    def _read_commit_tree(self, commit: str) -> str:
+        obj = self._cat_file.read(commit)
+        if obj is None or obj[0] != 'commit':
+            msg = f'{commit} is not a commit'
+            raise ValueError(msg)
+        # NB: the first line of a commit object is `tree <SHA>`
+        return obj[1].split(b'\n', 1)[0][5:].decode('ascii')
+
+    def _read_tree(self, sha: str | None) -> dict[str, tuple[bytes, str]]:
+        if sha is None:
+            return {}
+        entries = self._trees.get(sha) or self._next_trees.get(sha)
+        if entries is None:
+            obj = self._cat_file.read(sha)
+            entries = _parse_git_tree(obj[1], self._cat_file.hash_size) if obj is not None and obj[0] == 'tree' else {}
+        # NB: the trees of a commit are those of the previous commit when scanning the next one
+        self._next_trees[sha] = entries
+        return entries
+
+    def _diff_trees(
+        self, old_sha: str | None, new_sha: str | None, prefix: str
+    ) -> Generator[tuple[str, str | None], None, None]:
+        old, new = self._read_tree(old_sha), self._read_tree(new_sha)
+        for name in sorted(old.keys() | new.keys()):
+            old_entry, new_entry = old.get(name), new.get(name)
+            if old_entry == new_entry:
+                continue
+            path = prefix + name
+            old_mode, old_entry_sha = old_entry or (b'', None)
+            new_mode, new_entry_sha = new_entry or (b'', None)
+            old_tree = old_entry_sha if old_mode == _GIT_TREE_MODE else None
+            new_tree = new_entry_sha if new_mode == _GIT_TREE_MODE else None
+            if (old_tree or new_tree) and self._is_selected(path, is_dir=True):
+                yield from self._diff_trees(old_tree, new_tree, f'{path}/')
+
+            # NB: symbolic links and submodules are not checked
+            old_blob = old_entry_sha if old_mode in _GIT_BLOB_MODES else None
+            new_blob = new_entry_sha if new_mode in _GIT_BLOB_MODES else None
+            if old_blob != new_blob and self._is_selected(path, is_dir=False):
+                yield path, new_blob
+
+    def _is_selected(self, path: str, *, is_dir: bool) -> bool:
+        if not is_dir and not any(fnmatch.fnmatch(path.rpartition('/')[2], pattern) for pattern in self._patterns):
+            return False
+        if self._paths is None:
+            return True
+        return any(
+            path == selected or path.startswith(f'{selected}/') or (is_dir and selected.startswith(f'{path}/'))
+            for selected in self._paths
+        )
+
+    def _check_blob(self, sha: str, path: str) -> list[tuple[str, int, int, str]]:
+        rule_set = Plugin.get_rule_set(str(self._toplevel / path))
+        key = (sha, rule_set.codes)
+        errors = self._blobs.get(key)
+        if errors is not None:
+            return errors
+
+        errors = []
+        obj = self._cat_file.read(sha)
+        content = obj[1] if obj is not None else b''
+        try:
+            encoding, _ = tokenize.detect_encoding(io.BytesIO(content).readline)
+            lines = content.decode(encoding).splitlines(keepends=True)
+            keywords_re = rule_set.keywords_re
+            if keywords_re is not None and _may_have_errors(lines, keywords_re):
+                tree = ast.parse(''.join(lines))
+                visitor = Visitor(rule_set)
+                visitor.visit(tree)
+                reported = [
+                    (line, col, msg)
+                    for line, col, msg in sorted(visitor.errors)
+                    if not (0 < line <= len(lines) and _is_noqa(lines[line - 1], _get_code(msg)))
+                ]
+                # NB: the path is part of the identity of an error, not of its fingerprint, so that the errors of a
+                #     blob found at several paths are only computed once
+                fingerprints = _get_fingerprints(tree, '', reported)
+                errors = [(fingerprint, *error) for fingerprint, error in zip(fingerprints, reported)]
+        except (SyntaxError, UnicodeDecodeError, ValueError):
+            pass
+        except Exception as err:  # noqa: BLE001
+            # NB: the blob is reported once (its results are cached) and the other blobs are still checked
+            print(f'{path} ({sha}): unexpected error while checking the file: {err!r}', file=sys.stderr)
+        self._blobs[key] = errors
+        return errors
+
+
+def _scan_history(revision: str, paths: list[str], output: TextIO, *, json_output: bool = False) -> _HistoryScanner:
+    """
+    Scan the history of the git repository of the current directory and print the errors found.
+
+    Args:
+        revision: Revision (or range of revisions) whose first-parent history is scanned
+        paths: Only scan these files and directories (all files if empty)
+        output: Output stream
+        json_output: Print one JSON object per error instead of lines of text
+
+    Returns:
+        The scanner, for its statistics
+
+    Raises:
+        ValueError: if git fails (e.g. not in a git repository or invalid revision)
+    """
+    toplevel = Path(_run_git(['rev-parse', '--show-toplevel'], None).strip())
+    commits = _run_git(['rev-list', '--reverse', '--first-parent', revision, '--'], toplevel).split()
+    options = _load_flake8_options()
+    try:
+        selected = [Path(path).resolve().relative_to(toplevel.resolve()).as_posix() for path in paths]
+    except ValueError as err:
+        msg = f'Path outside of the repository: {err}'
+        raise ValueError(msg) from err
+
+    with _GitCatFile(toplevel) as cat_file:
+        scanner = _HistoryScanner(
+            cat_file,
+            toplevel,
+            None if not selected or '.' in selected else selected,
+            list(options.filename or ['*.py']),
+        )
+        findings = scanner.scan(commits)
+
+    for finding in findings:
+        if json_output:
+            output.write(json.dumps({**finding._asdict(), 'col': finding.col + 1}) + '\n')
+        else:
+            seen = f'first seen in {finding.first_seen[:12]}, '
+            seen += 'still present' if finding.present else f'last seen in {finding.last_seen[:12]}'
+            output.write(f'{finding.path}:{finding.line}:{finding.col + 1}: {finding.msg} ({seen})\n')
+    return scanner
+
+
+# ==============================================================================
+# Standalone scan
+
+# NB: number of batches of files per worker process, large enough for the last (smallest) batches to balance the load
+_SCAN_BATCHES_PER_JOB = 16
+
+# NB: size of the chunks of the files that are copied at once when counting their lines
+_SCAN_CHUNK_SIZE = 1 << 20
+
+# NB: default minimum number of lines of the files split into chunks of statements checked by several worker processes
+_SCAN_SPLIT_LINES = 20000
+
+# NB: number of chunks of statements per worker process a large file is split into
+_SCAN_CHUNKS_PER_JOB = 4
+
+_IMPORT_RE = re.compile(r'\bimport\b')
+
+
+class _ScanStats(NamedTuple):
+    """Statistics of the `flake8-scs scan` command."""
+
+    n_files: int
+    n_lines: int
+    n_errors: int
+    elapsed: float
+
+
+def _get_scan_batches(files: list[tuple[int, str]], n_batches: int) -> list[list[str]]:
+    """
+    Group files into batches of similar total sizes, the largest files first.
+
+    Files are sorted by decreasing size and grouped until each batch holds about `1 / n_batches` of the total size, so
+    that the largest files are batches of their own that are checked first and that the last batches (made of many
+    small files) keep all the worker processes busy until the end.
+
+    Args:
+        files: Size and path of each file
+        n_batches: Approximate number of batches
+
+    Returns:
+        Paths to the files of each batch
+    """
+    target_size = max(sum(size for size, _ in files) / max(n_batches, 1), 1)
+    batches: list[list[str]] = []
+    batch: list[str] = []
+    batch_size = 0
+    for size, filename in sorted(files, key=lambda file: (-file[0], file[1])):
+        batch.append(filename)
+        batch_size += size
+        if batch_size >= target_size:
+            batches.append(batch)
+            batch, batch_size = [], 0
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+@contextlib.contextmanager
+def _map_file(filename: str) -> Generator[bytes | mmap.mmap, None, None]:
+    """
+    Map a file into memory (read-only), so that its content is only loaded by the operating system as it gets read.
+
+    Files that cannot be mapped (e.g. empty files) are read instead.
+
+    Args:
+        filename: Path to the file
+
+    Raises:
+        OSError: if the file cannot be opened or read
+    """
+    with open(filename, 'rb') as file:  # noqa: PTH123
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            data = None
+        if data is None:
+            yield file.read()
+            return
+        with data:
+            yield data
+
+
+def _count_lines(data: bytes | mmap.mmap) -> int:
+    """Count the lines of the content of a file, in chunks of `_SCAN_CHUNK_SIZE` bytes."""
+    n_lines = sum(
+        data[start : start + _SCAN_CHUNK_SIZE].count(b'\n') for start in range(0, len(data), _SCAN_CHUNK_SIZE)
+    )
+    return n_lines + (len(data) > 0 and data[-1:] != b'\n')
+
+
+@contextlib.contextmanager
+def _map_checked_source(filename: str) -> Generator[tuple[bytes | mmap.mmap | None, int], None, None]:
+    """
+    Map the content of a file in memory if it may contain errors reported by the plugin.
+
+    The keyword prefilter (see `_may_have_errors_in_buffer()`) runs on the memory-mapped file and the files that pass
+    it are parsed straight from it (see `_check_source()`), so that the files are never copied as a whole.
+
+    Args:
+        filename: Path to the file
+
+    Yields:
+        Content of the file (or None if it does not need to be parsed) and number of lines of the file if it does not
+        need to be parsed (0 otherwise)
+
+    Raises:
+        OSError: if the file cannot be read
+    """
+    keywords_re = Plugin.get_rule_set(filename).keywords_re
+    with _map_file(filename) as data:
+        if keywords_re is None or not _may_have_errors_in_buffer(data, keywords_re):
+            yield None, _count_lines(data)
+        else:
+            yield data, 0
+
+
+class _ScanChunk(NamedTuple):
+    """
+    Chunk of top-level statements of a large file, checked on its own by a worker process of `flake8-scs scan`.
+
+    Attributes:
+        start: Index of the first line of the chunk in the file
+        source: Source code of the chunk
+        aliases: Table of the import aliases in effect before the chunk
+    """
+
+    start: int
+    source: str
+    aliases: dict[str, str]
+
+
+def _split_scan_source(source: bytes | mmap.mmap, n_chunks: int) -> list[_ScanChunk] | None:
+    """
+    Split the source code of a large file into chunks of top-level statements of similar sizes.
+
+    The source code is not parsed as a whole (which would take about as long as checking it): the statements are found
+    by `_split_chunks()` and only the statements containing import statements are parsed, to compute the import aliases
+    in effect before each chunk. Statements that cannot be parsed on their own are merged with the following ones.
+
+    Args:
+        source: Content of the file
+        n_chunks: Approximate number of chunks
+
+    Returns:
+        Chunks of the file or None if the file cannot be split (e.g. if it cannot be decoded)
+    """
+    try:
+        lines = _decode_lines(source)
+    except (SyntaxError, UnicodeDecodeError):
+        return None
+    source_lines = _get_source_lines(lines)
+    starts = _split_chunks(source_lines, 0, len(lines), '') if lines else [0]
+    chunk_lines = max(len(lines) // n_chunks, 1)
+
+    chunks = []
+    aliases = dict(_DEFAULT_ALIASES)
+    chunk_start, chunk_aliases = 0, dict(aliases)
+    # NB: first line of the statements with import statements that could not be parsed so far (if any)
+    pending = None
+    for start, stop in zip(starts, [*starts[1:], len(lines)]):
+        if pending is None:
+            if start - chunk_start >= chunk_lines:
+                chunks.append(_ScanChunk(chunk_start, ''.join(lines[chunk_start:start]), chunk_aliases))
+                chunk_start, chunk_aliases = start, dict(aliases)
+            if _IMPORT_RE.search(source_lines.text, source_lines.offsets[start], source_lines.offsets[stop]) is None:
+                continue
+            pending = start
+        elif stop - pending > chunk_lines:
+            return None
+        try:
+            tree = ast.parse(''.join(lines[pending:stop]))
+        except (SyntaxError, ValueError):
+            continue
+        for node in tree.body:
+            _update_statement_aliases(aliases, node)
+        pending = None
+    if pending is not None:
+        return None
+    chunks.append(_ScanChunk(chunk_start, ''.join(lines[chunk_start:]), chunk_aliases))
+    return chunks
+
+
+def _scan_chunk(filename: str, chunk: _ScanChunk) -> list[tuple[str, int, int, str]] | None:
+    """
+    Check a chunk of a large file (in a worker process of the `flake8-scs scan` command).
+
+    Args:
+        filename: Path to the file
+        chunk: Chunk of the file
+
+    Returns:
+        Errors sorted by position as (path, line, column, message) tuples, or None if the chunk cannot be parsed or
+        checked
+    """
+    try:
+        tree = ast.parse(chunk.source, filename)
+    except (SyntaxError, ValueError):
+        return None
+    visitor = Visitor(Plugin.get_rule_set(filename), chunk.aliases)
+    try:
+        visitor.visit(tree)
+    except Exception:  # noqa: BLE001
+        # NB: the file is checked again as a whole, which reports the error
+        return None
+    lines = chunk.source.splitlines(keepends=True)
+    return sorted(
+        (filename, line + chunk.start, col, msg)
+        for line, col, msg in visitor.errors
+        if not (0 < line <= len(lines) and _is_noqa(lines[line - 1], _get_code(msg)))
+    )
+
+
+def _scan_files(
+    filenames: list[str], split_lines: int = 0, n_chunks: int = 1
+) -> tuple[list[tuple[str, int, int, str]], int, list[tuple[str, int, list[_ScanChunk]]]]:
+    """
+    Check a batch of files (in a worker process of the `flake8-scs scan` command).
+
+    Files that cannot be read, decoded or parsed are skipped, and unexpected errors raised while checking a file are
+    printed to the standard error. Large files are split into chunks (see `_split_scan_source()`) instead of being
+    checked, so that their chunks can be checked by several worker processes.
+
+    Args:
+        filenames: Paths to the files
+        split_lines: Minimum number of lines of the files that are split into chunks (0 to never split files)
+        n_chunks: Approximate number of chunks of the files that are split
+
+    Returns:
+        Errors sorted by path and position as (path, line, column, message) tuples, number of lines checked, and path,
+        number of lines and chunks of the files that were split
+    """
+    results = []
+    n_lines = 0
+    split_files = []
+    for filename in filenames:
+        try:
+            with _map_checked_source(filename) as (source, n_skipped_lines):
+                if source is None:
+                    n_lines += n_skipped_lines
+                    continue
+                file_lines = _count_lines(source) if split_lines else 0
+                if split_lines and file_lines >= split_lines:
+                    chunks = _split_scan_source(source, n_chunks)
+                    if chunks is not None and len(chunks) > 1:
+                        split_files.append((filename, file_lines, chunks))
+                        continue
+                try:
+                    checked = _check_source(source, filename)
+                except Exception as err:  # noqa: BLE001
+                    print(f'{filename}: unexpected error while checking the file: {err!r}', file=sys.stderr)
+                    continue
+        except OSError:
+            continue
+        if checked is None:
+            continue
+        _, file_lines, errors = checked
+        n_lines += file_lines
+        results.extend((filename, line, col, msg) for line, col, msg in errors)
+    results.sort()
+    return results, n_lines, split_files
+
+
+def _run_scan(
+    executor: concurrent.futures.Executor, batches: list[list[str]], split_lines: int, n_chunks: int
+) -> list[tuple[list[tuple[str, int, int, str]], int]]:
+    """
+    Check batches of files in an executor, checking the chunks of the large files as soon as they are split.
+
+    The errors of the chunks of a file are concatenated in the order of the chunks. If some chunk cannot be parsed on
+    its own (e.g. if it was split within a statement), the whole file is checked again without being split.
+
+    Args:
+        executor: Executor running the worker processes
+        batches: Batches of files (see `_get_scan_batches()`)
+        split_lines: Minimum number of lines of the files that are split into chunks (0 to never split files)
+        n_chunks: Approximate number of chunks of the files that are split
+
+    Returns:
+        Sorted errors and number of lines checked of each batch of files (or of each file that was split)
+    """
+    import concurrent.futures  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    scan_files = functools.partial(_scan_files, split_lines=split_lines, n_chunks=n_chunks)
+    batch_futures = {executor.submit(scan_files, batch) for batch in batches}
+    pending = set(batch_futures)
+    runs = []
+    split_files = []
+    while pending:
+        done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done & batch_futures:
+            errors, n_lines, split = future.result()
+            runs.append((errors, n_lines))
+            for filename, file_lines, chunks in split:
+                futures = [executor.submit(_scan_chunk, filename, chunk) for chunk in chunks]
+                split_files.append((filename, file_lines, futures))
+                pending.update(futures)
+
+    for filename, file_lines, futures in split_files:
+        chunk_errors = [future.result() for future in futures]
+        if any(errors is None for errors in chunk_errors):
+            errors, n_lines, _ = executor.submit(_scan_files, [filename]).result()
+            runs.append((errors, n_lines))
+        else:
+            runs.append((list(itertools.chain.from_iterable(chunk_errors)), file_lines))
+    return runs
+
+
+def _scan(
+    paths: list[str], output: TextIO, jobs: int | None = None, split_lines: int = _SCAN_SPLIT_LINES
+) -> _ScanStats:
+    """
+    Check files and directories with several worker processes and print the errors found, sorted by path and position.
+
+    The configuration of flake8 (and of this plugin) is read from the current directory. Files are checked in batches
+    (see `_get_scan_batches()`) taken from a shared queue by the worker processes as soon as they are idle, and the
+    sorted errors of each batch are merged once all the batches are checked. Files with at least `split_lines` lines
+    are split into chunks of top-level statements checked by several worker processes (see `_run_scan()`).
+
+    Args:
+        paths: Files and directories to check
+        output: Output stream
+        jobs: Number of worker processes (defaults to the `jobs` option of flake8)
+        split_lines: Minimum number of lines of the files that are split into chunks (0 to never split files)
+
+    Returns:
+        Statistics of the scan
+    """
+    start = time.perf_counter()
+    session = _WatchSession(paths, output)
+    options = session.configure()
+    jobs = _get_n_jobs(options) if jobs is None else jobs
+    if Plugin.diff_index is not None or Plugin.baseline is not None:
+        # NB: only whole files can be compared to the changed lines or to the baseline
+        split_lines = 0
+
+    files = []
+    for filename in session.discover():
+        with contextlib.suppress(OSError):
+            files.append((os.stat(filename).st_size, filename))  # noqa: PTH116
+    batches = _get_scan_batches(files, jobs * _SCAN_BATCHES_PER_JOB)
+
+    # NB: a file cannot have more lines than bytes
+    if jobs <= 1 or (len(batches) <= 1 and not (split_lines and any(size >= split_lines for size, _ in files))):
+        runs = [run[:2] for run in map(_scan_files, batches)]
+    else:
+        import concurrent.futures  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+        import multiprocessing  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+        context = multiprocessing.get_context()
+        # NB: forked worker processes inherit the configuration of the plugin, the other ones need to load it again
+        initializer = None if context.get_start_method() == 'fork' else _load_config_options
+        with concurrent.futures.ProcessPoolExecutor(jobs, context, initializer) as executor:
+            runs = _run_scan(executor, batches, split_lines, jobs * _SCAN_CHUNKS_PER_JOB)
+
+    n_errors = 0
+    for filename, line, col, msg in heapq.merge(*(errors for errors, _ in runs)):
+        output.write(f'{filename}:{line}:{col + 1}: {msg}\n')
+        n_errors += 1
+    return _ScanStats(len(files), sum(n_lines for _, n_lines in runs), n_errors, time.perf_counter() - start)
+
+
+# ==============================================================================
+# Command line interface
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Entry point of the `flake8-scs` command line tool.
+
+    Args:
+        argv: Command line arguments (defaults to `sys.argv[1:]`)
+
+    Returns:
+        Exit status
+    """
+    import argparse  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    parser = argparse.ArgumentParser(
+        prog='flake8-scs', description='Tools for the flake8-secure-coding-standard plugin'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    baseline_parser = subparsers.add_parser(
+        'baseline',
+        help='Create a baseline file from the output of flake8',
+        description='Create a baseline file from the output of flake8 (in its default format), e.g. '
+        '`flake8 --select=SCS | flake8-scs baseline -o .scs-baseline`',
+    )
+    baseline_parser.add_argument('input', nargs='?', default='-', help='Output of flake8 (default: standard input)')
+    baseline_parser.add_argument('-o', '--output', default='-', help='Baseline file (default: standard output)')
+
+    watch_parser = subparsers.add_parser(
+        'watch',
+        help='Check files each time they change',
+        description='Check files and print the changes in the reported errors each time files are modified (lines '
+        'starting with "+" for new errors and "-" for fixed ones). The configuration of flake8 is read from the '
+        'current directory and reloaded when it changes.',
+    )
+    watch_parser.add_argument('paths', nargs='*', default=[os.curdir], help='Files and directories to watch')
+    watch_parser.add_argument(
+        '--poll', action='store_true', help='Poll the files for changes instead of using inotify (Linux only)'
+    )
+    watch_parser.add_argument(
+        '--interval', type=float, default=1.0, help='Time between two polls, in seconds (default: %(default)s)'
+    )
+
+    history_parser = subparsers.add_parser(
+        'history',
+        help='Find when errors were introduced in the history of a git repository',
+        description='Check the files of each commit of the first-parent history of a revision (each distinct file '
+        'content being checked once) and print the errors found, along with the first and last commits they were '
+        'found in.',
+    )
+    history_parser.add_argument('paths', nargs='*', help='Only scan these files and directories (default: all)')
+    history_parser.add_argument(
+        '-r', '--revision', default='HEAD', help='Revision or range of revisions to scan (default: %(default)s)'
+    )
+    history_parser.add_argument('--json', action='store_true', help='Print one JSON object per error')
+
+    scan_parser = subparsers.add_parser(
+        'scan',
+        help='Check files with the rules of this plugin only',
+        description='Check files and directories with the rules of this plugin only (without the other checks of '
+        'flake8) using several worker processes, and print the errors found sorted by path and position. The '
+        'configuration of flake8 is read from the current directory. The exit status is 1 if some errors are found.',
+    )
+    scan_parser.add_argument('paths', nargs='*', default=[os.curdir], help='Files and directories to check')
+    scan_parser.add_argument(
+        '-j', '--jobs', type=int, help='Number of worker processes (default: `jobs` option of flake8)'
+    )
+    scan_parser.add_argument(
+        '--split-lines',
+        type=int,
+        default=_SCAN_SPLIT_LINES,
+        help='Minimum number of lines of the files split into chunks of statements checked by several worker '
+        f'processes, 0 to never split files (default: {_SCAN_SPLIT_LINES})',
+    )
+
+    subparsers.add_parser(
+        'lsp',
+        help='Run a language server',
+        description='Run a language server (over standard input and output) publishing the errors of the documents '
+        'opened in a text editor. The configuration of flake8 is read from the root directory of the workspace.',
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'history':
+        try:
+            scanner = _scan_history(args.revision, args.paths, sys.stdout, json_output=args.json)
+        except ValueError as err:
+            parser.error(str(err))
+        print(
+            f'Number of commits scanned: {scanner.n_commits} ({scanner.n_blobs} distinct files checked)',
+            file=sys.stderr,
+        )
+        return 0
+
+    if args.command == 'scan':
+        stats = _scan(args.paths, sys.stdout, args.jobs, args.split_lines)
+        elapsed = max(stats.elapsed, 1e-9)
+        print(
+            f'Number of files checked: {stats.n_files} ({stats.n_files / elapsed:.0f} files/s, '
+            f'{stats.n_lines / elapsed:.0f} lines/s)',
+            file=sys.stderr,
+        )
+        return 1 if stats.n_errors else 0
+
+    if args.command == 'lsp':
+        # NB: the thread reading the messages may still be blocked on its input stream at exit, which must therefore
+        #     be unbuffered (the lock of a buffered stream cannot be acquired at exit while it is in use)
+        with open(sys.stdin.fileno(), 'rb', buffering=0, closefd=False) as input_stream:
+            return _serve_lsp(input_stream, sys.stdout.buffer)
+
+    if args.command == 'watch':
+        with contextlib.suppress(KeyboardInterrupt):
+            _watch(_WatchSession(args.paths, sys.stdout), poll=args.poll, interval=args.interval)
+        return 0
+
+    with contextlib.ExitStack() as stack:
+        flake8_output = sys.stdin if args.input == '-' else stack.enter_context(Path(args.input).open(encoding='utf-8'))
+        output = (
+            sys.stdout if args.output == '-' else stack.enter_context(Path(args.output).open('w', encoding='utf-8'))
+        )
+        n_errors = _write_baseline(flake8_output, output)
+    print(f'Number of errors written to the baseline: {n_errors}', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    # NB: flake8 configures the classes of the imported module, not those of the __main__ module
+    import flake8_secure_coding_standard  # pylint: disable=import-self
+
+    sys.exit(flake8_secure_coding_standard.main())
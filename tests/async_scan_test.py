@@ -0,0 +1,130 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import concurrent.futures
+import os
+
+import flake8_secure_coding_standard as flake8_scs
+
+import pytest
+
+
+@pytest.fixture()
+def files(tmp_path):
+    (tmp_path / 'a.py').write_text('import os\n\nos.system(x)\n')
+    (tmp_path / 'b.py').write_text('x = 1\n')
+    (tmp_path / 'c.py').write_bytes(b'# -*- coding: latin-1 -*-\ns = "\xe9"\neval(s)\n')
+    (tmp_path / 'd.py').write_text('eval(x\n')
+    return [str(tmp_path / name) for name in ('a.py', 'b.py', 'c.py', 'd.py', 'missing.py')]
+
+
+def scan(paths, **kwargs):
+    async def _scan():
+        return [result async for result in flake8_scs.scan_paths(paths, **kwargs)]
+
+    return asyncio.run(_scan())
+
+
+def summary(results):
+    return sorted(
+        (
+            os.path.basename(result.path),  # noqa: PTH119
+            [(finding.line, finding.code) for finding in result.findings],
+            type(result.error).__name__,
+        )
+        for result in results
+    )
+
+
+_expected = [
+    ('a.py', [(3, 'SCS102')], 'NoneType'),
+    ('b.py', [], 'NoneType'),
+    ('c.py', [(3, 'SCS101')], 'NoneType'),
+    ('d.py', [], 'SyntaxError'),
+    ('missing.py', [], 'FileNotFoundError'),
+]
+
+
+# ==============================================================================
+
+
+@pytest.mark.parametrize('concurrency', [1, 3, 16])
+def test_scan_paths(files, concurrency):
+    assert summary(scan(files, concurrency=concurrency)) == _expected
+
+
+def test_scan_paths_policy(files):
+    policy = flake8_scs.ScanPolicy(codes=frozenset(('SCS101',)))
+    assert [findings for _, findings, _ in summary(scan(files[:3], policy=policy))] == [[], [], [(3, 'SCS101')]]
+
+    with pytest.raises(ValueError, match='Unknown error codes'):
+        scan(files, policy=flake8_scs.ScanPolicy(codes=frozenset(('SCS999',))))
+    with pytest.raises(ValueError, match='concurrency'):
+        scan(files, concurrency=0)
+
+
+def test_scan_paths_process_pool(files):
+    with concurrent.futures.ProcessPoolExecutor(2) as executor:
+        assert summary(scan(files, executor=executor)) == _expected
+
+
+def test_scan_paths_check_failure(files, mocker):
+    scan_file_content = flake8_scs._scan_file_content
+
+    def _scan_file_content(content, filename, policy):
+        if filename.endswith('a.py'):
+            raise RuntimeError(filename)
+        return scan_file_content(content, filename, policy)
+
+    mocker.patch.object(flake8_scs, '_scan_file_content', side_effect=_scan_file_content)
+    assert summary(scan(files)) == [('a.py', [], 'RuntimeError'), *_expected[1:]]
+
+
+def test_scan_paths_custom_read():
+    sources = {'slow.py': b'eval(x)\n', 'fast.py': b'exec(x)\n'}
+
+    async def read(path):
+        await asyncio.sleep(0.05 if path == 'slow.py' else 0)
+        return sources[path]
+
+    # NB: results are yielded as soon as each file is checked
+    assert [result.path for result in scan(['slow.py', 'fast.py'], concurrency=2, read=read)] == ['fast.py', 'slow.py']
+
+    async def fail(path):
+        await asyncio.sleep(0)
+        raise RuntimeError(path)
+
+    with pytest.raises(RuntimeError, match='slow.py'):
+        scan(['slow.py'], read=fail)
+
+
+def test_scan_paths_backpressure():
+    n_read = 0
+
+    async def read(_path):
+        nonlocal n_read
+        n_read += 1
+        await asyncio.sleep(0)
+        return b'eval(x)\n'
+
+    async def _scan():
+        results = flake8_scs.scan_paths((f'{idx}.py' for idx in range(1000)), concurrency=2, read=read)
+        await results.__anext__()
+        for _ in range(20):
+            await asyncio.sleep(0)
+        await results.aclose()
+
+    asyncio.run(_scan())
+    # NB: files are only read as long as the queues are not full (2 files in each queue plus the ones being processed)
+    assert n_read < 10
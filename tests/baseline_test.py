@@ -0,0 +1,195 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+import io
+
+import flake8_secure_coding_standard as flake8_scs
+
+import flake8
+import flake8.options.manager
+import pytest
+
+
+def create_options_manager():
+    ctor_args = {'version': '1.0', 'plugin_versions': '', 'parents': []}
+    if int(flake8.__version__[0]) >= 6:
+        ctor_args['formatter_names'] = []
+    return flake8.options.manager.OptionManager(**ctor_args)
+
+
+def run_file(path):
+    s = path.read_text()
+    plugin = flake8_scs.Plugin(ast.parse(s), s.splitlines(keepends=True), str(path))
+    return [(line, col, msg) for line, col, msg, _ in plugin.run()]
+
+
+def flake8_output(path):
+    # NB: default format of flake8 (1-based columns)
+    return [f'{path}:{line}:{col + 1}: {msg}\n' for line, col, msg in run_file(path)]
+
+
+@pytest.fixture()
+def configure_plugin(monkeypatch, tmp_path):
+    for name in ('rule_set', 'platform_profile'):
+        monkeypatch.setattr(flake8_scs.Visitor, name, getattr(flake8_scs.Visitor, name))
+    for name in ('path_rules', 'result_cache', 'diff_index', 'baseline', 'content_table'):
+        monkeypatch.setattr(flake8_scs.Plugin, name, getattr(flake8_scs.Plugin, name))
+    monkeypatch.chdir(tmp_path)
+
+    def _configure(*args):
+        options = create_options_manager()
+        flake8_scs.Plugin.add_options(options)
+        flake8_scs.Plugin.parse_options(options.parse_args(list(args)))
+
+    return _configure
+
+
+_code = """import subprocess as proc
+
+
+def f(x):
+    eval(x)
+    eval(x)
+    proc.run(x, shell=True)
+
+
+class A:
+    def method(self, y):
+        with open(y, 'w') as fd:
+            eval(y)
+"""
+
+
+def _write_baseline(path):
+    output = io.StringIO()
+    n_errors = flake8_scs._write_baseline(flake8_output(path), output)
+    (path.parent / 'baseline.txt').write_text(output.getvalue())
+    return n_errors
+
+
+# ==============================================================================
+
+
+def test_fingerprints_stable_when_code_moves(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / 'module.py'
+    path.write_text(_code)
+    errors = run_file(path)
+    fingerprints = flake8_scs._get_fingerprints(ast.parse(_code), str(path), errors)
+    assert len(set(fingerprints)) == len(fingerprints) - 1  # NB: the two eval(x) in f() are identical
+
+    moved = '\n\n# some comment\n' + _code.replace('eval(y)', 'eval(  y )')
+    path.write_text(moved)
+    moved_errors = run_file(path)
+    assert [line for line, _, _ in moved_errors] == [line + 3 for line, _, _ in errors]
+    assert flake8_scs._get_fingerprints(ast.parse(moved), str(path), moved_errors) == fingerprints
+
+
+@pytest.mark.parametrize(
+    ('before', 'after'),
+    [
+        ('eval(x)', 'exec(x)'),
+        ('proc.run(x, shell=True)', 'proc.call(x, shell=True)'),
+        ('proc.run(x, shell=True)', 'proc.run(y, shell=True)'),
+        ('def f(x):', 'def g(x):'),
+    ],
+)
+def test_fingerprints_change(tmp_path, monkeypatch, before, after):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / 'module.py'
+    fingerprints = []
+    for s in (_code, _code.replace(before, after)):
+        path.write_text(s)
+        errors = run_file(path)
+        fingerprints.append(set(flake8_scs._get_fingerprints(ast.parse(s), str(path), errors)))
+    assert fingerprints[0] != fingerprints[1]
+
+
+def test_fingerprints_depend_on_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    errors = [(1, 0, flake8_scs.SCS101)]
+    assert flake8_scs._get_fingerprints(ast.parse('eval(x)'), 'a.py', errors) != (
+        flake8_scs._get_fingerprints(ast.parse('eval(x)'), 'b.py', errors)
+    )
+    assert flake8_scs._get_fingerprints(ast.parse('eval(x)'), './a.py', errors) == (
+        flake8_scs._get_fingerprints(ast.parse('eval(x)'), str(tmp_path / 'a.py'), errors)
+    )
+
+
+def test_baseline_suppresses_known_errors(configure_plugin, tmp_path):
+    path = tmp_path / 'module.py'
+    path.write_text(_code)
+    assert _write_baseline(path) == 5
+
+    configure_plugin('--scs-baseline=baseline.txt')
+    assert len(flake8_scs.Plugin.baseline) == 5
+    assert run_file(path) == []
+
+    # NB: new errors are reported, including a third copy of a known one, while known errors that moved are not
+    path.write_text('import os\n\n' + _code.replace('    eval(x)\n', '    eval(x)\n    eval(x)\n    os.system(x)\n', 1))
+    assert sorted(msg.split(' ')[0] for _, _, msg in run_file(path)) == ['SCS101', 'SCS102']
+
+
+def test_baseline_does_not_apply_to_other_files(configure_plugin, tmp_path):
+    path = tmp_path / 'module.py'
+    path.write_text(_code)
+    _write_baseline(path)
+
+    configure_plugin('--scs-baseline=baseline.txt')
+    other = tmp_path / 'other.py'
+    other.write_text(_code)
+    assert len(run_file(other)) == 5
+
+
+def test_write_baseline_ignores_other_lines(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / 'module.py'
+    path.write_text('eval(x)\n')
+    output = io.StringIO()
+    flake8_lines = [
+        'module.py:1:1: E999 SyntaxError\n',
+        'module.py:1:1: SCS101 Avoid eval\n',
+        'missing.py:1:1: SCS101 Avoid eval\n',
+        'some other line\n',
+    ]
+    assert flake8_scs._write_baseline(flake8_lines, output) == 1
+    header, line = output.getvalue().splitlines()
+    assert header + '\n' == flake8_scs._BASELINE_HEADER
+    assert line.split(' ')[1:] == ['SCS101', 'module.py']
+
+
+@pytest.mark.parametrize(
+    ('content', 'match'),
+    [
+        (None, 'Unable to read'),
+        ('not a baseline\n', 'not a baseline file'),
+    ],
+)
+def test_baseline_invalid_file(configure_plugin, tmp_path, content, match):
+    if content is not None:
+        (tmp_path / 'baseline.txt').write_text(content)
+    with pytest.raises(ValueError, match=match):
+        configure_plugin('--scs-baseline=baseline.txt')
+
+
+def test_main_baseline(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / 'module.py'
+    path.write_text(_code)
+    (tmp_path / 'output.txt').write_text(''.join(flake8_output(path)))
+
+    assert flake8_scs.main(['baseline', 'output.txt', '-o', 'baseline.txt']) == 0
+    assert len(flake8_scs._Baseline.from_file('baseline.txt')) == 5
+    assert capsys.readouterr().err.endswith(': 5\n')
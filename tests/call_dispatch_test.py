@@ -0,0 +1,199 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+from itertools import starmap
+
+import flake8_secure_coding_standard as flake8_scs
+
+import pytest
+
+
+def results(s):
+    return set(starmap('{}:{}: {}'.format, flake8_scs.Plugin(ast.parse(s)).run()))
+
+
+@pytest.mark.parametrize(
+    ('s', 'expected'),
+    [
+        ('eval(x)', ('', 'eval')),
+        ('os.system(x)', ('os', 'system')),
+        ('os.path.abspath(x)', ('os.path', 'abspath')),
+        ('a.b.c.d(x)', ('a.b.c', 'd')),
+        ('foo().mktemp()', (None, 'mktemp')),
+        ('foo()()', (None, None)),
+        ('x[0](1)', (None, None)),
+    ],
+)
+def test_get_callee_parts(s, expected):
+    node = ast.parse(s).body[0].value
+    assert flake8_scs._get_callee_parts(node.func) == expected
+
+
+@pytest.mark.parametrize(
+    's',
+    [
+        'foo.bar()',
+        'foo.bar.system()',
+        'path.abspath(x)',
+        'foo().eval(x)',
+        'foo.Pdb()',
+        'foo.getoutput("ls")',
+        'foo.run(["ls"], shell=True)',
+    ],
+)
+def test_dispatch_no_match(s):
+    assert results(s) == set()
+
+
+def test_dispatch_first_match_only():
+    # NB: pdb.* calls are always reported as SCS107, even if the function name matches another rule
+    assert results('pdb.mktemp()') == {'1:0: ' + flake8_scs.SCS107}
+
+
+def test_dispatch_nested_calls():
+    assert results('eval(os.system(pickle.loads(x)))') == {
+        '1:0: ' + flake8_scs.SCS101,
+        '1:5: ' + flake8_scs.SCS102,
+        '1:15: ' + flake8_scs.SCS113,
+    }
+
+
+@pytest.mark.parametrize(
+    ('s', 'expected'),
+    [
+        ('eval(x)', ('', 'eval')),
+        ('run_cmd(x)', ('os', 'system')),
+        ('proc.run(x)', ('subprocess', 'run')),
+        ('osp.abspath(x)', ('os.path', 'abspath')),
+        ('np.linalg.norm(x)', ('numpy.linalg', 'norm')),
+        ('sp.run(x)', ('subprocess', 'run')),
+        ('op.abspath(x)', ('os.path', 'abspath')),
+        ('foo().run(x)', (None, 'run')),
+    ],
+)
+def test_resolve_callee(s, expected):
+    aliases = {
+        **flake8_scs._DEFAULT_ALIASES,
+        'run_cmd': 'os.system',
+        'proc': 'subprocess',
+        'osp': 'os.path',
+        'np': 'numpy',
+    }
+    node = ast.parse(s).body[0].value
+    assert flake8_scs._resolve_callee(node.func, aliases) == expected
+
+
+@pytest.mark.parametrize(
+    ('s', 'expected'),
+    [
+        ('import subprocess as proc\nproc.run(x, shell=True)', {'2:0: ' + flake8_scs.SCS103}),
+        ('import subprocess as proc\nproc.run(x, shell=False)', set()),
+        ('from subprocess import run as r\nr(x, shell=True)', {'2:0: ' + flake8_scs.SCS103}),
+        ('from os import system as run_cmd\nrun_cmd(x)', {'1:0: ' + flake8_scs.SCS102, '2:0: ' + flake8_scs.SCS102}),
+        ('import os.path as osp\nosp.abspath(x)', {'2:0: ' + flake8_scs.SCS100}),
+        ('import os as o\no.path.relpath(x)', {'2:0: ' + flake8_scs.SCS100}),
+        ('import pickle as pkl\npkl.loads(x)', {'2:0: ' + flake8_scs.SCS113}),
+        ('import pdb as dbg\ndbg.set_trace()', {'1:0: ' + flake8_scs.SCS107, '2:0: ' + flake8_scs.SCS107}),
+        ('import yaml as yml\nyml.load(x)', {'2:0: ' + flake8_scs.SCS105}),
+        ('from builtins import eval as ev\nev(x)', set()),
+        ('from os import open\nopen("file.txt", "w")', set()),
+        ('import shelve as sh\nwith sh.open("db") as db:\n    pass', {'2:0: ' + flake8_scs.SCS115}),
+        # NB: an import shadows the conventional aliases
+        ('import sparse as sp\nsp.run(x, shell=True)', set()),
+        ('from foo import sp\nsp.run(x, shell=True)', set()),
+        ('from . import sp\nsp.run(x, shell=True)', set()),
+        ('import sp\nsp.run(x, shell=True)', set()),
+        # NB: imports only apply to the code that follows them
+        ('proc.run(x, shell=True)\nimport subprocess as proc', set()),
+        # NB: imports within functions and classes only apply within them
+        ('def f():\n    import subprocess as proc\n    proc.run(x, shell=True)', {'3:4: ' + flake8_scs.SCS103}),
+        ('def f():\n    import subprocess as proc\ndef g():\n    proc.run(x, shell=True)', set()),
+        ('class A:\n    import subprocess as proc\nproc.run(x, shell=True)', set()),
+        ('if x:\n    import subprocess as proc\nproc.run(x, shell=True)', {'3:0: ' + flake8_scs.SCS103}),
+    ],
+)
+def test_dispatch_with_aliases(s, expected):
+    assert results(s) == expected
+
+
+def test_compile_rule_index():
+    rules = (
+        flake8_scs._Rule('pdb.*', flake8_scs.SCS107, (flake8_scs._CALL, flake8_scs._IMPORT)),
+        flake8_scs._Rule('*.mktemp', flake8_scs.SCS104),
+        flake8_scs._Rule('os.open', flake8_scs.SCS112, (flake8_scs._CALL, flake8_scs._WITH)),
+        flake8_scs._Rule('open', flake8_scs.SCS109, (flake8_scs._CALL, flake8_scs._WITH)),
+    )
+
+    call_rules = flake8_scs._compile_rule_index(rules, flake8_scs._CALL)
+    assert call_rules.modules == {'pdb': flake8_scs._CallRule(flake8_scs.SCS107, None, None, None)}
+    assert set(call_rules.names) == {'mktemp', 'open'}
+    assert [rule.prefix for rule in call_rules.names['mktemp']] == [None]
+    assert [rule.prefix for rule in call_rules.names['open']] == ['os', '']
+
+    with_rules = flake8_scs._compile_rule_index(rules, flake8_scs._WITH)
+    assert not with_rules.modules
+    assert set(with_rules.names) == {'open'}
+
+    import_rules = flake8_scs._compile_rule_index(rules, flake8_scs._IMPORT)
+    assert set(import_rules.modules) == {'pdb'}
+    assert not import_rules.names
+
+
+def test_rule_table_drives_all_forms(monkeypatch):
+    monkeypatch.setattr(
+        flake8_scs,
+        '_RULES',
+        (flake8_scs._Rule('foo.bar', flake8_scs.SCS101, (flake8_scs._CALL, flake8_scs._WITH, flake8_scs._IMPORT)),),
+    )
+    rule_set = flake8_scs._compile_rule_set.__wrapped__(frozenset({'SCS101'}))
+    assert {ast.Call, ast.With, ast.Import, ast.ImportFrom} <= rule_set.node_types
+    assert rule_set.keywords_re.search('x = bar')
+
+    visitor = flake8_scs.Visitor(rule_set)
+    visitor.visit(ast.parse('from foo import bar\nfoo.bar()\nwith foo.bar() as x:\n    eval(x)\n'))
+    assert visitor.errors == [(1, 0, flake8_scs.SCS101), (2, 0, flake8_scs.SCS101), (3, 0, flake8_scs.SCS101)]
+
+
+def test_update_statement_aliases():
+    tree = ast.parse(
+        'import a as b\nif x:\n    import c as d\ndef f():\n    import e as f\nclass A:\n    import g as h'
+    )
+    aliases = {}
+    for node in tree.body:
+        flake8_scs._update_statement_aliases(aliases, node)
+    assert aliases == {'b': 'a', 'd': 'c'}
+
+
+def test_class_aliases_units_and_chunks(monkeypatch):
+    monkeypatch.setattr(flake8_scs.Visitor, 'min_split_lines', 4)
+    s = (
+        'class A:\n    import subprocess as proc\n'
+        + '    x = 1\n' * 4
+        + '    proc.run(x, shell=True)\nproc.run(x, shell=True)\n'
+    )
+    lines = s.splitlines(keepends=True)
+    expected = [(7, 4, flake8_scs.SCS103)]
+
+    visitor = flake8_scs.Visitor(flake8_scs._ALL_RULES)
+    visitor.visit(ast.parse(s))
+    assert visitor.errors == expected
+
+    visitor = flake8_scs.Visitor(flake8_scs._ALL_RULES)
+    visitor.visit_units(ast.parse(s).body, lines, {}, {})
+    assert visitor.errors == expected
+
+    visitor = flake8_scs.Visitor(flake8_scs._ALL_RULES)
+    visitor.visit_chunks(lines, {}, {})
+    assert visitor.errors == expected
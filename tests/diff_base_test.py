@@ -0,0 +1,160 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+import shutil
+import subprocess  # noqa: S404
+
+import flake8_secure_coding_standard as flake8_scs
+
+import flake8
+import flake8.options.manager
+import pytest
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git is not available')
+
+
+def create_options_manager():
+    ctor_args = {'version': '1.0', 'plugin_versions': '', 'parents': []}
+    if int(flake8.__version__[0]) >= 6:
+        ctor_args['formatter_names'] = []
+    return flake8.options.manager.OptionManager(**ctor_args)
+
+
+def git(repo, *args):
+    subprocess.run(
+        ['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],  # noqa: S607
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+def run_file(path):
+    s = path.read_text()
+    plugin = flake8_scs.Plugin(ast.parse(s), s.splitlines(keepends=True), str(path))
+    return sorted((line, msg.split(' ')[0]) for line, _, msg, _ in plugin.run())
+
+
+@pytest.fixture()
+def repo(tmp_path, monkeypatch):
+    for name in ('rule_set', 'platform_profile'):
+        monkeypatch.setattr(flake8_scs.Visitor, name, getattr(flake8_scs.Visitor, name))
+    for name in ('path_rules', 'result_cache', 'diff_index', 'content_table'):
+        monkeypatch.setattr(flake8_scs.Plugin, name, getattr(flake8_scs.Plugin, name))
+
+    git(tmp_path, 'init', '-q')
+    (tmp_path / 'changed.py').write_text(
+        'import subprocess as proc\n\n\ndef f(x):\n    eval(x)\n\n\ndef g(x):\n    return x\n\n\nassert f\n'
+    )
+    (tmp_path / 'unchanged.py').write_text('eval(x)\n')
+    git(tmp_path, 'add', '.')
+    git(tmp_path, 'commit', '-q', '-m', 'initial')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def configure_plugin(*args):
+    options = create_options_manager()
+    flake8_scs.Plugin.add_options(options)
+    flake8_scs.Plugin.parse_options(options.parse_args(list(args)))
+
+
+# ==============================================================================
+
+
+@pytest.mark.parametrize(
+    ('intervals', 'start', 'end', 'expected'),
+    [
+        ([], 1, 10, False),
+        ([(3, 5)], 1, 2, False),
+        ([(3, 5)], 1, 3, True),
+        ([(3, 5)], 5, 8, True),
+        ([(3, 5)], 6, 8, False),
+        ([(3, 5)], 4, 4, True),
+        ([(10, 12), (3, 5)], 6, 9, False),
+        ([(10, 12), (3, 5)], 6, 10, True),
+        ([(1, 2), (2, 8), (5, 6)], 7, 7, True),
+    ],
+)
+def test_line_intervals(intervals, start, end, expected):
+    assert flake8_scs._LineIntervals(intervals).overlaps(start, end) == expected
+
+
+def test_line_intervals_merged():
+    intervals = flake8_scs._LineIntervals([(5, 6), (1, 2), (3, 3), (10, 12), (11, 11)])
+    assert (intervals.starts, intervals.ends) == ([1, 5, 10], [3, 6, 12])
+
+
+@pytest.mark.parametrize(
+    ('path', 'expected'),
+    [
+        ('b/src/module.py', 'src/module.py'),
+        ('/dev/null', None),
+        ('"b/src/tab\\there.py"', 'src/tab\there.py'),
+        ('"b/caf\\303\\251.py"', 'café.py'),
+    ],
+)
+def test_unquote_git_path(path, expected):
+    assert flake8_scs._unquote_git_path(path) == expected
+
+
+def test_diff_index(repo):
+    (repo / 'changed.py').write_text(
+        'import subprocess as proc\n\n\ndef f(x):\n    eval(x)\n\n\ndef g(x):\n    return proc.run(x, shell=True)\n\n\n'
+        'assert f\n'
+    )
+    (repo / 'new.py').write_text('eval(x)\n')
+
+    index = flake8_scs._DiffIndex.from_git('HEAD')
+    changed_lines = index.changed_lines('changed.py')
+    assert (changed_lines.starts, changed_lines.ends) == ([9], [9])
+    assert index.changed_lines(str(repo / 'new.py')) is flake8_scs._ALL_LINES
+    assert index.changed_lines('unchanged.py') is None
+
+
+def test_diff_base_only_checks_changed_statements(repo):
+    (repo / 'changed.py').write_text(
+        'import subprocess as proc\n\n\ndef f(x):\n    eval(x)\n\n\ndef g(x):\n    return proc.run(x, shell=True)\n\n\n'
+        'assert f\n'
+    )
+    (repo / 'new.py').write_text('eval(x)\n')
+
+    configure_plugin()
+    assert run_file(repo / 'changed.py') == [(5, 'SCS101'), (9, 'SCS103'), (12, 'SCS108')]
+
+    configure_plugin('--scs-diff-base=HEAD')
+    # NB: the import alias defined by an unchanged statement is still resolved
+    assert run_file(repo / 'changed.py') == [(9, 'SCS103')]
+    assert run_file(repo / 'new.py') == [(1, 'SCS101')]
+    assert run_file(repo / 'unchanged.py') == []
+
+
+def test_diff_base_deleted_lines(repo):
+    (repo / 'changed.py').write_text('import subprocess as proc\n\n\ndef f(x):\n    eval(x)\n\n\nassert f\n')
+
+    configure_plugin('--scs-diff-base=HEAD')
+    assert run_file(repo / 'changed.py') == [(8, 'SCS108')]
+
+
+@pytest.mark.usefixtures('repo')
+def test_diff_base_invalid_ref():
+    with pytest.raises(ValueError, match='failed'):
+        configure_plugin('--scs-diff-base=does-not-exist')
+
+
+def test_diff_base_not_a_repository(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError, match='failed'):
+        flake8_scs._DiffIndex.from_git('HEAD')
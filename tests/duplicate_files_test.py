@@ -0,0 +1,122 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+import io
+from itertools import starmap
+
+import flake8_secure_coding_standard as flake8_scs
+
+import flake8
+import flake8.options.manager
+import pytest
+
+
+def create_options_manager():
+    ctor_args = {'version': '1.0', 'plugin_versions': '', 'parents': []}
+    if int(flake8.__version__[0]) >= 6:
+        ctor_args['formatter_names'] = []
+    return flake8.options.manager.OptionManager(**ctor_args)
+
+
+def results(s, filename='module.py'):
+    plugin = flake8_scs.Plugin(ast.parse(s), s.splitlines(keepends=True), filename)
+    return set(starmap('{}:{}: {}'.format, plugin.run()))
+
+
+@pytest.fixture()
+def configure_plugin(monkeypatch):
+    for name in ('rule_set', 'platform_profile'):
+        monkeypatch.setattr(flake8_scs.Visitor, name, getattr(flake8_scs.Visitor, name))
+    for name in ('path_rules', 'result_cache', 'content_table', 'print_stats'):
+        monkeypatch.setattr(flake8_scs.Plugin, name, getattr(flake8_scs.Plugin, name))
+
+    def _configure(*args):
+        options = create_options_manager()
+        flake8_scs.Plugin.add_options(options)
+        flake8_scs.Plugin.parse_options(options.parse_args(list(args)))
+        return flake8_scs.Plugin.content_table
+
+    yield _configure
+    flake8_scs.atexit.unregister(flake8_scs.Plugin.report_stats)
+
+
+_code = 'import subprocess\n\nassert x\neval(y)\nsubprocess.run(cmd, shell=True)\n'
+
+
+# ==============================================================================
+
+
+def test_identical_files_checked_once(configure_plugin, mocker):
+    table = configure_plugin()
+    expected = results(_code, 'vendor/a/module.py')
+    assert len(expected) == 3
+
+    visit = mocker.patch.object(flake8_scs.Visitor, 'visit')
+    assert results(_code, 'vendor/b/module.py') == expected
+    assert results(_code, 'stubs/module.py') == expected
+    visit.assert_not_called()
+    assert (table.hits, table.misses, len(table)) == (2, 1, 1)
+    assert table.saved_bytes == 2 * len(_code)
+
+
+def test_different_files_checked(configure_plugin):
+    table = configure_plugin()
+    assert results(_code) != results('\n' + _code)
+    assert (table.hits, table.misses, len(table)) == (0, 2, 2)
+
+
+def test_identical_files_with_different_rules(configure_plugin):
+    table = configure_plugin('--scs-per-path-rules=tests/*:SCS108')
+    assert len(results(_code, 'src/module.py')) == 3
+    assert len(results(_code, 'tests/module.py')) == 2
+    assert len(results(_code, 'src/other.py')) == 3
+    assert (table.hits, table.misses, len(table)) == (1, 2, 2)
+
+
+def test_identical_files_across_processes(configure_plugin, tmp_path, mocker):
+    configure_plugin(f'--scs-cache-dir={tmp_path}')
+    expected = results(_code, 'a.py')
+
+    # NB: a new content table behaves like another worker process sharing the same cache directory
+    table = configure_plugin(f'--scs-cache-dir={tmp_path}')
+    visit = mocker.patch.object(flake8_scs.Visitor, 'visit')
+    assert results(_code, 'b.py') == expected
+    visit.assert_not_called()
+    assert (table.misses, flake8_scs.Plugin.result_cache.hits) == (1, 1)
+    assert results(_code, 'c.py') == expected
+    assert (table.hits, flake8_scs.Plugin.result_cache.hits) == (1, 1)
+
+
+def test_report_stats(configure_plugin):
+    configure_plugin('--scs-stats')
+    assert flake8_scs.Plugin.print_stats
+
+    output = io.StringIO()
+    flake8_scs.Plugin.report_stats(output)
+    assert not output.getvalue()
+
+    for filename in ('a.py', 'b.py', 'c.py'):
+        results(_code, filename)
+    flake8_scs.Plugin.report_stats(output)
+    assert '3 files, 2 duplicates not checked again' in output.getvalue()
+    assert 'result cache' not in output.getvalue()
+
+
+def test_report_stats_with_cache(configure_plugin, tmp_path):
+    configure_plugin('--scs-stats', f'--scs-cache-dir={tmp_path}')
+    results(_code)
+    output = io.StringIO()
+    flake8_scs.Plugin.report_stats(output)
+    assert 'result cache: 0 hits, 1 misses' in output.getvalue()
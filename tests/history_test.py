@@ -0,0 +1,212 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import json
+import shutil
+import subprocess  # noqa: S404
+
+import flake8_secure_coding_standard as flake8_scs
+
+import pytest
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git is not available')
+
+
+def git(repo, *args):
+    return subprocess.run(
+        ['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],  # noqa: S607
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        encoding='utf-8',
+    ).stdout.strip()
+
+
+def commit(repo, files, message='commit'):
+    for name, content in files.items():
+        path = repo / name
+        if content is None:
+            path.unlink()
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+    git(repo, 'add', '-A')
+    git(repo, 'commit', '-q', '--allow-empty', '-m', message)
+    return git(repo, 'rev-parse', 'HEAD')
+
+
+@pytest.fixture()
+def repo(tmp_path, monkeypatch):
+    monkeypatch.delenv(flake8_scs._SharedTable.env_var, raising=False)
+    for name in ('rule_set', 'platform_profile'):
+        monkeypatch.setattr(flake8_scs.Visitor, name, getattr(flake8_scs.Visitor, name))
+    for name in ('path_rules', 'result_cache', 'diff_index', 'baseline', 'print_stats'):
+        monkeypatch.setattr(flake8_scs.Plugin, name, getattr(flake8_scs.Plugin, name))
+    monkeypatch.setattr(flake8_scs.Plugin, 'content_table', None)
+
+    git(tmp_path, 'init', '-q')
+    monkeypatch.chdir(tmp_path)
+
+    yield tmp_path
+
+    flake8_scs.atexit.unregister(flake8_scs.Plugin.report_stats)
+    if flake8_scs.Plugin.content_table is not None and flake8_scs.Plugin.content_table.shared is not None:
+        flake8_scs.Plugin.content_table.shared.close()
+
+
+def scan(revision='HEAD', paths=()):
+    output = io.StringIO()
+    scanner = flake8_scs._scan_history(revision, list(paths), output, json_output=True)
+    return [json.loads(line) for line in output.getvalue().splitlines()], scanner
+
+
+def summary(findings):
+    return [
+        (finding['path'], finding['line'], finding['msg'].split(' ')[0], finding['first_seen'], finding['last_seen'])
+        for finding in findings
+    ]
+
+
+# ==============================================================================
+
+
+@pytest.mark.parametrize('hash_size', [20, 32])
+def test_parse_git_tree(hash_size):
+    sha = bytes(range(hash_size))
+    content = b'100644 a.py\0' + sha + b'40000 sub dir\0' + sha[::-1]
+    assert flake8_scs._parse_git_tree(content, hash_size) == {
+        'a.py': (b'100644', sha.hex()),
+        'sub dir': (b'40000', sha[::-1].hex()),
+    }
+
+
+def test_cat_file(repo):
+    head = commit(repo, {'a.py': 'x = 1\n'})
+    with flake8_scs._GitCatFile(repo) as cat_file:
+        assert cat_file.read(f'{head}:a.py') == ('blob', b'x = 1\n')
+        assert cat_file.read(head)[0] == 'commit'
+        assert cat_file.read('HEAD:missing.py') is None
+        assert cat_file.read(':a.py') == ('blob', b'x = 1\n')
+        assert cat_file.n_objects == 3
+        # NB: the name of a missing object is echoed by git, followed by `missing`
+        assert cat_file.read(':my file.py') is None
+        assert cat_file.read('HEAD:a b c.py') is None
+        assert cat_file.hash_size == 20
+
+
+def test_sha256_repository(repo, monkeypatch):
+    sub = repo / 'sub'
+    sub.mkdir()
+    try:
+        git(sub, 'init', '-q', '--object-format=sha256')
+    except subprocess.CalledProcessError:
+        pytest.skip('SHA-256 repositories are not supported by git')
+    monkeypatch.chdir(sub)
+    c1 = commit(sub, {'src/a.py': 'eval(x)\n', 'b.py': 'x = 1\n'})
+    c2 = commit(sub, {'src/c.py': 'exec(x)\n'})
+    assert len(c1) == 64
+
+    findings, _ = scan()
+    assert summary(findings) == [('src/a.py', 1, 'SCS101', c1, c2), ('src/c.py', 1, 'SCS101', c2, c2)]
+
+
+def test_first_and_last_seen(repo):
+    c1 = commit(repo, {'a.py': 'import os\n\nos.system(x)\n', 'src/b.py': 'x = 1\n', 'README': 'eval(x)\n'})
+    c2 = commit(repo, {'src/b.py': 'import pickle\n\npickle.loads(x)\n'})
+    # NB: errors that only moved are the same errors
+    c3 = commit(repo, {'a.py': '"""Docstring."""\n\nimport os\n\n\nos.system(x)\n'})
+    c4 = commit(repo, {'src/b.py': 'x = 2\n'})
+    c5 = commit(repo, {'src/c.py': 'eval(x)\n'})
+
+    findings, scanner = scan()
+    assert summary(findings) == [
+        ('a.py', 6, 'SCS102', c1, c5),
+        ('src/b.py', 3, 'SCS113', c2, c3),
+        ('src/c.py', 1, 'SCS101', c5, c5),
+    ]
+    assert [finding['present'] for finding in findings] == [True, False, True]
+    assert scanner.n_commits == 5
+    assert c4 not in {finding['first_seen'] for finding in findings}
+
+
+def test_blobs_checked_once(repo, mocker):
+    content = 'import os\n\nos.system(x)\n'
+    c1 = commit(repo, {'a.py': content})
+    commit(repo, {'a.py': 'x = 1\n'})
+    c3 = commit(repo, {'a.py': content, 'b.py': content})
+    c4 = commit(repo, {'c.txt': 'text\n'})
+
+    visit = mocker.spy(flake8_scs.Visitor, 'visit')
+    findings, scanner = scan()
+    assert scanner.n_blobs == 2
+    assert visit.call_count == 1
+    # NB: errors that were removed and added back keep their first commit
+    assert summary(findings) == [('a.py', 3, 'SCS102', c1, c4), ('b.py', 3, 'SCS102', c3, c4)]
+
+
+def test_check_failure(repo, mocker, capsys):
+    c1 = commit(repo, {'a.py': 'eval(x)\n', 'b.py': 'exec(x)\n'})
+    c2 = commit(repo, {'a.py': 'eval(y)\n'})
+    mocker.patch.object(flake8_scs, '_get_fingerprints', side_effect=[RuntimeError('oops'), ['b'], ['a']])
+    findings, scanner = scan()
+    assert summary(findings) == [('a.py', 1, 'SCS101', c2, c2), ('b.py', 1, 'SCS101', c1, c2)]
+    assert scanner.n_blobs == 3
+    err = capsys.readouterr().err
+    assert err.startswith('a.py (')
+    assert err.endswith("): unexpected error while checking the file: RuntimeError('oops')\n")
+
+
+def test_identical_errors(repo):
+    c1 = commit(repo, {'a.py': 'eval(x)\n'})
+    c2 = commit(repo, {'a.py': 'eval(x)\neval(x)\n'})
+    c3 = commit(repo, {'a.py': 'eval(x)\n'})
+    findings, _ = scan()
+    assert summary(findings) == [('a.py', 1, 'SCS101', c1, c3), ('a.py', 2, 'SCS101', c2, c2)]
+
+
+def test_paths_and_revision(repo):
+    commit(repo, {'a.py': 'eval(x)\n', 'src/b.py': 'eval(x)\n', 'src2/c.py': 'eval(x)\n'})
+    c2 = commit(repo, {'src/d.py': 'exec(x)\n'})
+
+    findings, _ = scan(paths=['src'])
+    assert [finding['path'] for finding in findings] == ['src/b.py', 'src/d.py']
+
+    findings, scanner = scan(revision='HEAD~1..HEAD')
+    assert scanner.n_commits == 1
+    # NB: the first commit of a range is compared to an empty tree
+    assert {finding['first_seen'] for finding in findings} == {c2}
+
+
+def test_noqa_and_configuration(repo):
+    (repo / 'setup.cfg').write_text('[flake8]\nextend-ignore = SCS102\n')
+    commit(repo, {'a.py': 'import os\nos.system(x)\neval(x)  # noqa\nexec(x)\n'})
+    findings, _ = scan()
+    assert summary(findings)[0][:3] == ('a.py', 4, 'SCS101')
+    assert len(findings) == 1
+
+
+def test_main(repo, capsys):
+    head = commit(repo, {'a.py': 'eval(x)\n'})
+    commit(repo, {'a.py': 'x = 1\n'})
+    assert flake8_scs.main(['history']) == 0
+    out, err = capsys.readouterr()
+    assert out == (
+        'a.py:1:1: SCS101 `eval()` and `exec()` represent a security risk and should be avoided '
+        f'(first seen in {head[:12]}, last seen in {head[:12]})\n'
+    )
+    assert err == 'Number of commits scanned: 2 (2 distinct files checked)\n'
+
+    with pytest.raises(SystemExit):
+        flake8_scs.main(['history', '--revision', 'unknown'])
@@ -0,0 +1,425 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+import io
+import os
+import threading
+
+import flake8_secure_coding_standard as flake8_scs
+
+import pytest
+
+
+@pytest.fixture()
+def workspace(monkeypatch, tmp_path):
+    monkeypatch.delenv(flake8_scs._SharedTable.env_var, raising=False)
+    for name in ('rule_set', 'platform_profile'):
+        monkeypatch.setattr(flake8_scs.Visitor, name, getattr(flake8_scs.Visitor, name))
+    for name in ('path_rules', 'result_cache', 'diff_index', 'baseline', 'print_stats'):
+        monkeypatch.setattr(flake8_scs.Plugin, name, getattr(flake8_scs.Plugin, name))
+    monkeypatch.setattr(flake8_scs.Plugin, 'content_table', None)
+    monkeypatch.chdir(tmp_path)
+
+    yield tmp_path
+
+    flake8_scs.atexit.unregister(flake8_scs.Plugin.report_stats)
+    if flake8_scs.Plugin.content_table is not None and flake8_scs.Plugin.content_table.shared is not None:
+        flake8_scs.Plugin.content_table.shared.close()
+
+
+def visit_chunks(source, units=None):
+    visitor = flake8_scs.Visitor(flake8_scs._ALL_RULES)
+    new_units = {}
+    assert visitor.visit_chunks(flake8_scs._split_lines(source), units or {}, new_units)
+    return sorted(visitor.errors), new_units
+
+
+def visit(source):
+    visitor = flake8_scs.Visitor(flake8_scs._ALL_RULES)
+    visitor.visit(ast.parse(source))
+    return sorted(visitor.errors)
+
+
+_sources = [
+    'import os\nos.system(x)\n\ndef f():\n    eval(x)\n',
+    'import subprocess as sp\n\n@deco(eval(x))\ndef f():\n    pass\n\nsp.call(x, shell=True)\n',
+    'def f():\n    s = """\neval(x)\nexec(y)\n"""\n    return s\n\neval(z)\n',
+    "x = '''\\\n# eval(x)\nimport os as eval\n'''\nos.system(x)\neval(y)\n",
+    'x = [\n1,\n]\neval(x)\nif x:\n    exec(x)\nelse:\n    eval(y)\n',
+    'try:\n    import yaml\nexcept ImportError:\n    yaml = None\nyaml.load(x)\n',
+]
+
+
+_class_source = (
+    'import os\n\n'
+    '@decorator(eval(x))\n'
+    'class A(Base, metaclass=exec(y)):\n'
+    '    """Docstring.\n\nos.system(x)\n"""\n\n'
+    '    import pickle as p\n\n'
+    '    def f(self):\n'
+    '        os.system(x)\n\n'
+    '    class B:\n'
+    '        def g(self):\n'
+    '            return p.loads(x)\n\n'
+    '        x = eval(y)\n\n'
+    '    # comment\n'
+    '    def h(self):\n'
+    '        return [\n'
+    '    1,\n'
+    '        ]\n\n'
+    'os.system(p)\n'
+)
+
+
+@pytest.mark.parametrize('source', [*_sources, _class_source])
+def test_visit_chunks(source):
+    assert visit_chunks(source)[0] == visit(source)
+
+
+@pytest.mark.parametrize('min_split_lines', [1, 3, 8])
+def test_visit_chunks_split_classes(monkeypatch, min_split_lines):
+    _, units = visit_chunks(_class_source)
+    monkeypatch.setattr(flake8_scs.Visitor, 'min_split_lines', min_split_lines)
+    errors, split_units = visit_chunks(_class_source)
+    assert errors == visit(_class_source)
+    assert len(split_units) > len(units)
+
+
+def test_visit_chunks_long_statement(mocker):
+    items = ''.join(f'{idx},\n' for idx in range(2 * flake8_scs.Visitor.max_merged_chunks))
+    source = f'import os\nx = [\n{items}]\neval(x)\ny = f(\nos.system(z),\n{items})\n\ndef g():\n    exec(x)\n'
+    errors, _ = visit_chunks(source)
+    assert errors == visit(source)
+    assert len(errors) == 3
+
+    # NB: the rest of the block and the whole source code are parsed once, even if they contain a syntax error
+    parse = mocker.spy(flake8_scs.ast, 'parse')
+    visit_chunks(f'import os\nx = [\n{items}]\neval(x)\nos.system(\n')
+    n_lines = [call.args[0].count('\n') for call in parse.call_args_list]
+    assert sum(n > flake8_scs.Visitor.max_merged_chunks + 1 for n in n_lines) == 2
+
+
+_string_class_sources = [
+    # NB: raw string continued after a backslash, followed by a triple-quoted string
+    'class A:\n'
+    '    def f(self):\n'
+    '        check(r\'"a\\\n'
+    'de"\', """\\\n'
+    '    STRING\n'
+    '    """)\n'
+    '        eval(x)\n\n'
+    '    def g(self):\n'
+    '        exec(y)\n',
+    # NB: triple-quoted string starting a line within brackets, without indentation
+    'class A:\n'
+    '    def f(self):\n'
+    '        check(x,\n'
+    '"""\\\n'
+    'text\n'
+    '""")\n'
+    '        eval(x)\n\n'
+    '    def g(self):\n'
+    '        exec(y)\n\n'
+    'eval(z)\n',
+]
+
+
+@pytest.mark.parametrize('source', _string_class_sources)
+def test_visit_chunks_strings_in_large_class(monkeypatch, source):
+    monkeypatch.setattr(flake8_scs.Visitor, 'min_split_lines', 3)
+    errors, _ = visit_chunks(source)
+    assert errors == visit(source)
+    assert len(errors) == source.count('eval(') + source.count('exec(')
+
+
+def test_visit_chunks_syntax_error():
+    errors, _ = visit_chunks('import os\neval(x)\n\ndef f(:\n    exec(y)\n\nos.system(z)\n')
+    assert [line for line, _, _ in errors] == [2, 7]
+
+
+def test_visit_chunks_reuses_units(mocker):
+    source = 'import os\n\ndef f():\n    os.system(x)\n\ndef g():\n    eval(y)\n'
+    errors, units = visit_chunks(source)
+
+    parse = mocker.spy(flake8_scs.ast, 'parse')
+    new_errors, new_units = visit_chunks('"""Docstring."""\n' + source, units)
+    assert new_errors == [(line + 1, col, msg) for line, col, msg in errors]
+    assert parse.call_count == 1
+    assert len(new_units) == len(units) + 1
+
+    # NB: chunks following a new import statement are checked again
+    parse.reset_mock()
+    visit_chunks(source.replace('import os', 'import os as system'), units)
+    assert parse.call_count == 3
+
+
+def test_visit_chunks_cancelled():
+    visitor = flake8_scs.Visitor(flake8_scs._ALL_RULES)
+    new_units = {}
+    assert not visitor.visit_chunks(['eval(x)\n', 'exec(y)\n'], {}, new_units, cancelled=lambda: len(new_units) == 1)
+    assert len(new_units) == 1
+
+
+# ==============================================================================
+
+
+@pytest.mark.parametrize(
+    ('text', 'change', 'expected'),
+    [
+        ('a\nb\n', {'text': 'c\n'}, 'c\n'),
+        ('abc\ndef\n', {'range': {'start': {'line': 0, 'character': 1}, 'end': {'line': 1, 'character': 2}}}, 'abf\n'),
+        ('a\n', {'range': {'start': {'line': 1, 'character': 0}, 'end': {'line': 1, 'character': 0}}}, 'a\nb'),
+        ('a\n', {'range': {'start': {'line': 0, 'character': 9}, 'end': {'line': 0, 'character': 9}}}, 'ab\n'),
+        (
+            '\U0001f600x\n',
+            {'range': {'start': {'line': 0, 'character': 2}, 'end': {'line': 0, 'character': 3}}},
+            '\U0001f600b\n',
+        ),
+        (
+            'a\r\nc\r\n',
+            {'range': {'start': {'line': 0, 'character': 1}, 'end': {'line': 1, 'character': 0}}},
+            'abc\r\n',
+        ),
+        ('a\rc\n', {'range': {'start': {'line': 0, 'character': 1}, 'end': {'line': 0, 'character': 1}}}, 'ab\rc\n'),
+        (
+            'a\r\nc\n',
+            {'range': {'start': {'line': 1, 'character': 0}, 'end': {'line': 1, 'character': 0}}},
+            'a\r\nbc\n',
+        ),
+    ],
+)
+def test_apply_change(text, change, expected):
+    document = flake8_scs._TextDocument('untitled:1', text)
+    document.apply_change({'text': 'b', **change})
+    assert ''.join(document.lines) == expected
+    assert document.lines == flake8_scs._split_lines(expected)
+
+
+def test_apply_change_line_breaks():
+    document = flake8_scs._TextDocument('untitled:1', 'a\rb\n')
+    assert document.lines == ['a\r', 'b\n']
+    document.apply_change({
+        'range': {'start': {'line': 1, 'character': 0}, 'end': {'line': 1, 'character': 1}},
+        'text': '',
+    })
+    assert document.lines == ['a\r\n']
+
+
+def test_check(workspace):
+    document = flake8_scs._TextDocument((workspace / 'a.py').as_uri(), 'import os\nos.system(x)  # noqa\neval(y)\n')
+    assert document.filename == str(workspace / 'a.py')
+    assert document.check() == [(3, 0, flake8_scs.SCS101)]
+    assert document.check(cancelled=lambda: True) is None
+
+    document.apply_change({'text': 'x = 1\n'})
+    assert document.check() == []
+
+
+def test_get_diagnostics():
+    document = flake8_scs._TextDocument('untitled:1', 'x = "\U0001f600é"; eval(x)\n')
+    col = len('x = "\U0001f600é"; '.encode())
+    assert document.get_diagnostics([(1, col, flake8_scs.SCS101)]) == [
+        {
+            'range': {'start': {'line': 0, 'character': 11}, 'end': {'line': 0, 'character': 18}},
+            'severity': 2,
+            'code': 'SCS101',
+            'source': 'flake8-secure-coding-standard',
+            'message': flake8_scs.SCS101.split(' ', 1)[1],
+        }
+    ]
+
+
+@pytest.mark.usefixtures('workspace')
+def test_check_pending_failure(mocker):
+    output = io.BytesIO()
+    server = flake8_scs._LanguageServer(output)
+    for uri in ('untitled:1', 'untitled:2'):
+        server.handle({
+            'method': 'textDocument/didOpen',
+            'params': {'textDocument': {'uri': uri, 'languageId': 'python', 'version': 1, 'text': 'eval(x)\n'}},
+        })
+    mocker.patch.object(flake8_scs.Visitor, 'visit_chunks', side_effect=[RuntimeError('oops'), True])
+    server.check_pending()
+    assert server.get_timeout() is None
+
+    output.seek(0)
+    messages = [flake8_scs._read_lsp_message(output) for _ in range(2)]
+    assert messages[0]['method'] == 'window/logMessage'
+    assert messages[0]['params']['message'] == "Unexpected error while checking untitled:1: RuntimeError('oops')"
+    assert messages[1]['params'] == {'uri': 'untitled:2', 'version': 1, 'diagnostics': []}
+
+
+def test_read_write_message():
+    stream = io.BytesIO()
+    flake8_scs._write_lsp_message(stream, {'id': 1, 'result': None})
+    flake8_scs._write_lsp_message(stream, {'method': 'exit', 'params': {'text': '\U0001f600'}})
+    stream.seek(0)
+    assert flake8_scs._read_lsp_message(stream) == {'jsonrpc': '2.0', 'id': 1, 'result': None}
+    assert flake8_scs._read_lsp_message(stream) == {
+        'jsonrpc': '2.0',
+        'method': 'exit',
+        'params': {'text': '\U0001f600'},
+    }
+    assert flake8_scs._read_lsp_message(stream) is None
+    assert flake8_scs._read_lsp_message(io.BytesIO(b'Content-Length: 10\r\n\r\n{}')) is None
+
+
+# ==============================================================================
+
+
+class Client:
+    def __init__(self):
+        input_fd, self._input_fd = os.pipe()
+        self._output_fd, output_fd = os.pipe()
+        self.input = os.fdopen(self._input_fd, 'wb', buffering=0)
+        self.output = os.fdopen(self._output_fd, 'rb', buffering=0)
+        self._server_input = os.fdopen(input_fd, 'rb', buffering=0)
+        self._server_output = os.fdopen(output_fd, 'wb', buffering=0)
+        self.exit_code = None
+        self._thread = threading.Thread(target=self._serve)
+        self._thread.start()
+
+    def _serve(self):
+        self.exit_code = flake8_scs._serve_lsp(self._server_input, self._server_output)
+
+    def send(self, **message):
+        flake8_scs._write_lsp_message(self.input, message)
+
+    def receive(self):
+        return flake8_scs._read_lsp_message(self.output)
+
+    def close(self):
+        self.input.close()
+        self._thread.join()
+        for stream in (self.output, self._server_input, self._server_output):
+            stream.close()
+        return self.exit_code
+
+
+@pytest.fixture()
+def client(workspace):
+    client = Client()
+    client.send(id=1, method='initialize', params={'rootUri': workspace.as_uri(), 'capabilities': {}})
+    yield client
+    client.close()
+
+
+def test_server_initialize(client):
+    response = client.receive()
+    assert response['id'] == 1
+    assert response['result']['capabilities'] == {'textDocumentSync': {'openClose': True, 'change': 2}}
+
+
+def test_server_diagnostics(client, workspace):
+    client.receive()
+    uri = (workspace / 'a.py').as_uri()
+    client.send(method='initialized', params={})
+    client.send(
+        method='textDocument/didOpen',
+        params={'textDocument': {'uri': uri, 'languageId': 'python', 'version': 1, 'text': 'eval(x)\n'}},
+    )
+    params = client.receive()['params']
+    assert params['uri'] == uri
+    assert params['version'] == 1
+    assert [diagnostic['range']['start'] for diagnostic in params['diagnostics']] == [{'line': 0, 'character': 0}]
+
+    for version, text in enumerate(('  ', 'x = 1  # eval(x)'), start=2):
+        client.send(
+            method='textDocument/didChange',
+            params={
+                'textDocument': {'uri': uri, 'version': version},
+                'contentChanges': [
+                    {'range': {'start': {'line': 0, 'character': 0}, 'end': {'line': 0, 'character': 7}}, 'text': text}
+                ],
+            },
+        )
+    params = client.receive()['params']
+    assert params['version'] == 3
+    assert params['diagnostics'] == []
+
+    client.send(method='textDocument/didClose', params={'textDocument': {'uri': uri}})
+    assert client.receive()['params'] == {'uri': uri, 'diagnostics': []}
+
+
+def test_server_configuration(workspace):
+    # NB: the configuration is loaded when the server is initialized
+    (workspace / 'setup.cfg').write_text('[flake8]\nextend-ignore = SCS101\n')
+    client = Client()
+    try:
+        client.send(id=1, method='initialize', params={'rootUri': workspace.as_uri(), 'capabilities': {}})
+        client.receive()
+        client.send(
+            method='textDocument/didOpen',
+            params={'textDocument': {'uri': 'untitled:1', 'languageId': 'python', 'version': 1, 'text': 'eval(x)\n'}},
+        )
+        assert client.receive()['params']['diagnostics'] == []
+    finally:
+        client.close()
+
+
+def test_server_unknown_request(client):
+    client.receive()
+    client.send(method='unknown/notification', params={})
+    client.send(id=2, method='textDocument/hover', params={})
+    assert client.receive() == {
+        'jsonrpc': '2.0',
+        'id': 2,
+        'error': {'code': -32601, 'message': 'Method not found: textDocument/hover'},
+    }
+
+
+def test_server_malformed_messages(client):
+    client.receive()
+    client.send(method='textDocument/didChange', params={'contentChanges': [{'text': 'eval(x)\n'}]})
+    assert client.receive() == {
+        'jsonrpc': '2.0',
+        'method': 'window/logMessage',
+        'params': {'type': 1, 'message': "Error while handling textDocument/didChange: KeyError('textDocument')"},
+    }
+
+    client.send(id=2, method='initialize', params=['file:///'])
+    response = client.receive()
+    assert response['id'] == 2
+    assert response['error']['code'] == -32602
+
+    # NB: the server keeps running
+    client.send(
+        method='textDocument/didOpen',
+        params={'textDocument': {'uri': 'untitled:1', 'languageId': 'python', 'version': 1, 'text': 'eval(x)\n'}},
+    )
+    assert len(client.receive()['params']['diagnostics']) == 1
+
+
+def test_server_shutdown(client):
+    client.receive()
+    client.send(id=2, method='shutdown')
+    assert client.receive() == {'jsonrpc': '2.0', 'id': 2, 'result': None}
+    client.send(id=3, method='shutdown')
+    assert client.receive()['error']['code'] == -32600
+    client.send(method='exit')
+    client._thread.join()
+    assert client.exit_code == 0
+
+
+def test_server_exit_without_shutdown(client):
+    client.receive()
+    client.send(method='exit')
+    client._thread.join()
+    assert client.exit_code == 1
+
+
+def test_server_end_of_stream(client):
+    client.receive()
+    assert client.close() == 1
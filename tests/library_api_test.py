@@ -0,0 +1,123 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import ast
+import subprocess  # noqa: S404
+import sys
+import threading
+
+import flake8_secure_coding_standard as flake8_scs
+
+import pytest
+
+_source = (
+    'import os\n'
+    'import subprocess as proc\n\n'
+    'proc.run(cmd, shell=True)\n'
+    'eval(x)  # noqa: SCS101\n'
+    'os.mkdir(path, 0o777)\n'
+    'os.open(path, os.O_WRONLY, 0o700)\n'
+)
+
+
+# ==============================================================================
+
+
+def test_scan_source():
+    assert flake8_scs.scan_source(_source) == [
+        flake8_scs.Finding(4, 0, 'SCS103', flake8_scs.SCS103.partition(' ')[2]),
+    ]
+    assert flake8_scs.scan_source('x = 1\n') == []
+    assert flake8_scs.scan_source('') == []
+
+
+def test_scan_source_policy():
+    policy = flake8_scs.ScanPolicy(
+        codes=frozenset(('SCS112', 'SCS116')), target_platform='posix', os_mkdir_mode='0o755', os_open_mode='0o600'
+    )
+    findings = flake8_scs.scan_source(_source, policy=policy)
+    assert [(finding.line, finding.code) for finding in findings] == [(6, 'SCS116'), (7, 'SCS112')]
+    assert findings[0].message.endswith('(should be 0 < mode < 0o755)')
+    assert findings[1].message.endswith('(should be 0 < mode < 0o600)')
+
+    # NB: policies do not change the configuration of the plugin
+    assert flake8_scs.Visitor.os_open_mode_policy is None
+    assert flake8_scs.scan_source(_source, policy=policy._replace(target_platform='windows'))[0].code == 'SCS112'
+
+
+def test_scan_source_no_rules():
+    assert flake8_scs.scan_source('eval(x)\n', policy=flake8_scs.ScanPolicy(codes=frozenset())) == []
+
+
+@pytest.mark.parametrize(
+    'policy',
+    [
+        flake8_scs.ScanPolicy(codes=frozenset(('SCS999',))),
+        flake8_scs.ScanPolicy(target_platform='amiga'),
+        flake8_scs.ScanPolicy(os_open_mode='mask:abc'),
+    ],
+)
+def test_scan_source_invalid_policy(policy):
+    with pytest.raises(ValueError):  # noqa: PT011
+        flake8_scs.scan_source('x = 1\n', policy=policy)
+
+
+def test_scan_source_syntax_error():
+    with pytest.raises(SyntaxError) as excinfo:
+        flake8_scs.scan_source('eval(x\n', filename='snippet.py')
+    assert excinfo.value.filename == 'snippet.py'
+    # NB: source code that cannot contain any error is not parsed
+    assert flake8_scs.scan_source('x = (\n') == []
+
+
+def test_scan_tree():
+    tree = ast.parse(_source)
+    assert [finding.code for finding in flake8_scs.scan_tree(tree)] == ['SCS103', 'SCS101']
+    policy = flake8_scs.ScanPolicy(codes=frozenset(('SCS101',)))
+    assert flake8_scs.scan_tree(tree, policy=policy) == [
+        flake8_scs.Finding(5, 0, 'SCS101', flake8_scs.SCS101.partition(' ')[2]),
+    ]
+
+
+def test_scan_source_threads():
+    policies = [flake8_scs.ScanPolicy(os_open_mode=f'0o{mode:o}', target_platform='posix') for mode in (0o600, 0o777)]
+    expected = [[finding.code for finding in flake8_scs.scan_source(_source, policy=policy)] for policy in policies]
+    assert expected == [['SCS103', 'SCS112'], ['SCS103']]
+
+    results = []
+
+    def scan(policy, expected_codes):
+        codes = [[finding.code for finding in flake8_scs.scan_source(_source, policy=policy)] for _ in range(50)]
+        results.append(all(item == expected_codes for item in codes))
+
+    threads = [threading.Thread(target=scan, args=args) for args in zip(policies * 2, expected * 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(results)
+
+
+def test_no_flake8_import():
+    code = (
+        'import sys\n'
+        'import flake8_secure_coding_standard as scs\n'
+        'scs.scan_source("import os\\nos.system(x)\\n")\n'
+        'print(sorted(name for name in ("flake8", "argparse", "importlib.metadata") if name in sys.modules))\n'
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, check=True, encoding='utf-8')
+    assert result.stdout == '[]\n'
+
+
+def test_plugin_version():
+    assert flake8_scs.Plugin.version == flake8_scs._get_version('flake8_secure_coding_standard')
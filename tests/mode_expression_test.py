@@ -0,0 +1,134 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+import stat
+from itertools import starmap
+
+import flake8_secure_coding_standard as flake8_scs
+
+import pytest
+
+
+def results(s):
+    return set(starmap('{}:{}: {}'.format, flake8_scs.Plugin(ast.parse(s)).run()))
+
+
+@pytest.fixture()
+def _mode_policies(monkeypatch):
+    policy = flake8_scs._ModePolicy.from_option(0o755)
+    for function in ('open', 'mkdir', 'mkfifo', 'mknod'):
+        monkeypatch.setattr(flake8_scs.Visitor, f'os_{function}_mode_policy', policy)
+    monkeypatch.setattr(flake8_scs.Visitor, 'platform_profile', flake8_scs._get_platform_profile('posix'))
+
+
+def _make_binop_chain(n_terms, op=ast.BitOr):
+    node = ast.Attribute(value=ast.Name(id='stat', ctx=ast.Load()), attr='S_IRUSR', ctx=ast.Load())
+    for _ in range(n_terms - 1):
+        node = ast.BinOp(left=node, op=op(), right=ast.Constant(0))
+    return node
+
+
+# ==============================================================================
+
+
+@pytest.mark.parametrize(
+    ('s', 'expected'),
+    [
+        ('0o644', 0o644),
+        ('stat.S_IRUSR | stat.S_IWUSR', 0o600),
+        ('S_IRWXU | stat.S_IRGRP | 0o004', 0o744),
+        ('0o777 & ~stat.S_IWOTH', 0o775),
+        ('(stat.S_IRUSR | stat.S_IWUSR) - 0o200', 0o400),
+        ('0o1000 / 2', 0o1000 // 2),
+    ],
+)
+def test_evaluate_mode(s, expected):
+    assert flake8_scs._evaluate_mode(ast.parse(s).body[0].value) == expected
+
+
+@pytest.mark.parametrize(
+    's',
+    [
+        'mode',
+        'stat.S_IRUSR | mode',
+        '0o644 % 0',
+        '0o644 / 0o10',
+        '0o644 << 1',
+        '"0o644"',
+        'True',
+        '1.5',
+    ],
+)
+def test_evaluate_mode_invalid(s):
+    with pytest.raises(ValueError, match='Do not know how to process node|does not evaluate'):
+        flake8_scs._evaluate_mode(ast.parse(s).body[0].value)
+
+
+def test_evaluate_mode_large_expressions():
+    node = _make_binop_chain(flake8_scs._MODE_EXPR_MAX_SIZE // 2)
+    assert flake8_scs._evaluate_mode(node) == stat.S_IRUSR
+
+    # NB: deep generated expressions are rejected without raising RecursionError
+    node = _make_binop_chain(10000)
+    with pytest.raises(ValueError, match='more than'):
+        flake8_scs._evaluate_mode(node)
+
+    call = ast.Call(
+        func=ast.Attribute(value=ast.Name(id='os', ctx=ast.Load()), attr='chmod', ctx=ast.Load()),
+        args=[ast.Constant('file.txt'), node],
+        keywords=[],
+    )
+    assert not flake8_scs._chmod_has_wx_for_go(call)
+
+
+def test_evaluate_mode_memoized():
+    flake8_scs._evaluate_mode_tokens.cache_clear()
+    for s in ('stat.S_IRUSR | stat.S_IWUSR', 'S_IRUSR | S_IWUSR', 'stat.S_IRUSR | stat.S_IWUSR'):
+        assert flake8_scs._evaluate_mode(ast.parse(s).body[0].value) == 0o600
+    info = flake8_scs._evaluate_mode_tokens.cache_info()
+    assert (info.hits, info.misses) == (2, 1)
+
+
+@pytest.mark.parametrize(
+    ('s', 'msg'),
+    [
+        ('os.open("file.txt", flags, stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)', flake8_scs.SCS112),
+        ('os.mkdir("dir", stat.S_IRWXU | stat.S_IRWXG)', flake8_scs.SCS116),
+        ('os.makedirs("dir", mode=0o700 | 0o077)', flake8_scs.SCS116),
+        ('os.mkfifo("fifo", stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)', flake8_scs.SCS117),
+        ('os.mknod("node", 0o777 & ~stat.S_IROTH)', flake8_scs.SCS118),
+        ('os.chmod("file.txt", 0o777)', flake8_scs.SCS119),
+    ],
+)
+@pytest.mark.usefixtures('_mode_policies')
+def test_mode_expressions_reported(s, msg):
+    assert {result.split(' ', 1)[1] for result in results(s)} == {
+        flake8_scs.Visitor.format_mode_msg(msg) if msg in flake8_scs.Visitor.mode_msg_map else msg
+    }
+
+
+@pytest.mark.parametrize(
+    's',
+    [
+        'os.open("file.txt", flags, stat.S_IRUSR | stat.S_IWUSR)',
+        'os.mkdir("dir", stat.S_IRWXU | stat.S_IRGRP | stat.S_IXGRP)',
+        'os.mkfifo("fifo", mode)',
+        'os.mknod("node", stat.S_IRUSR | mode)',
+        'os.chmod("file.txt", 0o700)',
+    ],
+)
+@pytest.mark.usefixtures('_mode_policies')
+def test_mode_expressions_not_reported(s):
+    assert results(s) == set()
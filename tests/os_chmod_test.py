@@ -40,7 +40,7 @@ def results(s):
 )
 def test_chmod_get_mode(s, expected):
     node = ast.parse(s).body[0].value
-    assert flake8_scs._chmod_get_mode(node) == expected
+    assert flake8_scs._evaluate_mode(node) == expected
 
 
 @pytest.mark.parametrize(
@@ -53,7 +53,7 @@ def test_chmod_get_mode(s, expected):
 def test_chmod_get_mode_invalid(s):
     node = ast.parse(s).body[0].value
     with pytest.raises(ValueError, match='Do not know how to process node'):
-        flake8_scs._chmod_get_mode(node)
+        flake8_scs._evaluate_mode(node)
 
 
 @pytest.mark.parametrize(
@@ -66,7 +66,7 @@ def test_chmod_get_mode_invalid(s):
 )
 def test_chmod_get_mode_unop(s, expected):
     node = ast.parse(s).body[0].value
-    assert flake8_scs._chmod_get_mode(node) == expected
+    assert flake8_scs._evaluate_mode(node) == expected
 
 
 @pytest.mark.parametrize(
@@ -85,7 +85,7 @@ def test_chmod_get_mode_unop(s, expected):
 )
 def test_chmod_get_mode_binop(s, expected):
     node = ast.parse(s).body[0].value
-    assert flake8_scs._chmod_get_mode(node) == expected
+    assert flake8_scs._evaluate_mode(node) == expected
 
 
 @pytest.mark.parametrize(
@@ -123,6 +123,7 @@ def test_chmod_get_mode_binop(s, expected):
 )
 def test_chmod(mocker, platform, enabled_platform, fname, arg_type, forbidden, s):  # noqa: PLR0917
     mocker.patch('platform.system', return_value=platform)
+    mocker.patch.object(flake8_scs.Visitor, 'platform_profile', flake8_scs._get_platform_profile('auto'))
 
     if s:
         code = f'os.chmod({fname}, {arg_type}{s} | {forbidden}) #@'
@@ -149,25 +150,16 @@ def test_chmod(mocker, platform, enabled_platform, fname, arg_type, forbidden, s
 )
 def test_chmod_no_warning(mocker, platform, s):
     mocker.patch('platform.system', return_value=platform)
+    mocker.patch.object(flake8_scs.Visitor, 'platform_profile', flake8_scs._get_platform_profile('auto'))
 
     assert results(s) == set()
 
 
-@pytest.mark.parametrize(
-    ('platform', 'enabled_platform'),
-    [
-        ('Linux', True),
-        ('Darwin', True),
-        ('Java', True),
-        ('Windows', False),
-    ],
-)
-@pytest.mark.parametrize('s', ['os.chmod("file")'])
-def test_chmod_invalid_raise(mocker, platform, enabled_platform, s):
+@pytest.mark.parametrize('platform', ['Linux', 'Darwin', 'Java', 'Windows'])
+@pytest.mark.parametrize('s', ['os.chmod("file")', 'os.chmod(*args)', 'os.chmod(**kwargs)'])
+def test_chmod_invalid(mocker, platform, s):
     mocker.patch('platform.system', return_value=platform)
+    mocker.patch.object(flake8_scs.Visitor, 'platform_profile', flake8_scs._get_platform_profile('auto'))
 
-    if enabled_platform:
-        with pytest.raises(RuntimeError):
-            results(s)
-    else:
-        assert results(s) == set()
+    # NB: calls without a mode argument cannot be checked
+    assert results(s) == set()
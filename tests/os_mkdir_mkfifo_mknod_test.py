@@ -62,7 +62,21 @@ def configure_plugin(function, arg):
     mode = flake8_scs._read_octal_mode_option(f'os_{function}_mode', arg, flake8_scs._DEFAULT_MAX_MODE)
     OptionValue = namedtuple(
         'options_values',
-        field_names=('os_mkdir_mode', 'os_mkfifo_mode', 'os_mknod_mode', 'os_open_mode'),
+        field_names=(
+            'os_mkdir_mode',
+            'os_mkfifo_mode',
+            'os_mknod_mode',
+            'os_open_mode',
+            'scs_target_platform',
+            'scs_per_path_rules',
+            'scs_cache_dir',
+            'scs_cache_max_entries',
+            'scs_diff_base',
+            'scs_staged',
+            'scs_baseline',
+            'scs_stats',
+            'scs_shared_table_size',
+        ),
     )
 
     option = OptionValue(**{
@@ -70,10 +84,19 @@ def configure_plugin(function, arg):
         'os_mkfifo_mode': False,
         'os_mknod_mode': False,
         'os_open_mode': False,
+        'scs_target_platform': 'auto',
+        'scs_per_path_rules': '',
+        'scs_cache_dir': '',
+        'scs_cache_max_entries': 0,
+        'scs_diff_base': '',
+        'scs_staged': False,
+        'scs_baseline': '',
+        'scs_stats': False,
+        'scs_shared_table_size': 32,
         f'os_{function}_mode': mode,
     })
     flake8_scs.Plugin.parse_options(option)
-    assert getattr(flake8_scs.Visitor, f'os_{function}_modes_allowed') == [] if mode is None else mode
+    assert (getattr(flake8_scs.Visitor, f'os_{function}_mode_policy') is None) == (not mode)
 
 
 # ==============================================================================
@@ -115,6 +138,7 @@ def configure_plugin(function, arg):
 def test_os_function_ok(mocker, platform, function, option, s):
     configure_plugin(function, option)
     mocker.patch('platform.system', return_value=platform)
+    mocker.patch.object(flake8_scs.Visitor, 'platform_profile', flake8_scs._get_platform_profile('auto'))
 
     assert results(s) == set()
 
@@ -137,6 +161,7 @@ def test_os_function_call(mocker, platform, enabled_platform, function, option,
 
     configure_plugin(function, option)
     mocker.patch('platform.system', return_value=platform)
+    mocker.patch.object(flake8_scs.Visitor, 'platform_profile', flake8_scs._get_platform_profile('auto'))
 
     flake8_warnings = results(s)
     if enabled_platform and option == 'True':
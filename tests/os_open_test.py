@@ -32,7 +32,21 @@ def configure_plugin(arg):
     mode = flake8_scs._read_octal_mode_option('os_open_mode', arg, flake8_scs._DEFAULT_MAX_MODE)
     OptionValue = namedtuple(
         'options_values',
-        field_names=('os_mkdir_mode', 'os_mkfifo_mode', 'os_mknod_mode', 'os_open_mode'),
+        field_names=(
+            'os_mkdir_mode',
+            'os_mkfifo_mode',
+            'os_mknod_mode',
+            'os_open_mode',
+            'scs_target_platform',
+            'scs_per_path_rules',
+            'scs_cache_dir',
+            'scs_cache_max_entries',
+            'scs_diff_base',
+            'scs_staged',
+            'scs_baseline',
+            'scs_stats',
+            'scs_shared_table_size',
+        ),
     )
     flake8_scs.Plugin.parse_options(
         OptionValue(
@@ -40,9 +54,18 @@ def configure_plugin(arg):
             False,  # noqa: FBT003
             False,  # noqa: FBT003
             mode,
+            'auto',
+            '',
+            '',
+            0,
+            '',
+            False,  # noqa: FBT003
+            '',
+            False,  # noqa: FBT003
+            32,
         )
     )
-    assert flake8_scs.Visitor.os_open_modes_allowed == [] if mode is None else mode
+    assert (flake8_scs.Visitor.os_open_mode_policy is None) == (not mode)
 
 
 # ==============================================================================
@@ -0,0 +1,130 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+from itertools import starmap
+from pathlib import Path
+
+import flake8_secure_coding_standard as flake8_scs
+
+import flake8
+import flake8.exceptions
+import flake8.options.manager
+import flake8.utils
+import pytest
+
+
+def create_options_manager():
+    ctor_args = {'version': '1.0', 'plugin_versions': '', 'parents': []}
+    if int(flake8.__version__[0]) >= 6:
+        ctor_args['formatter_names'] = []
+    return flake8.options.manager.OptionManager(**ctor_args)
+
+
+def results(s, filename):
+    plugin = flake8_scs.Plugin(ast.parse(s), s.splitlines(keepends=True), filename)
+    return {msg.split(' ')[1] for msg in starmap('{}:{}: {}'.format, plugin.run())}
+
+
+@pytest.fixture()
+def configure_plugin(monkeypatch):
+    for name in ('rule_set', 'platform_profile'):
+        monkeypatch.setattr(flake8_scs.Visitor, name, getattr(flake8_scs.Visitor, name))
+    monkeypatch.setattr(flake8_scs.Plugin, 'path_rules', flake8_scs.Plugin.path_rules)
+
+    def _configure(*args):
+        options = create_options_manager()
+        flake8_scs.Plugin.add_options(options)
+        flake8_scs.Plugin.parse_options(options.parse_args(list(args)))
+
+    return _configure
+
+
+_code = 'assert x\neval(y)\nimport pdb\n'
+
+
+# ==============================================================================
+
+
+@pytest.mark.parametrize(
+    ('value', 'filename', 'expected'),
+    [
+        ('', 'tests/a_test.py', {'SCS101', 'SCS107', 'SCS108'}),
+        ('tests/*:SCS108', 'tests/a_test.py', {'SCS101', 'SCS107'}),
+        ('tests/*:SCS108', 'src/tests.py', {'SCS101', 'SCS107', 'SCS108'}),
+        ('tests/*:SCS108', 'tests/sub/a_test.py', {'SCS101', 'SCS107'}),
+        ('*_test.py:SCS108', 'src/deep/dir/a_test.py', {'SCS101', 'SCS107'}),
+        ('*_test.py:SCS108 tests/*:SCS107', 'tests/a_test.py', {'SCS101'}),
+        ('tests/a_test.py:SCS10', 'tests/a_test.py', set()),
+        ('tests/a_test.py:SCS10', 'tests/b_test.py', {'SCS101', 'SCS107', 'SCS108'}),
+        ('tests/*:E501', 'tests/a_test.py', {'SCS101', 'SCS107', 'SCS108'}),
+        ('tests/*:SCS108', None, {'SCS101', 'SCS107', 'SCS108'}),
+    ],
+)
+def test_per_path_rules(configure_plugin, value, filename, expected):
+    configure_plugin(f'--scs-per-path-rules={value}')
+    assert results(_code, filename) == expected
+
+
+def test_per_path_rules_absolute_path(configure_plugin):
+    configure_plugin('--scs-per-path-rules=tests/*:SCS101')
+    assert results(_code, str(Path('tests/a_test.py').resolve())) == {'SCS107', 'SCS108'}
+
+
+@pytest.mark.parametrize(
+    'value',
+    [
+        '',
+        'a.py:SCS101',
+        'a.py b/*.py : SCS100,SCS2\n c.py:SCS3 SCS4',
+        'a.py,b.py:SCS1,',
+        'a.py:',
+        ['a.py:SCS101', 'b.py: SCS102'],
+        'a.py',
+        'a.py:SCS101 b.py',
+        'a.py:scs101',
+        ', ',
+    ],
+)
+def test_parse_files_to_codes_mapping(value):
+    # NB: same syntax as the `per-file-ignores` option of flake8
+    try:
+        expected = flake8.utils.parse_files_to_codes_mapping(value)
+    except flake8.exceptions.ExecutionError:
+        with pytest.raises(ValueError, match='Expected a mapping from file patterns to error codes'):
+            flake8_scs._parse_files_to_codes_mapping(value)
+    else:
+        assert flake8_scs._parse_files_to_codes_mapping(value) == expected
+
+
+def test_per_path_rules_empty_option(configure_plugin):
+    configure_plugin('--scs-per-path-rules=')
+    assert flake8_scs.Plugin.path_rules is None
+
+
+def test_disabled_codes_index():
+    path_rules = flake8_scs._PathRules([
+        ('src/a.py', ['SCS101']),
+        ('src/a.py', ['SCS102']),
+        ('src/*/b.py', ['SCS103']),
+        ('*.pyi', ['SCS104']),
+        ('other/*', ['SCS105']),
+    ])
+
+    assert path_rules.disabled_codes('src/a.py') == {'SCS101', 'SCS102'}
+    assert path_rules.disabled_codes('src/x/b.py') == {'SCS103'}
+    assert path_rules.disabled_codes('src/b.py') == set()
+    assert path_rules.disabled_codes('src/x/a.pyi') == {'SCS104'}
+    assert path_rules.disabled_codes('other/x/y.py') == {'SCS105'}
+    assert path_rules.disabled_codes('another/y.py') == set()
@@ -97,12 +97,46 @@ def test_read_octal_mode_option(arg, expected):
     assert flake8_scs._read_octal_mode_option('test', arg, _default_modes) == expected
 
 
-@pytest.mark.parametrize('arg', ['', ',', ',,', 'nope', 'asd', 'a,', '493, a'])
+def test_read_octal_mode_option_mask():
+    assert flake8_scs._read_octal_mode_option('test', 'mask:0o755', _default_modes) == flake8_scs._ModePolicy(
+        'mask', 0o755, 'mode & ~0o755 == 0'
+    )
+
+
+@pytest.mark.parametrize('arg', ['', ',', ',,', 'nope', 'asd', 'a,', '493, a', 'mask:', 'mask:a', 'mask:-1'])
 def test_read_octal_mode_option_invalid(arg):
     with pytest.raises(ValueError, match='^(Invalid value for|Calculated empty value for|Unable to convert).*'):
         flake8_scs._read_octal_mode_option('test', arg, _default_modes)
 
 
+# ==============================================================================
+
+
+@pytest.mark.parametrize(
+    ('modes', 'allowed', 'not_allowed'),
+    [
+        (0o755, [0, 0o644, 0o755, 0o755 * 1.0, True], [-1, 0o756, 0o777, 0o644 + 0.5, '0o644', None]),
+        ([0o644, 0o755], [0o644, 0o755, 0o755 * 1.0], [0, -1, 0o700, 0o777, 1 << 100, '0o644', None]),
+        (flake8_scs._ModePolicy.from_mask(0o755), [0, 0o700, 0o711, 0o755], [-1, 0o777, 0o702, 0o1755]),
+    ],
+    ids=('max', 'set', 'mask'),
+)
+def test_mode_policy(modes, allowed, not_allowed):
+    policy = flake8_scs._ModePolicy.from_option(modes)
+    assert all(policy.allows(mode) for mode in allowed)
+    assert not any(policy.allows(mode) for mode in not_allowed)
+
+
+@pytest.mark.parametrize('modes', [None, False, 0, []])
+def test_mode_policy_disabled(modes):
+    assert flake8_scs._ModePolicy.from_option(modes) is None
+
+
+def test_mode_policy_invalid():
+    with pytest.raises(ValueError, match='Invalid negative value'):
+        flake8_scs._ModePolicy.from_option([0o644, -1])
+
+
 @pytest.mark.parametrize('function', ['open', 'mkdir', 'mkfifo', 'mknod'])
 @pytest.mark.parametrize(
     ('arg', 'allowed_modes'),
@@ -112,6 +146,7 @@ def test_read_octal_mode_option_invalid(arg):
         ('0', []),
         ('0o755', _default_modes),
         ('0o644, 0o755,', [0o644, 0o755]),
+        ('mask:0o750', [mode for mode in range(0o750 + 1) if not mode & ~0o750]),
     ],
     ids=_id_func,
 )
@@ -119,4 +154,8 @@ def test_os_allowed_mode(function, arg, allowed_modes):
     options = create_options_manager()
     flake8_scs.Plugin.add_options(options)
     flake8_scs.Plugin.parse_options(options.parse_args([f'--os-{function}-mode={arg}']))
-    assert getattr(flake8_scs.Visitor, f'os_{function}_modes_allowed') == allowed_modes
+    policy = getattr(flake8_scs.Visitor, f'os_{function}_mode_policy')
+    if allowed_modes:
+        assert [mode for mode in range(0o7777 + 1) if policy.allows(mode)] == allowed_modes
+    else:
+        assert policy is None
@@ -0,0 +1,83 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+
+import flake8_secure_coding_standard as flake8_scs
+
+import pytest
+
+
+def run_plugin(s):
+    return list(flake8_scs.Plugin(ast.parse(s), s.splitlines(keepends=True)).run())
+
+
+@pytest.mark.parametrize(
+    ('keywords', 'text', 'expected'),
+    [
+        ({'load', 'loads'}, 'x = load(y)', True),
+        ({'load', 'loads'}, 'x = loads(y)', True),
+        ({'load', 'loads'}, 'x = loader(y)', False),
+        ({'load', 'loads'}, 'x = unload(y)', False),
+        ({'call', 'check_call'}, 'sp.check_call(y)', True),
+        ({'call', 'check_call'}, 'sp.check_calls(y)', False),
+        ({'a', 'ab', 'abc'}, 'ab', True),
+        ({'a', 'ab', 'abc'}, 'abcd', False),
+    ],
+)
+def test_build_keywords_regex(keywords, text, expected):
+    assert (flake8_scs._build_keywords_regex(keywords).search(text) is not None) == expected
+
+
+@pytest.mark.parametrize(
+    's',
+    [
+        '',
+        'import os\n',
+        'def foo(x):\n    return x.loader(x)\n',
+        'import sys\nprint(sys.argv)\n',
+        'class A:\n    pass\n',
+    ],
+)
+def test_clean_source_is_skipped(mocker, s):
+    visit = mocker.patch.object(flake8_scs.Visitor, 'visit')
+    assert run_plugin(s) == []
+    visit.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    's',
+    [
+        'assert x\n',
+        'import pdb\n',
+        'from . import pdb\n',
+        'from os import system as run\n',
+        'Pdb()\n',
+        'pdb.set_trace()\n',
+        'x = sp.Popen(cmd, shell=True)\n',
+        'with open(\n    "file.txt",\n    "w",\n) as fd:\n    pass\n',
+        'os . system("ls")\n',
+        '\uff45val("1 + 1")\n',  # NB: fullwidth 'e', normalized to 'eval' by the parser
+    ],
+)
+def test_no_false_negatives(s):
+    assert flake8_scs._may_have_errors(s.splitlines(keepends=True), flake8_scs._ALL_RULES.keywords_re)
+    assert run_plugin(s) == list(flake8_scs.Plugin(ast.parse(s)).run())
+    assert run_plugin(s)
+
+
+def test_all_rule_names_are_keywords():
+    keywords = [keyword for keywords in flake8_scs._STATEMENT_KEYWORDS.values() for keyword in keywords]
+    for name in (*map(flake8_scs._get_rule_keyword, flake8_scs._RULES), *keywords):
+        assert flake8_scs._ALL_RULES.keywords_re.fullmatch(name), name
@@ -0,0 +1,281 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+import os
+from itertools import starmap
+
+import flake8_secure_coding_standard as flake8_scs
+
+import flake8
+import flake8.options.manager
+import pytest
+
+
+def create_options_manager():
+    ctor_args = {'version': '1.0', 'plugin_versions': '', 'parents': []}
+    if int(flake8.__version__[0]) >= 6:
+        ctor_args['formatter_names'] = []
+    return flake8.options.manager.OptionManager(**ctor_args)
+
+
+def results(s):
+    plugin = flake8_scs.Plugin(ast.parse(s), s.splitlines(keepends=True))
+    return set(starmap('{}:{}: {}'.format, plugin.run()))
+
+
+def content_key(s):
+    return flake8_scs._get_content_key(s.splitlines(keepends=True), flake8_scs.Visitor.rule_set)
+
+
+@pytest.fixture()
+def configure_plugin(monkeypatch):
+    for name in ('rule_set', 'platform_profile', 'os_open_mode_policy'):
+        monkeypatch.setattr(flake8_scs.Visitor, name, getattr(flake8_scs.Visitor, name))
+    for name in ('path_rules', 'result_cache', 'content_table'):
+        monkeypatch.setattr(flake8_scs.Plugin, name, getattr(flake8_scs.Plugin, name))
+
+    def _configure(*args):
+        options = create_options_manager()
+        flake8_scs.Plugin.add_options(options)
+        flake8_scs.Plugin.parse_options(options.parse_args(list(args)))
+        # NB: identical source code would otherwise be served by the in-process content table
+        flake8_scs.Plugin.content_table = None
+        return flake8_scs.Plugin.result_cache
+
+    return _configure
+
+
+_code = 'assert x\neval(y)\nos.open("file.txt", flags, 0o777)\n'
+
+
+# ==============================================================================
+
+
+def test_cache_disabled(configure_plugin):
+    assert configure_plugin() is None
+    assert results(_code)
+
+
+def test_cache_hit_replays_errors(configure_plugin, tmp_path, mocker):
+    cache = configure_plugin(f'--scs-cache-dir={tmp_path}')
+    expected = results(_code)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert len(list(tmp_path.glob('*.json'))) == 1
+
+    visit = mocker.patch.object(flake8_scs.Visitor, 'visit')
+    assert results(_code) == expected
+    visit.assert_not_called()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # NB: no temporary file left behind
+    assert [path.suffix for path in tmp_path.iterdir()] == ['.json']
+
+
+def test_cache_shared_between_runs(configure_plugin, tmp_path, mocker):
+    configure_plugin(f'--scs-cache-dir={tmp_path}')
+    expected = results(_code)
+
+    cache = configure_plugin(f'--scs-cache-dir={tmp_path}')
+    visit = mocker.patch.object(flake8_scs.Visitor, 'visit')
+    assert results(_code) == expected
+    visit.assert_not_called()
+    assert cache.hits == 1
+
+
+@pytest.mark.parametrize(
+    'args',
+    [
+        ('--os-open-mode=0o644',),
+        ('--scs-target-platform=windows',),
+    ],
+)
+def test_cache_key_depends_on_options(configure_plugin, tmp_path, args):
+    cache = configure_plugin(f'--scs-cache-dir={tmp_path}')
+    key = cache.key(content_key(_code))
+
+    cache = configure_plugin(f'--scs-cache-dir={tmp_path}', *args)
+    assert cache.key(content_key(_code)) != key
+    results(_code)
+    assert cache.misses == 1
+
+
+def test_cache_key_depends_on_rules_and_source(configure_plugin, tmp_path):
+    cache = configure_plugin(f'--scs-cache-dir={tmp_path}')
+    lines = _code.splitlines(keepends=True)
+    keys = {
+        cache.key(flake8_scs._get_content_key(lines, flake8_scs._ALL_RULES)),
+        cache.key(flake8_scs._get_content_key(lines, flake8_scs._compile_rule_set(frozenset({'SCS101'})))),
+        cache.key(flake8_scs._get_content_key([*lines, '\n'], flake8_scs._ALL_RULES)),
+    }
+    assert len(keys) == 3
+
+
+def test_cache_invalid_entry(configure_plugin, tmp_path):
+    cache = configure_plugin(f'--scs-cache-dir={tmp_path}')
+    expected = results(_code)
+    (path,) = tmp_path.glob('*.json')
+    path.write_text('{not json')
+
+    assert results(_code) == expected
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert results(_code) == expected
+    assert cache.hits == 1
+
+
+def test_cache_unwritable_directory(configure_plugin, tmp_path):
+    (tmp_path / 'file').write_text('')
+    cache = configure_plugin(f'--scs-cache-dir={tmp_path / "file" / "cache"}')
+    assert results(_code)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_cache_lru_eviction(configure_plugin, tmp_path):
+    cache = configure_plugin(f'--scs-cache-dir={tmp_path}', '--scs-cache-max-entries=3')
+    cache.prune_interval = 1
+
+    sources = [f'eval({idx})\n' for idx in range(5)]
+    for idx, source in enumerate(sources[:3]):
+        results(source)
+        key = cache.key(content_key(source))
+        os.utime(tmp_path / f'{key}.json', (idx, idx))
+
+    # NB: a hit makes sources[0] the most recently used entry
+    results(sources[0])
+    results(sources[3])
+    results(sources[4])
+
+    cached = {path.stem for path in tmp_path.glob('*.json')}
+    assert cached == {cache.key(content_key(source)) for source in (sources[0], sources[3], sources[4])}
+
+
+# ==============================================================================
+
+
+def _make_module(n_functions, changed=None, header='import subprocess as proc\n'):
+    chunks = [header]
+    for idx in range(n_functions):
+        body = 'eval(x)' if idx != changed else 'exec(x)\n    eval(y)'
+        chunks.append(f'\n\ndef f{idx}(x):\n    {body}\n    proc.run(x, shell=True)\n')
+    chunks.append('\n\n@decorator(eval(z))\nclass A(Base):\n    def method(self):\n        assert x\n')
+    return ''.join(chunks)
+
+
+def _run_file(s, filename):
+    plugin = flake8_scs.Plugin(ast.parse(s), s.splitlines(keepends=True), filename)
+    return sorted((line, col, msg) for line, col, msg, _ in plugin.run())
+
+
+def _expected(s):
+    return sorted((line, col, msg) for line, col, msg, _ in flake8_scs.Plugin(ast.parse(s)).run())
+
+
+@pytest.fixture()
+def incremental_cache(configure_plugin, tmp_path, monkeypatch):
+    monkeypatch.setattr(flake8_scs._ResultCache, 'incremental_min_lines', 10)
+    return configure_plugin(f'--scs-cache-dir={tmp_path}')
+
+
+def test_incremental_reuses_unchanged_units(incremental_cache, tmp_path, mocker):
+    filename = str(tmp_path / 'module.py')
+    s = _make_module(20)
+    assert _run_file(s, filename) == _expected(s)
+    assert incremental_cache.unit_hits == 0
+    n_units = incremental_cache.unit_misses
+
+    # NB: one function changed and all the following ones moved by one line
+    s = _make_module(20, changed=5)
+    expected = _expected(s)
+    visit = mocker.spy(flake8_scs.Visitor, 'visit')
+    assert _run_file(s, filename) == expected
+    assert incremental_cache.unit_hits == n_units - 1
+    assert incremental_cache.unit_misses == n_units + 1
+    # NB: the changed function plus the decorator and base of the class
+    assert visit.call_count == 3
+
+
+def _make_large_function(n_statements, changed=None):
+    statements = ''.join(
+        f'    os.system(x{idx})\n' if idx != changed else '    eval(x)\n    exec(x)\n' for idx in range(n_statements)
+    )
+    return (
+        'import os\n\n\n@decorator(eval(z))\nasync def f(x=eval(y)) -> eval(r):\n'
+        '    import subprocess as proc\n'
+        f'{statements}'
+        '    proc.run(x, shell=True)\n\n\n'
+        'proc.run(x, shell=True)\n'
+    )
+
+
+def test_incremental_splits_large_functions(incremental_cache, tmp_path, mocker, monkeypatch):
+    monkeypatch.setattr(flake8_scs.Visitor, 'min_split_lines', 8)
+    filename = str(tmp_path / 'module.py')
+    s = _make_large_function(20)
+    assert _run_file(s, filename) == _expected(s)
+    n_units = incremental_cache.unit_misses
+
+    # NB: only the statements that replaced a statement of the function are checked again
+    s = _make_large_function(20, changed=5)
+    expected = _expected(s)
+    assert sum('SCS103' in msg for _, _, msg in expected) == 1
+    visit = mocker.spy(flake8_scs.Visitor, 'visit')
+    assert _run_file(s, filename) == expected
+    assert incremental_cache.unit_hits == n_units - 1
+    # NB: the two new statements plus the arguments, return annotation and decorator of the function
+    assert visit.call_count == 5
+
+
+@pytest.mark.usefixtures('incremental_cache')
+def test_incremental_small_functions_not_split(tmp_path, monkeypatch):
+    monkeypatch.setattr(flake8_scs.Visitor, 'min_split_lines', 100)
+    filename = str(tmp_path / 'module.py')
+    s = _make_large_function(20)
+    visitor = flake8_scs.Visitor(flake8_scs._ALL_RULES)
+    new_units = {}
+    visitor.visit_units(ast.parse(s).body, s.splitlines(keepends=True), {}, new_units)
+    assert sorted(visitor.errors) == _expected(s)
+    assert len(new_units) == 3
+    assert _run_file(s, filename) == _expected(s)
+
+
+@pytest.mark.usefixtures('incremental_cache')
+def test_incremental_depends_on_aliases(tmp_path):
+    filename = str(tmp_path / 'module.py')
+    s = _make_module(20)
+    assert _run_file(s, filename) == _expected(s)
+
+    s = _make_module(20, header='import foo as proc\n')
+    assert _run_file(s, filename) == _expected(s)
+    assert not any('SCS103' in msg for _, _, msg in _expected(s))
+
+
+@pytest.mark.usefixtures('incremental_cache')
+def test_incremental_statements_sharing_a_line(tmp_path):
+    filename = str(tmp_path / 'module.py')
+    header = 'import os\nos.system(x); eval(y); os.system(z)\n'
+    s = _make_module(20, header=header)
+    assert _run_file(s, filename) == _expected(s)
+
+    # NB: the units of the statements of the second line are reused
+    s = _make_module(20, changed=5, header=header)
+    expected = _expected(s)
+    assert sum(line == 2 for line, _, _ in expected) == 3
+    assert _run_file(s, filename) == expected
+
+
+def test_incremental_small_files(incremental_cache, tmp_path, monkeypatch):
+    monkeypatch.setattr(flake8_scs._ResultCache, 'incremental_min_lines', 100)
+    s = _make_module(1)
+    assert _run_file(s, str(tmp_path / 'module.py')) == _expected(s)
+    assert incremental_cache.unit_misses == 0
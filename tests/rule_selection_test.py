@@ -0,0 +1,129 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+from itertools import starmap
+
+import flake8_secure_coding_standard as flake8_scs
+
+import flake8
+import flake8.main.options
+import flake8.options.manager
+import pytest
+
+
+def create_options_manager():
+    ctor_args = {'version': '1.0', 'plugin_versions': '', 'parents': []}
+    if int(flake8.__version__[0]) >= 6:
+        ctor_args['formatter_names'] = []
+    return flake8.options.manager.OptionManager(**ctor_args)
+
+
+def results(s):
+    return set(starmap('{}:{}: {}'.format, flake8_scs.Plugin(ast.parse(s), s.splitlines(keepends=True)).run()))
+
+
+@pytest.fixture()
+def configure_plugin(monkeypatch):
+    for name in ('rule_set', 'platform_profile'):
+        monkeypatch.setattr(flake8_scs.Visitor, name, getattr(flake8_scs.Visitor, name))
+
+    def _configure(*args):
+        options = create_options_manager()
+        flake8.main.options.register_default_options(options)
+        flake8_scs.Plugin.add_options(options)
+        values = options.parse_args(list(args))
+        # NB: normally set by flake8 once all the plugins are loaded
+        values.extended_default_select = ['SCS']
+        values.extended_default_ignore = []
+        flake8_scs.Plugin.parse_options(values)
+
+    return _configure
+
+
+_code = 'assert x\neval(y)\nopen("file.txt", "w")\nwith open("file.txt", "w") as fd:\n    pass\nimport pdb\n'
+
+
+# ==============================================================================
+
+
+@pytest.mark.parametrize(
+    ('args', 'expected'),
+    [
+        ((), {'SCS101', 'SCS107', 'SCS108', 'SCS109'}),
+        (('--extend-ignore=SCS108,SCS109',), {'SCS101', 'SCS107'}),
+        (('--ignore=SCS10',), set()),
+        (('--select=SCS101',), {'SCS101'}),
+        (('--select=E', '--extend-select=SCS108'), {'SCS108'}),
+        (('--select=SCS', '--extend-ignore=SCS101,SCS107'), {'SCS108', 'SCS109'}),
+    ],
+)
+def test_enabled_codes(configure_plugin, args, expected):
+    configure_plugin(*args)
+    assert {msg.split(' ')[1] for msg in results(_code)} == expected
+
+
+def test_enabled_codes_without_flake8_options():
+    assert flake8_scs._get_enabled_codes(object()) == {f'SCS{idx}' for idx in range(100, 120)}
+
+
+@pytest.mark.parametrize(
+    'args',
+    [
+        (),
+        ('--ignore=SCS10',),
+        ('--ignore=S',),
+        ('--select=SCS101',),
+        ('--select=E', '--extend-select=SCS108'),
+        ('--select=SCS', '--extend-ignore=SCS101,SCS107'),
+        ('--select=SCS1', '--ignore=SCS10'),
+        ('--select=SCS10', '--ignore=SCS1'),
+        ('--ignore=SC', '--extend-select=S,SCS11'),
+        ('--extend-ignore=SCS1', '--extend-select=SCS10'),
+    ],
+)
+def test_selected_codes(args):
+    options = create_options_manager()
+    flake8.main.options.register_default_options(options)
+    values = options.parse_args(list(args))
+    values.extended_default_select = ['SCS']
+    values.extended_default_ignore = []
+    # NB: same codes as the ones selected by flake8 itself
+    assert flake8_scs._get_selected_codes(values) == flake8_scs._get_enabled_codes(values)
+
+
+def test_disabled_handlers(configure_plugin, mocker):
+    configure_plugin('--select=SCS108')
+    assert flake8_scs.Visitor.rule_set.node_types == frozenset({ast.Assert})
+    assert set(flake8_scs.Visitor()._handlers) == {ast.Assert}
+
+    predicate = mocker.patch('flake8_secure_coding_standard._is_builtin_open_for_writing')
+    assert results(_code) == {'1:0: ' + flake8_scs.SCS108}
+    predicate.assert_not_called()
+
+
+def test_nothing_enabled(configure_plugin, mocker):
+    configure_plugin('--ignore=SCS')
+    assert flake8_scs.Visitor.rule_set.keywords_re is None
+
+    visit = mocker.patch.object(flake8_scs.Visitor, 'visit')
+    assert list(flake8_scs.Plugin(ast.parse(_code)).run()) == []
+    visit.assert_not_called()
+
+
+def test_prefilter_uses_enabled_rules(configure_plugin, mocker):
+    configure_plugin('--select=SCS108')
+    visit = mocker.patch.object(flake8_scs.Visitor, 'visit')
+    assert results('eval(y)\nimport pdb\n') == set()
+    visit.assert_not_called()
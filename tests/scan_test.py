@@ -0,0 +1,339 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import mmap
+import sys
+from pathlib import Path
+
+import flake8_secure_coding_standard as flake8_scs
+
+import pytest
+
+
+@pytest.fixture()
+def project(monkeypatch, tmp_path):
+    monkeypatch.delenv(flake8_scs._SharedTable.env_var, raising=False)
+    for name in ('rule_set', 'platform_profile', 'os_open_mode_policy'):
+        monkeypatch.setattr(flake8_scs.Visitor, name, getattr(flake8_scs.Visitor, name))
+    for name in ('path_rules', 'result_cache', 'diff_index', 'baseline', 'print_stats'):
+        monkeypatch.setattr(flake8_scs.Plugin, name, getattr(flake8_scs.Plugin, name))
+    monkeypatch.setattr(flake8_scs.Plugin, 'content_table', None)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'src' / 'pkg').mkdir(parents=True)
+    (tmp_path / 'src' / 'a.py').write_text('import os\n\neval(x)\nos.system(y)  # noqa: SCS102\n')
+    (tmp_path / 'src' / 'pkg' / 'b.py').write_text('x = 1\n' * 100 + 'exec(x)\n')
+    (tmp_path / 'src' / 'pkg' / 'c.py').write_text('def f(:\n')
+    (tmp_path / 'src' / 'd.txt').write_text('eval(x)\n')
+
+    yield tmp_path
+
+    flake8_scs.atexit.unregister(flake8_scs.Plugin.report_stats)
+    if flake8_scs.Plugin.content_table is not None and flake8_scs.Plugin.content_table.shared is not None:
+        flake8_scs.Plugin.content_table.shared.close()
+
+
+def _path(*parts):
+    return str(Path(*parts))
+
+
+_msg = 'SCS101 `eval()` and `exec()` represent a security risk and should be avoided'
+_errors = [f'{_path("src", "a.py")}:3:1: {_msg}', f'{_path("src", "pkg", "b.py")}:101:1: {_msg}']
+
+
+# ==============================================================================
+
+
+@pytest.mark.parametrize(
+    ('sizes', 'n_batches', 'expected'),
+    [
+        ([], 4, []),
+        ([10, 20, 30], 1, [['c', 'b', 'a']]),
+        ([10, 20, 30], 10, [['c'], ['b'], ['a']]),
+        ([1, 1, 1, 1, 4, 100], 4, [['f'], ['e', 'a', 'b', 'c', 'd']]),
+        ([0, 0], 4, [['a', 'b']]),
+    ],
+)
+def test_get_scan_batches(sizes, n_batches, expected):
+    files = [(size, chr(ord('a') + idx)) for idx, size in enumerate(sizes)]
+    assert flake8_scs._get_scan_batches(files, n_batches) == expected
+
+
+@pytest.mark.usefixtures('project')
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_scan(jobs):
+    output = io.StringIO()
+    stats = flake8_scs._scan(['src'], output, jobs)
+    assert output.getvalue().splitlines() == _errors
+    assert stats.n_files == 3
+    # NB: c.py is not parsed (it does not contain any keyword), hence its syntax error goes unnoticed
+    assert stats.n_lines == 106
+    assert stats.n_errors == 2
+
+
+@pytest.mark.usefixtures('project')
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_scan_check_failure(monkeypatch, capfd, jobs):
+    check_source = flake8_scs._check_source
+
+    def _check_source(source, filename):
+        if filename == _path('src', 'a.py'):
+            msg = 'oops'
+            raise RuntimeError(msg)
+        return check_source(source, filename)
+
+    monkeypatch.setattr(flake8_scs, '_check_source', _check_source)
+    output = io.StringIO()
+    stats = flake8_scs._scan(['src'], output, jobs)
+    assert output.getvalue().splitlines() == _errors[1:]
+    assert stats.n_files == 3
+    assert capfd.readouterr().err == (
+        f"{_path('src', 'a.py')}: unexpected error while checking the file: RuntimeError('oops')\n"
+    )
+
+
+def test_scan_configuration(project, mocker):
+    # NB: the configuration files are read without flake8
+    mocker.patch.object(flake8_scs, '_load_flake8_options', side_effect=AssertionError)
+    (project / 'setup.cfg').write_text('[flake8]\nos-open-mode = 0o644\nexclude = pkg\n')
+    (project / 'src' / 'e.py').write_text('import os\n\nos.open(path, os.O_WRONLY, 0o777)\n')
+    output = io.StringIO()
+    flake8_scs._scan(['src'], output, 1)
+    assert [line.split(' ')[0] for line in output.getvalue().splitlines()] == [
+        f'{_path("src", "a.py")}:3:1:',
+        f'{_path("src", "e.py")}:3:1:',
+    ]
+
+
+def test_read_flake8_config(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setenv('USERPROFILE', str(tmp_path))
+    root = tmp_path / 'root'
+    (root / 'sub' / 'dir').mkdir(parents=True)
+    # NB: like flake8, the search stops at the home directory
+    (tmp_path / 'tox.ini').write_text('[flake8]\njobs = 1\n')
+    assert flake8_scs._read_flake8_config(str(root / 'sub' / 'dir')) == ({}, str(root / 'sub' / 'dir'))
+
+    (root / 'tox.ini').write_text('[flake8]\nextend_exclude = build\n')
+    (root / 'sub' / 'setup.cfg').write_text('[metadata]\nname = x\n')
+    (root / 'sub' / 'dir' / 'setup.cfg').write_text('[flake8\n')
+    assert flake8_scs._read_flake8_config(str(root / 'sub' / 'dir')) == ({'extend-exclude': 'build'}, str(root))
+
+    (root / 'sub' / '.flake8').write_text('[flake8:local-plugins]\n')
+    assert flake8_scs._read_flake8_config(str(root / 'sub' / 'dir')) == ({}, str(root / 'sub'))
+
+
+def test_read_flake8_config_pyproject(tmp_path):
+    pytest.importorskip('tomllib' if sys.version_info >= (3, 11) else 'tomli')
+    (tmp_path / 'pyproject.toml').write_text('[tool.flake8]\nexclude = ["a", "b"]\nscs_stats = true\n')
+    assert flake8_scs._read_flake8_config(str(tmp_path)) == ({'exclude': ['a', 'b'], 'scs-stats': True}, str(tmp_path))
+
+    (tmp_path / 'setup.cfg').write_text('[flake8]\njobs = 2\n')
+    assert flake8_scs._read_flake8_config(str(tmp_path)) == ({'jobs': '2'}, str(tmp_path))
+
+    (tmp_path / 'setup.cfg').unlink()
+    (tmp_path / 'pyproject.toml').write_text('[tool.flake8\n')
+    assert flake8_scs._read_pyproject_config(str(tmp_path / 'pyproject.toml')) is None
+
+
+def test_load_config_options(project):
+    (project / 'setup.cfg').write_text(
+        '[flake8]\n'
+        'select = SCS1\n'
+        'extend-ignore = SCS101, SCS102\n'
+        'exclude = ./src/pkg,*.txt\n'
+        'jobs = 3\n'
+        'scs-stats = yes\n'
+        'scs-per-path-rules = src/a.py:SCS103\n'
+        'scs-cache-max-entries = 10\n'
+    )
+    options = flake8_scs._load_config_options()
+    assert options.filename == ['*.py']
+    assert options.exclude == [str(project / 'src' / 'pkg'), '*.txt']
+    assert options.jobs == '3'
+    assert options.scs_cache_max_entries == 10
+    assert flake8_scs.Visitor.rule_set.codes == flake8_scs._ALL_CODES - {'SCS101', 'SCS102'}
+    assert flake8_scs.Plugin.print_stats is True
+    assert flake8_scs.Plugin.path_rules.disabled_codes(_path('src', 'a.py')) == {'SCS103'}
+
+    (project / 'setup.cfg').write_text('[flake8]\n')
+    options = flake8_scs._load_config_options()
+    assert options.exclude == list(flake8_scs._DEFAULT_EXCLUDE)
+    assert options.jobs == 'auto'
+    assert flake8_scs.Visitor.rule_set.codes == flake8_scs._ALL_CODES
+
+    (project / 'setup.cfg').write_text('[flake8]\nscs-stats = maybe\n')
+    with pytest.raises(ValueError, match='Not a boolean'):
+        flake8_scs._load_config_options()
+
+
+@pytest.mark.usefixtures('project')
+def test_main(capsys):
+    assert flake8_scs.main(['scan', '--jobs', '1']) == 1
+    out, err = capsys.readouterr()
+    assert out.splitlines() == _errors
+    assert err.startswith('Number of files checked: 3 (')
+    assert err.endswith(' lines/s)\n')
+
+    assert flake8_scs.main(['scan', '-j', '1', _path('src', 'pkg', 'c.py')]) == 0
+
+
+@pytest.mark.parametrize(
+    ('content', 'expected'),
+    [
+        (b'', False),
+        (b'x = 1\n', False),
+        (b'x = 1\neval(x)', True),
+        (b'x = evaluate(y)\n', False),
+        (b'# -*- coding: latin-1 -*-\nx = 1\n', False),
+        (b'x = "\xe9"\n', True),
+        # NB: UTF-7 decodes some sequences of ASCII characters to other characters ('+AGU-' is 'e')
+        (b'# coding: utf-7\nx = +AGU-val(y)\n', True),
+        (b'# coding: unknown\nx = 1\n', True),
+    ],
+)
+def test_may_have_errors_in_buffer(content, expected):
+    keywords_re = flake8_scs._ALL_RULES.keywords_re
+    assert flake8_scs._may_have_errors_in_buffer(content, keywords_re) is expected
+
+
+@pytest.mark.parametrize(
+    ('content', 'expected'),
+    [(b'', 0), (b'x = 1', 1), (b'x = 1\n', 1), (b'x = 1\n\ny = 2', 3), (b'x = 1\n' * 5000, 5000)],
+)
+def test_count_lines(monkeypatch, content, expected):
+    monkeypatch.setattr(flake8_scs, '_SCAN_CHUNK_SIZE', 7)
+    assert flake8_scs._count_lines(content) == expected
+
+
+@pytest.mark.usefixtures('project')
+def test_map_checked_source():
+    with flake8_scs._map_checked_source(_path('src', 'pkg', 'b.py')) as (source, n_lines):
+        assert isinstance(source, mmap.mmap)
+        assert source[:] == Path('src', 'pkg', 'b.py').read_bytes()
+        assert n_lines == 0
+
+    Path('empty.py').write_bytes(b'')
+    with flake8_scs._map_checked_source('empty.py') as result:
+        assert result == (None, 0)
+    with flake8_scs._map_checked_source(_path('src', 'pkg', 'c.py')) as result:
+        assert result == (None, 1)
+    with pytest.raises(OSError), flake8_scs._map_checked_source('missing.py'):  # noqa: PT011
+        pass
+
+
+@pytest.mark.parametrize(
+    ('content', 'expected'),
+    [
+        (b'x = 1\n', (1, [])),
+        (b'x = 1\neval(x)\neval(x)  # noqa: SCS101\n', (3, [(2, 0, 'SCS101')])),
+        (b'\xef\xbb\xbf# -*- coding: utf-8 -*-\neval(x)  # noqa\n\n', (3, [])),
+        (b'eval(x', None),
+    ],
+)
+def test_check_source(mocker, content, expected):
+    for name in ('result_cache', 'content_table', 'diff_index'):
+        mocker.patch.object(flake8_scs.Plugin, name, None)
+    decode_lines = mocker.spy(flake8_scs, '_decode_lines')
+    checked = flake8_scs._check_source(content, 'a.py')
+    if expected is None:
+        assert checked is None
+        return
+    _, n_lines, errors = checked
+    assert (n_lines, [(line, col, msg.split(' ')[0]) for line, col, msg in errors]) == expected
+    # NB: the lines are only decoded to look for `# noqa` comments
+    assert decode_lines.call_count == (b'eval' in content)
+
+
+def test_check_source_cache(mocker, tmp_path):
+    mocker.patch.object(flake8_scs.Plugin, 'result_cache', flake8_scs._ResultCache(str(tmp_path), 10, ''))
+    decode_lines = mocker.spy(flake8_scs, '_decode_lines')
+    _, n_lines, errors = flake8_scs._check_source(b'x = 1\n', 'a.py')
+    assert (n_lines, errors) == (1, [])
+    # NB: the keys of the result cache are computed from the lines
+    assert decode_lines.call_count == 1
+
+
+def test_scan_encodings(project):
+    (project / 'src' / 'e.py').write_bytes(b'# -*- coding: latin-1 -*-\nx = "\xe9"; eval(x)\n')
+    (project / 'src' / 'f.py').write_bytes(b'# coding: utf-7\nx = +AGU-val(y)\n')
+    output = io.StringIO()
+    flake8_scs._scan(['src'], output, 1)
+    assert [line.split(' ')[0] for line in output.getvalue().splitlines()] == [
+        f'{_path("src", "a.py")}:3:1:',
+        f'{_path("src", "e.py")}:2:11:',
+        f'{_path("src", "f.py")}:2:5:',
+        f'{_path("src", "pkg", "b.py")}:101:1:',
+    ]
+
+
+_big_source = (
+    'import os\n'
+    '\n'
+    '@decorator\n'
+    'def f(x):\n'
+    '    os.system(x)\n'
+    '\n'
+    'from subprocess import (\n'
+    'call as run,\n'
+    ')\n'
+    'x = """\n'
+    'run(x)\n'
+    '"""\n'
+    'run(x, shell=True)\n'
+    'run(x, shell=True)  # noqa: SCS103\n'
+    'eval(x)\n'
+    'run(x, shell=True)\n'
+)
+
+
+def test_split_scan_source():
+    chunks = flake8_scs._split_scan_source(_big_source.encode(), 4)
+    assert [chunk.start for chunk in chunks] == [0, 6, 12]
+    assert ''.join(chunk.source for chunk in chunks) == _big_source
+    # NB: the aliases of the multi-line import statement are only known after it
+    assert [chunk.aliases.get('run') for chunk in chunks] == [None, None, 'subprocess.call']
+    assert flake8_scs._split_scan_source(b'\xff\n', 4) is None
+
+
+def test_scan_chunk(mocker):
+    chunks = flake8_scs._split_scan_source(_big_source.encode(), 4)
+    errors = [flake8_scs._scan_chunk('big.py', chunk) for chunk in chunks]
+    assert [[(line, msg.split(' ')[0]) for _, line, _, msg in chunk_errors] for chunk_errors in errors] == [
+        [(5, 'SCS102')],
+        [],
+        [(13, 'SCS103'), (15, 'SCS101'), (16, 'SCS103')],
+    ]
+    assert flake8_scs._scan_chunk('big.py', chunks[0]._replace(source='def f(:\n')) is None
+    mocker.patch.object(flake8_scs.Visitor, 'visit', side_effect=RuntimeError('oops'))
+    assert flake8_scs._scan_chunk('big.py', chunks[0]) is None
+
+
+@pytest.mark.parametrize('split_lines', [0, 10])
+def test_scan_split(project, split_lines):
+    (project / 'src' / 'pkg' / 'big.py').write_text(_big_source)
+    # NB: the chunks of this file cannot be parsed on their own, hence the file is checked again as a whole
+    (project / 'src' / 'pkg' / 'list.py').write_text('x = [\n' + '1,\n' * 20 + ']\n' + 'eval(x)\n')
+
+    output = io.StringIO()
+    stats = flake8_scs._scan(['src'], output, 2, split_lines)
+    assert [line.split(' ')[0] for line in output.getvalue().splitlines()] == [
+        f'{_path("src", "a.py")}:3:1:',
+        f'{_path("src", "pkg", "b.py")}:101:1:',
+        f'{_path("src", "pkg", "big.py")}:5:5:',
+        f'{_path("src", "pkg", "big.py")}:13:1:',
+        f'{_path("src", "pkg", "big.py")}:15:1:',
+        f'{_path("src", "pkg", "big.py")}:16:1:',
+        f'{_path("src", "pkg", "list.py")}:23:1:',
+    ]
+    assert stats.n_lines == 106 + 16 + 23
@@ -0,0 +1,236 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import ast
+import io
+import multiprocessing
+import os
+from itertools import starmap
+from pathlib import Path
+
+import flake8_secure_coding_standard as flake8_scs
+
+import flake8
+import flake8.options.manager
+import pytest
+
+
+def create_options_manager():
+    ctor_args = {'version': '1.0', 'plugin_versions': '', 'parents': []}
+    if int(flake8.__version__[0]) >= 6:
+        ctor_args['formatter_names'] = []
+    return flake8.options.manager.OptionManager(**ctor_args)
+
+
+def results(s, filename='module.py'):
+    plugin = flake8_scs.Plugin(ast.parse(s), s.splitlines(keepends=True), filename)
+    return set(starmap('{}:{}: {}'.format, plugin.run()))
+
+
+@pytest.fixture()
+def shared_table(monkeypatch):
+    monkeypatch.delenv(flake8_scs._SharedTable.env_var, raising=False)
+    table = flake8_scs._SharedTable.create('context')
+    yield table
+    table.close()
+
+
+@pytest.fixture()
+def configure_plugin(monkeypatch):
+    monkeypatch.delenv(flake8_scs._SharedTable.env_var, raising=False)
+    for name in ('rule_set', 'platform_profile'):
+        monkeypatch.setattr(flake8_scs.Visitor, name, getattr(flake8_scs.Visitor, name))
+    for name in ('path_rules', 'result_cache', 'content_table', 'print_stats'):
+        monkeypatch.setattr(flake8_scs.Plugin, name, None)
+
+    def _configure(*args):
+        options = create_options_manager()
+        options.add_option('-j', '--jobs', default='1')
+        flake8_scs.Plugin.add_options(options)
+        flake8_scs.Plugin.parse_options(options.parse_args(list(args)))
+        return flake8_scs.Plugin.content_table
+
+    yield _configure
+    if flake8_scs.Plugin.content_table is not None and flake8_scs.Plugin.content_table.shared is not None:
+        flake8_scs.Plugin.content_table.shared.close()
+
+
+_code = 'import os\n\neval(x)\nos.system(y)\n'
+_errors = [(3, 0, flake8_scs.SCS101), (4, 0, flake8_scs.SCS102)]
+
+
+def _put_in_child(table, key, errors):
+    table.put(key, errors)
+    table.update_stats(3, 1, 42)
+
+
+# ==============================================================================
+
+
+def test_put_get(shared_table):
+    assert shared_table.get('key') is None
+    shared_table.put('key', _errors)
+    shared_table.put('other', [])
+    assert shared_table.get('key') == _errors
+    assert shared_table.get('other') == []
+
+    shared_table.put('key', _errors[:1])
+    assert shared_table.get('key') == _errors[:1]
+
+
+def test_key_depends_on_context(shared_table):
+    shared_table.put('key', _errors)
+    other = flake8_scs._SharedTable(shared_table.path, 'other context')
+    assert other.get('key') is None
+    assert flake8_scs._SharedTable(shared_table.path, 'context').get('key') == _errors
+
+
+def test_errors_too_large(shared_table):
+    errors = [(idx, 0, flake8_scs.SCS101) for idx in range(100)]
+    shared_table.put('key', errors)
+    assert shared_table.get('key') is None
+
+
+def test_corrupted_slot(shared_table):
+    shared_table.put('key', _errors)
+    (offset,) = (
+        offset
+        for offset in shared_table._probe(shared_table._digest('key'))
+        if shared_table._mmap[offset : offset + 16] == shared_table._digest('key')
+    )
+    payload_offset = offset + shared_table._slot_header.size
+    shared_table._mmap[payload_offset : payload_offset + 1] = b'{'
+    assert shared_table.get('key') is None
+
+
+def test_probing(monkeypatch, shared_table):
+    monkeypatch.setattr(shared_table, 'n_slots', 2)
+    monkeypatch.setattr(shared_table, 'max_probes', 2)
+    shared_table.put('a', [(1, 0, 'a')])
+    shared_table.put('b', [(1, 0, 'b')])
+    assert shared_table.get('a') == [(1, 0, 'a')]
+    assert shared_table.get('b') == [(1, 0, 'b')]
+
+    # NB: the table is full, one of the entries is overwritten
+    shared_table.put('c', [(1, 0, 'c')])
+    assert shared_table.get('c') == [(1, 0, 'c')]
+    assert [shared_table.get('a'), shared_table.get('b')].count(None) == 1
+
+
+def test_attach(monkeypatch, shared_table, tmp_path):
+    assert flake8_scs._SharedTable.attach('context') is None
+
+    monkeypatch.setenv(flake8_scs._SharedTable.env_var, f'1:{shared_table.path}')
+    other = flake8_scs._SharedTable.attach('context')
+    shared_table.put('key', _errors)
+    assert other.get('key') == _errors
+
+    other.close()
+    assert Path(shared_table.path).exists()
+
+    monkeypatch.setenv(flake8_scs._SharedTable.env_var, '1:/does/not/exist')
+    assert flake8_scs._SharedTable.attach('context') is None
+
+    # NB: too small to hold any slot
+    (tmp_path / 'table.bin').write_bytes(b'')
+    monkeypatch.setenv(flake8_scs._SharedTable.env_var, f'1:{tmp_path / "table.bin"}')
+    assert flake8_scs._SharedTable.attach('context') is None
+
+
+def test_close_removes_file(monkeypatch):
+    monkeypatch.delenv(flake8_scs._SharedTable.env_var, raising=False)
+    table = flake8_scs._SharedTable.create('context')
+    assert os.environ[flake8_scs._SharedTable.env_var].endswith(table.path)
+    table.close()
+    assert not Path(table.path).exists()
+    assert flake8_scs._SharedTable.env_var not in os.environ
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='requires fork')
+def test_shared_with_forked_process(shared_table):
+    shared_table.update_stats(2, 0, 0)
+    process = multiprocessing.get_context('fork').Process(target=_put_in_child, args=(shared_table, 'key', _errors))
+    process.start()
+    process.join()
+    assert process.exitcode == 0
+    assert shared_table.get('key') == _errors
+    assert shared_table.get_stats() == (5, 1, 42)
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='requires fork')
+def test_report_stats_parallel_run(configure_plugin, tmp_path):
+    configure_plugin('-j', '2', '--scs-stats', f'--scs-cache-dir={tmp_path}')
+    # NB: the statistics of the worker processes are aggregated through the shared table
+    for filename in ('a.py', 'b.py'):
+        process = multiprocessing.get_context('fork').Process(target=results, args=(_code, filename))
+        process.start()
+        process.join()
+        assert process.exitcode == 0
+
+    output = io.StringIO()
+    flake8_scs.Plugin.report_stats(output)
+    assert '2 files, 1 duplicates not checked again' in output.getvalue()
+    assert 'result cache: 0 hits, 1 misses' in output.getvalue()
+
+
+@pytest.mark.parametrize(
+    ('jobs', 'expected'),
+    [('1', False), ('4', True), ('auto', (os.cpu_count() or 1) > 1), (None, False)],
+)
+def test_is_parallel_run(jobs, expected):
+    options = argparse.Namespace() if jobs is None else argparse.Namespace(jobs=jobs)
+    assert flake8_scs._is_parallel_run(options) == expected
+
+
+def test_plugin_serial_run(configure_plugin):
+    assert configure_plugin('-j', '1', '--scs-stats').shared is None
+
+
+@pytest.mark.parametrize(
+    'args',
+    [
+        # NB: duplicate files are only checked once per worker process, nothing outlives the worker processes
+        (),
+        ('--scs-stats', '--scs-shared-table-size=0'),
+    ],
+)
+def test_plugin_parallel_run_without_table(configure_plugin, args):
+    assert configure_plugin('-j', '2', *args).shared is None
+    assert flake8_scs._SharedTable.env_var not in os.environ
+
+
+def test_plugin_shared_table_size(configure_plugin, tmp_path):
+    shared = configure_plugin('-j', '2', f'--scs-cache-dir={tmp_path}', '--scs-shared-table-size=1').shared
+    assert shared.n_slots == 1024
+    assert flake8_scs._SharedTable(shared.path, shared.context).n_slots == 1024
+
+
+def test_plugin_parallel_run(configure_plugin, mocker):
+    table = configure_plugin('-j', '2', '--scs-stats')
+    shared = table.shared
+    assert shared is not None
+    expected = results(_code, 'a.py')
+
+    # NB: a new content table attached to the same shared table behaves like another worker process
+    flake8_scs.Plugin.content_table = flake8_scs._ContentTable(flake8_scs._SharedTable(shared.path, shared.context))
+    visit = mocker.patch.object(flake8_scs.Visitor, 'visit')
+    assert results(_code, 'b.py') == expected
+    visit.assert_not_called()
+    # NB: both tables publish their statistics to the row of the current process
+    assert flake8_scs.Plugin.content_table.get_stats() == (1, 1, len(_code))
+
+    flake8_scs.Plugin.content_table = table
+    configure_plugin('-j', '2', '--scs-stats')
+    assert not Path(shared.path).exists()
@@ -49,6 +49,7 @@ def test_shlex_quote_always_success(s):
 )
 def test_shlex_quote(mocker, platform, expected_success, s):
     mocker.patch('platform.system', return_value=platform)
+    mocker.patch.object(flake8_scs.Visitor, 'platform_profile', flake8_scs._get_platform_profile('auto'))
     if expected_success:
         assert results(s) == set()
     else:
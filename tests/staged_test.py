@@ -0,0 +1,167 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import ast
+import shutil
+import subprocess  # noqa: S404
+
+import flake8_secure_coding_standard as flake8_scs
+
+import flake8
+import flake8.options.manager
+import pytest
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git is not available')
+
+_CONTENT = 'import subprocess as proc\n\n\ndef f(x):\n    eval(x)\n\n\ndef g(x):\n    return x\n\n\nassert f\n'
+
+
+def create_options_manager():
+    ctor_args = {'version': '1.0', 'plugin_versions': '', 'parents': []}
+    if int(flake8.__version__[0]) >= 6:
+        ctor_args['formatter_names'] = []
+    return flake8.options.manager.OptionManager(**ctor_args)
+
+
+def git(repo, *args):
+    subprocess.run(
+        ['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],  # noqa: S607
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+def run_file(path):
+    s = path.read_text()
+    plugin = flake8_scs.Plugin(ast.parse(s), s.splitlines(keepends=True), str(path))
+    return sorted((line, msg.split(' ')[0]) for line, _, msg, _ in plugin.run())
+
+
+@pytest.fixture()
+def repo(tmp_path, monkeypatch):
+    monkeypatch.delenv(flake8_scs._SharedTable.env_var, raising=False)
+    for name in ('rule_set', 'platform_profile'):
+        monkeypatch.setattr(flake8_scs.Visitor, name, getattr(flake8_scs.Visitor, name))
+    for name in ('path_rules', 'result_cache', 'diff_index', 'baseline', 'print_stats'):
+        monkeypatch.setattr(flake8_scs.Plugin, name, getattr(flake8_scs.Plugin, name))
+    monkeypatch.setattr(flake8_scs.Plugin, 'content_table', None)
+
+    git(tmp_path, 'init', '-q')
+    (tmp_path / 'changed.py').write_text(_CONTENT)
+    (tmp_path / 'unchanged.py').write_text('eval(x)\n')
+    git(tmp_path, 'add', '.')
+    git(tmp_path, 'commit', '-q', '-m', 'initial')
+    monkeypatch.chdir(tmp_path)
+
+    yield tmp_path
+
+    flake8_scs.atexit.unregister(flake8_scs.Plugin.report_stats)
+    if flake8_scs.Plugin.content_table is not None and flake8_scs.Plugin.content_table.shared is not None:
+        flake8_scs.Plugin.content_table.shared.close()
+
+
+def configure_plugin(*args):
+    options = create_options_manager()
+    flake8_scs.Plugin.add_options(options)
+    flake8_scs.Plugin.parse_options(options.parse_args(list(args)))
+
+
+# ==============================================================================
+
+
+def test_staged_index(repo):
+    (repo / 'changed.py').write_text(_CONTENT.replace('return x', 'return proc.run(x, shell=True)'))
+    (repo / 'new.py').write_text('eval(x)\n')
+    (repo / 'untracked.py').write_text('eval(x)\n')
+    git(repo, 'add', 'changed.py', 'new.py')
+    (repo / 'unchanged.py').write_text('exec(x)\n')
+
+    index = flake8_scs._StagedIndex.from_git()
+    changed_lines = index.changed_lines('changed.py')
+    assert (changed_lines.starts, changed_lines.ends) == ([9], [9])
+    assert index.changed_lines(str(repo / 'new.py')) is flake8_scs._ALL_LINES
+    assert index.changed_lines('unchanged.py') is None
+    assert index.changed_lines('untracked.py') is None
+
+    assert index.read_lines('new.py') == ['eval(x)\n']
+    assert index.read_lines('unchanged.py') == ['eval(x)\n']
+    assert index.read_lines('untracked.py') is None
+    assert index.read_lines(str(repo.parent / 'outside.py')) is None
+
+
+def test_staged_only_checks_staged_statements(repo):
+    (repo / 'changed.py').write_text(_CONTENT.replace('return x', 'return proc.run(x, shell=True)'))
+    git(repo, 'add', 'changed.py')
+    # NB: changes that are not staged are ignored, even if they shift the lines of the file
+    (repo / 'changed.py').write_text('exec(x)\n\n' + _CONTENT.replace('return x', 'return x  # noqa'))
+    (repo / 'unchanged.py').write_text('exec(x)\n')
+
+    configure_plugin('--scs-staged')
+    assert run_file(repo / 'changed.py') == [(9, 'SCS103')]
+    assert run_file(repo / 'unchanged.py') == []
+
+
+def test_staged_new_files(repo):
+    (repo / 'new.py').write_text('eval(x)\n\n\ndef f(x):\n    exec(x)  # noqa: SCS101\n')
+    git(repo, 'add', 'new.py')
+    (repo / 'new.py').write_text('x = 1\n')
+
+    configure_plugin('--scs-staged')
+    # NB: `# noqa` comments are looked for in the staged content
+    assert run_file(repo / 'new.py') == [(1, 'SCS101')]
+
+
+def test_staged_unreadable_content(repo):
+    (repo / 'changed.py').write_text('def f(:\n')
+    git(repo, 'add', 'changed.py')
+    (repo / 'new.py').write_bytes(b'# -*- coding: unknown -*-\neval(x)\n')
+    git(repo, 'add', 'new.py')
+    (repo / 'changed.py').write_text(_CONTENT)
+    (repo / 'new.py').write_text('eval(x)\n')
+
+    configure_plugin('--scs-staged')
+    assert run_file(repo / 'changed.py') == []
+    assert run_file(repo / 'new.py') == []
+
+
+def test_staged_diff_base(repo):
+    (repo / 'unchanged.py').write_text('x = 1\n')
+    git(repo, 'commit', '-q', '-a', '-m', 'second')
+    (repo / 'changed.py').write_text(_CONTENT.replace('return x', 'return proc.run(x, shell=True)'))
+    git(repo, 'add', 'changed.py')
+
+    configure_plugin('--scs-staged', '--scs-diff-base=HEAD~1')
+    assert run_file(repo / 'changed.py') == [(9, 'SCS103')]
+    assert run_file(repo / 'unchanged.py') == []
+
+
+def test_staged_first_commit(tmp_path, monkeypatch):
+    git(tmp_path, 'init', '-q')
+    (tmp_path / 'new.py').write_text('eval(x)\n')
+    git(tmp_path, 'add', 'new.py')
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(flake8_scs.Plugin, 'diff_index', flake8_scs._StagedIndex.from_git())
+    assert run_file(tmp_path / 'new.py') == [(1, 'SCS101')]
+
+
+def test_staged_reuses_known_errors(repo, tmp_path_factory, mocker):
+    (repo / 'changed.py').write_text(_CONTENT.replace('return x', 'return proc.run(x, shell=True)'))
+    configure_plugin(f'--scs-cache-dir={tmp_path_factory.mktemp("cache")}')
+    assert run_file(repo / 'changed.py') == [(5, 'SCS101'), (9, 'SCS103'), (12, 'SCS108')]
+
+    git(repo, 'add', 'changed.py')
+    configure_plugin(f'--scs-cache-dir={flake8_scs.Plugin.result_cache.directory}', '--scs-staged')
+    visit = mocker.spy(flake8_scs.Visitor, 'visit')
+    assert run_file(repo / 'changed.py') == [(9, 'SCS103')]
+    assert visit.call_count == 0
@@ -0,0 +1,102 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+from itertools import starmap
+
+import flake8_secure_coding_standard as flake8_scs
+
+import flake8
+import flake8.options.manager
+import pytest
+
+
+def create_options_manager():
+    ctor_args = {'version': '1.0', 'plugin_versions': '', 'parents': []}
+    if int(flake8.__version__[0]) >= 6:
+        ctor_args['formatter_names'] = []
+    return flake8.options.manager.OptionManager(**ctor_args)
+
+
+def results(s):
+    return set(starmap('{}:{}: {}'.format, flake8_scs.Plugin(ast.parse(s)).run()))
+
+
+@pytest.fixture()
+def configure_platform(monkeypatch):
+    # NB: make sure the Visitor class is restored to its original state after each test
+    for name in ('platform_profile', 'os_mkdir_mode_policy'):
+        monkeypatch.setattr(flake8_scs.Visitor, name, getattr(flake8_scs.Visitor, name))
+
+    def _configure(*args):
+        options = create_options_manager()
+        flake8_scs.Plugin.add_options(options)
+        flake8_scs.Plugin.parse_options(options.parse_args(list(args)))
+
+    return _configure
+
+
+# ==============================================================================
+
+
+@pytest.mark.parametrize(
+    ('target', 'system', 'expected'),
+    [
+        ('auto', 'Linux', (True, False, True)),
+        ('auto', 'Darwin', (True, False, True)),
+        ('auto', 'Java', (False, True, True)),
+        ('auto', 'Windows', (False, True, False)),
+        ('posix', 'Windows', (True, False, True)),
+        ('windows', 'Linux', (False, True, False)),
+        ('both', 'Linux', (True, True, True)),
+    ],
+)
+def test_get_platform_profile(mocker, target, system, expected):
+    mocker.patch('platform.system', return_value=system)
+    assert tuple(flake8_scs._get_platform_profile(target)) == expected
+
+
+def test_get_platform_profile_invalid():
+    with pytest.raises(ValueError, match='Invalid target platform'):
+        flake8_scs._get_platform_profile('solaris')
+
+
+@pytest.mark.parametrize(
+    ('target', 'expected'),
+    [
+        ('posix', {'1:0: ' + flake8_scs.SCS119, '3:0: ' + flake8_scs.SCS116.format('0 < mode < 0o755')}),
+        ('windows', {'2:0: ' + flake8_scs.SCS111}),
+        (
+            'both',
+            {
+                '1:0: ' + flake8_scs.SCS119,
+                '2:0: ' + flake8_scs.SCS111,
+                '3:0: ' + flake8_scs.SCS116.format('0 < mode < 0o755'),
+            },
+        ),
+    ],
+)
+def test_target_platform_option(configure_platform, target, expected):
+    configure_platform(f'--scs-target-platform={target}', '--os-mkdir-mode=y')
+    assert results('os.chmod("file.txt", stat.S_IWOTH)\nshlex.quote(cmd)\nos.mkdir("dir", 0o777)') == expected
+
+
+def test_target_platform_resolved_once(mocker, configure_platform):
+    system = mocker.patch('platform.system', return_value='Linux')
+    configure_platform('--scs-target-platform=auto')
+    assert system.called
+    system.reset_mock()
+
+    results('os.chmod("file.txt", stat.S_IWOTH)\nshlex.quote(cmd)\nfrom shlex import quote\n' * 10)
+    assert not system.called
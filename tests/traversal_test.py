@@ -0,0 +1,61 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+import sys
+from itertools import starmap
+
+import flake8_secure_coding_standard as flake8_scs
+
+import pytest
+
+
+def results(s):
+    return set(starmap('{}:{}: {}'.format, flake8_scs.Plugin(ast.parse(s)).run()))
+
+
+@pytest.mark.parametrize(
+    ('s', 'expected'),
+    [
+        ('with open("file.txt") as fd:\n    os.system("ls")', {'2:4: ' + flake8_scs.SCS102}),
+        ('with a, b:\n    with c:\n        assert x', {'3:8: ' + flake8_scs.SCS108}),
+        ('with tempfile.mktemp() as fname:\n    pass', {'1:5: ' + flake8_scs.SCS104}),
+        ('with open(eval(x), "w") as fd:\n    pass', {'1:0: ' + flake8_scs.SCS109, '1:10: ' + flake8_scs.SCS101}),
+        (
+            'with shelve.open("db") as db, open("file.txt", "w") as fd:\n    pass',
+            {'1:0: ' + flake8_scs.SCS115, '1:0: ' + flake8_scs.SCS109},
+        ),
+        (
+            'with shelve.open("db") as db:\n    pickle.loads(db["x"])',
+            {'1:0: ' + flake8_scs.SCS115, '2:4: ' + flake8_scs.SCS113},
+        ),
+    ],
+)
+def test_with_body_is_visited(s, expected):
+    assert results(s) == expected
+
+
+def test_source_order():
+    errors = list(flake8_scs.Plugin(ast.parse('eval(os.system(x))\nassert pickle.loads(y)\nimport pdb')).run())
+    assert [(line, col) for line, col, *_ in errors] == [(1, 0), (1, 5), (2, 0), (2, 7), (3, 0)]
+
+
+def test_deep_tree():
+    depth = sys.getrecursionlimit() * 10
+    node = ast.Call(func=ast.Name(id='eval', ctx=ast.Load()), args=[], keywords=[], lineno=1, col_offset=0)
+    for _ in range(depth):
+        node = ast.BinOp(left=node, op=ast.Add(), right=ast.Name(id='x', ctx=ast.Load()))
+    tree = ast.Module(body=[ast.Expr(value=node)], type_ignores=[])
+
+    assert list(flake8_scs.Plugin(tree).run()) == [(1, 0, flake8_scs.SCS101, flake8_scs.Plugin)]
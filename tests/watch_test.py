@@ -0,0 +1,220 @@
+# Copyright 2026 Damien Nguyen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import os
+import sys
+from pathlib import Path
+
+import flake8_secure_coding_standard as flake8_scs
+
+import pytest
+
+
+@pytest.fixture()
+def session(monkeypatch, tmp_path):
+    monkeypatch.delenv(flake8_scs._SharedTable.env_var, raising=False)
+    for name in ('rule_set', 'platform_profile'):
+        monkeypatch.setattr(flake8_scs.Visitor, name, getattr(flake8_scs.Visitor, name))
+    for name in ('path_rules', 'result_cache', 'diff_index', 'baseline', 'print_stats'):
+        monkeypatch.setattr(flake8_scs.Plugin, name, getattr(flake8_scs.Plugin, name))
+    monkeypatch.setattr(flake8_scs.Plugin, 'content_table', None)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'a.py').write_text('import os\n\neval(x)\nos.system(y)\n')
+    (tmp_path / 'src' / 'b.py').write_text('x = 1\n')
+
+    yield flake8_scs._WatchSession(['src'], io.StringIO())
+
+    flake8_scs.atexit.unregister(flake8_scs.Plugin.report_stats)
+    if flake8_scs.Plugin.content_table is not None and flake8_scs.Plugin.content_table.shared is not None:
+        flake8_scs.Plugin.content_table.shared.close()
+
+
+def _path(*parts):
+    return str(Path(*parts))
+
+
+_a_errors = [
+    '+ src/a.py:3:1: SCS101 `eval()` and `exec()` represent a security risk and should be avoided',
+    '+ src/a.py:4:1: SCS102 use of `os.system()` should be avoided',
+]
+
+
+# ==============================================================================
+
+
+@pytest.mark.parametrize(
+    ('line', 'expected'),
+    [
+        ('eval(x)\n', False),
+        ('eval(x)  # noqa\n', True),
+        ('eval(x)  # NOQA\n', True),
+        ('eval(x)  # noqa: SCS101\n', True),
+        ('eval(x)  # noqa:SCS100,SCS101\n', True),
+        ('eval(x)  # noqa: SCS1\n', True),
+        ('eval(x)  #noqa\n', False),
+        ('eval(x)  # noqa: SCS102\n', False),
+        ('eval(x)  # noqa: E501 SCS102\n', False),
+    ],
+)
+def test_is_noqa(line, expected):
+    assert flake8_scs._is_noqa(line, 'SCS101') == expected
+
+
+def test_initial_check(session):
+    assert session.reload() == _a_errors
+    assert sorted(session.results) == [_path('src', 'a.py'), _path('src', 'b.py')]
+    assert session.summary() == '2 errors in 1 files (2 files watched)'
+
+
+def test_update_reports_delta(session, tmp_path):
+    session.reload()
+    (tmp_path / 'src' / 'a.py').write_text('import os\n\n\nos.system(y)\nexec(z)\n')
+    assert session.update([_path('src', 'a.py')]) == [
+        '- src/a.py:3:1: SCS101 `eval()` and `exec()` represent a security risk and should be avoided',
+        '+ src/a.py:5:1: SCS101 `eval()` and `exec()` represent a security risk and should be avoided',
+    ]
+
+
+def test_update_moved_errors_not_reported(session, tmp_path):
+    session.reload()
+    (tmp_path / 'src' / 'a.py').write_text('"""Docstring."""\n\nimport os\n\neval(x)\nos.system(y)\n')
+    assert session.update([_path('src', 'a.py')]) == []
+    assert [error[0] for error in session.results[_path('src', 'a.py')].errors] == [5, 6]
+
+
+def test_update_unchanged_content(session, tmp_path, mocker):
+    session.reload()
+    path = tmp_path / 'src' / 'a.py'
+    path.write_text(path.read_text())
+    visit = mocker.patch.object(flake8_scs.Visitor, 'visit')
+    assert session.update([_path('src', 'a.py')]) == []
+    visit.assert_not_called()
+
+
+def test_update_noqa(session, tmp_path):
+    session.reload()
+    (tmp_path / 'src' / 'b.py').write_text('eval(1)  # noqa: SCS101\nexec(2)\n')
+    assert session.update([_path('src', 'b.py')]) == [
+        '+ src/b.py:2:1: SCS101 `eval()` and `exec()` represent a security risk and should be avoided',
+    ]
+
+
+def test_update_check_failure(session, tmp_path, mocker, capsys):
+    session.reload()
+    (tmp_path / 'src' / 'a.py').write_text('eval(x)\n')
+    (tmp_path / 'src' / 'b.py').write_text('exec(x)\n')
+    mocker.patch.object(flake8_scs, '_get_fingerprints', side_effect=[RuntimeError('oops'), ['fingerprint']])
+    assert session.update([_path('src', 'a.py'), _path('src', 'b.py')]) == [
+        '+ src/b.py:1:1: SCS101 `eval()` and `exec()` represent a security risk and should be avoided',
+    ]
+    assert f"{_path('src', 'a.py')}: unexpected error while checking the file: RuntimeError('oops')" in (
+        capsys.readouterr().err
+    )
+    assert session.summary() == '3 errors in 2 files (2 files watched)'
+
+
+def test_update_created_and_deleted(session, tmp_path):
+    session.reload()
+    (tmp_path / 'src' / 'sub').mkdir()
+    (tmp_path / 'src' / 'sub' / 'c.py').write_text('exec(z)\n')
+    (tmp_path / 'src' / 'sub' / 'c.txt').write_text('exec(z)\n')
+    added = ['+ src/sub/c.py:1:1: SCS101 `eval()` and `exec()` represent a security risk and should be avoided']
+    assert session.update([_path('src', 'sub')]) == added
+
+    (tmp_path / 'src' / 'sub' / 'c.py').unlink()
+    (tmp_path / 'src' / 'sub' / 'c.txt').unlink()
+    (tmp_path / 'src' / 'sub').rmdir()
+    (tmp_path / 'src' / 'a.py').unlink()
+    assert session.update([_path('src', 'sub'), _path('src', 'a.py')]) == [
+        '- ' + line[2:] for line in (*_a_errors, *added)
+    ]
+    assert list(session.results) == [_path('src', 'b.py')]
+
+
+def test_update_ignores_other_files(session, tmp_path):
+    session.reload()
+    (tmp_path / 'other.py').write_text('eval(x)\n')
+    (tmp_path / 'src' / 'syntax_error.py').write_text('eval(x\n')
+    assert session.update(['other.py', _path('src', 'syntax_error.py')]) == []
+    assert 'other.py' not in session.results
+    assert session.results[_path('src', 'syntax_error.py')].errors == []
+
+
+def test_reload_configuration(session, tmp_path):
+    (tmp_path / 'src' / 'vendor').mkdir()
+    (tmp_path / 'src' / 'vendor' / 'c.py').write_text('exec(z)\n')
+    assert len(session.reload()) == 3
+
+    (tmp_path / 'setup.cfg').write_text('[flake8]\nextend-ignore = SCS102\nextend-exclude = vendor\n')
+    assert session.reload() == [
+        '- src/a.py:4:1: SCS102 use of `os.system()` should be avoided',
+        '- src/vendor/c.py:1:1: SCS101 `eval()` and `exec()` represent a security risk and should be avoided',
+    ]
+    assert flake8_scs._is_config_file('setup.cfg')
+    assert flake8_scs._is_config_file(str(tmp_path / 'setup.cfg'))
+    assert not flake8_scs._is_config_file(_path('src', 'setup.cfg'))
+
+
+def test_polling_watcher(tmp_path, monkeypatch):
+    monkeypatch.setattr(flake8_scs.time, 'sleep', lambda _: None)
+    path = tmp_path / 'a.py'
+    path.write_text('x = 1\n')
+    paths = [str(path)]
+    watcher = flake8_scs._PollingWatcher(lambda: paths, 1.0)
+
+    path.write_text('x = 12\n')
+    assert watcher.wait() == {str(path)}
+
+    new_path = tmp_path / 'b.py'
+    new_path.write_text('x = 1\n')
+    paths.append(str(new_path))
+    path.unlink()
+    assert watcher.wait() == {str(path), str(new_path)}
+    watcher.close()
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='requires inotify')
+def test_inotify_watcher(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'excluded').mkdir()
+    watcher = flake8_scs._InotifyWatcher.create(['src'], lambda path: path.endswith('excluded'))
+    assert watcher is not None
+    try:
+        (tmp_path / 'src' / 'a.py').write_text('x = 1\n')
+        assert _path('src', 'a.py') in watcher.wait()
+
+        (tmp_path / 'setup.cfg').write_text('')
+        assert 'setup.cfg' in {os.path.normpath(path) for path in watcher.wait()}
+
+        (tmp_path / 'src' / 'sub').mkdir()
+        assert watcher.wait() == {_path('src', 'sub')}
+        (tmp_path / 'src' / 'sub' / 'b.py').write_text('x = 1\n')
+        assert _path('src', 'sub', 'b.py') in watcher.wait()
+
+        (tmp_path / 'src' / 'excluded' / 'c.py').write_text('x = 1\n')
+        (tmp_path / 'src' / 'a.py').unlink()
+        assert watcher.wait() == {_path('src', 'a.py')}
+    finally:
+        watcher.close()
+
+
+def test_main_watch(mocker):
+    watch = mocker.patch.object(flake8_scs, '_watch', side_effect=KeyboardInterrupt)
+    assert flake8_scs.main(['watch', '--poll', '--interval=0.5', 'src']) == 0
+    (session,) = watch.call_args.args
+    assert session.paths == ['src']
+    assert watch.call_args.kwargs == {'poll': True, 'interval': 0.5}
@@ -33,6 +33,7 @@ def results(s):
         'yaml.load("!!python/object/new:os.system [echo EXPLOIT!]", Loader=SafeLoader)',
         'yaml.load("!!python/object/new:os.system [echo EXPLOIT!]", BaseLoader)',
         'yaml.load("!!python/object/new:os.system [echo EXPLOIT!]", SafeLoader)',
+        'yaml.load("!!python/object/new:os.system [echo EXPLOIT!]", cfg.loaders.Loader)',
     ],
 )
 def test_ok(s):